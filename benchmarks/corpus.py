@@ -0,0 +1,105 @@
+"""
+This module contains functions to generate synthetic corpora for the
+benchmarks, so that they run offline and reproducibly.
+
+The texts consist of pseudo-words built from syllables, drawn from a
+Zipf-distributed vocabulary to resemble the type/token statistics of
+natural language. Document lengths follow a log-normal distribution
+around the mean length of a length profile, e.g., tweets or books.
+"""
+import itertools
+
+import numpy as np
+import polars as pl
+
+# Mean number of words per document and the spread of the log-normal
+# length distribution
+LENGTH_PROFILES = {
+    "tweet": (20, 0.5),
+    "review": (120, 0.6),
+    "article": (800, 0.5),
+    "book": (20_000, 0.3),
+}
+
+SYLLABLES = ["ba", "ke", "lo", "mi", "nu", "ra", "se", "ti", "vo", "za",
+             "chen", "dor", "fal", "gup", "hin", "jas", "lek", "mor",
+             "pri", "stu"]
+
+VOCABULARY_SIZE = 50_000
+WORDS_PER_SENTENCE = 15
+
+def make_vocabulary(size: int = VOCABULARY_SIZE,
+                    seed: int = 0,
+                    ) -> np.ndarray:
+    """
+    Generates a vocabulary of unique pseudo-words with one to four
+    syllables. Shorter words are more frequent, as in natural language.
+
+    Args:
+        size (int): The number of words, at most 168420.
+            Defaults to 50000.
+        seed (int): The random seed. Defaults to 0.
+
+    Returns:
+        vocabulary (np.ndarray): The words, from most to least frequent.
+    """
+    rng = np.random.default_rng(seed)
+    words = []
+    for n_syllables in range(1, 5):
+        combinations = np.array(
+            ["".join(syllables) for syllables in
+             itertools.product(SYLLABLES, repeat=n_syllables)])
+        rng.shuffle(combinations)
+        words.extend(combinations[:size - len(words)])
+        if len(words) == size:
+            break
+    if len(words) < size:
+        raise ValueError(f"The vocabulary size is at most {len(words)}.")
+    return np.array(words)
+
+def make_corpus(n_rows: int,
+                length: str = "tweet",
+                seed: int = 0,
+                vocabulary: np.ndarray | None = None,
+                ) -> pl.DataFrame:
+    """
+    Generates a synthetic corpus.
+
+    Args:
+        n_rows (int): The number of documents.
+        length (str): The length profile, see LENGTH_PROFILES.
+            Defaults to 'tweet'.
+        seed (int): The random seed. Defaults to 0.
+        vocabulary (np.ndarray | None):
+            The vocabulary, see make_vocabulary. Defaults to the
+            vocabulary generated with the same seed.
+
+    Returns:
+        corpus (pl.DataFrame): The corpus with the columns 'id' and
+            'text'.
+    """
+    if length not in LENGTH_PROFILES:
+        raise ValueError(f"Unknown length profile '{length}'. Available "
+                         f"profiles are {list(LENGTH_PROFILES)}.")
+    if vocabulary is None:
+        vocabulary = make_vocabulary(seed=seed)
+    rng = np.random.default_rng(seed)
+    mean, sigma = LENGTH_PROFILES[length]
+    lengths = np.maximum(
+        1, rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, n_rows)
+    ).astype(np.int64)
+
+    # Zipf-distributed word ranks, clipped to the vocabulary
+    ranks = rng.zipf(1.3, int(lengths.sum())) - 1
+    words = vocabulary[np.minimum(ranks, len(vocabulary) - 1)]
+
+    texts = []
+    offset = 0
+    for n_words in lengths:
+        doc = words[offset:offset + n_words]
+        offset += n_words
+        sentences = [" ".join(doc[i:i + WORDS_PER_SENTENCE]).capitalize()
+                     for i in range(0, n_words, WORDS_PER_SENTENCE)]
+        texts.append(". ".join(sentences) + ".")
+
+    return pl.DataFrame({"id": np.arange(n_rows), "text": texts})
@@ -0,0 +1,196 @@
+"""
+This module contains a synthetic parse fixture for the micro-benchmarks.
+
+Instead of running a model, spaCy documents are constructed directly with
+realistic annotations: part-of-speech tags, fine-grained tags, lemmas,
+morphological features, a dependency tree per sentence and named
+entities. The feature functions thus run on fully annotated documents
+without loading a model, and their timings are not hidden by parsing.
+
+The lexicon-based features run on synthetic lexicons over the same
+vocabulary, with the columns of the respective resources, so that no
+resources need to be downloaded.
+"""
+import numpy as np
+import polars as pl
+import spacy
+from spacy.tokens import Doc
+
+from elfen.resource_utils.psycholinguistics import SENSORIMOTOR_VARS
+
+from .corpus import WORDS_PER_SENTENCE, make_vocabulary
+
+# Part-of-speech tags of the words with their probabilities, and the
+# fine-grained tag, dependency label and morphology of each tag
+POS_TAGS = {
+    "NOUN": (0.25, "NN", "nsubj", "Number=Sing"),
+    "VERB": (0.15, "VBD", "conj", "Tense=Past|VerbForm=Fin"),
+    "ADJ": (0.10, "JJ", "amod", "Degree=Pos"),
+    "ADV": (0.06, "RB", "advmod", ""),
+    "DET": (0.10, "DT", "det", "Definite=Def|PronType=Art"),
+    "ADP": (0.10, "IN", "prep", ""),
+    "PRON": (0.08, "PRP", "nsubj", "Case=Nom|Number=Sing|Person=3"),
+    "PROPN": (0.05, "NNP", "compound", "Number=Sing"),
+    "AUX": (0.04, "VBZ", "aux", "Mood=Ind|Tense=Pres|VerbForm=Fin"),
+    "CCONJ": (0.04, "CC", "cc", "ConjType=Cmp"),
+    "NUM": (0.03, "CD", "nummod", "NumType=Card"),
+}
+
+# Fraction of the vocabulary covered by the synthetic lexicons
+LEXICON_COVERAGE = 0.3
+
+EMOTIONS = ["anger", "anticipation", "disgust", "fear", "joy", "sadness",
+            "surprise", "trust"]
+
+def make_docs(n_docs: int,
+              n_words: int,
+              seed: int = 0,
+              vocabulary: np.ndarray | None = None,
+              ) -> list[Doc]:
+    """
+    Constructs annotated spaCy documents without a model.
+
+    Args:
+        n_docs (int): The number of documents.
+        n_words (int): The number of words per document, excluding
+            punctuation.
+        seed (int): The random seed. Defaults to 0.
+        vocabulary (np.ndarray | None):
+            The vocabulary, see corpus.make_vocabulary.
+
+    Returns:
+        docs (list[Doc]): The annotated documents.
+    """
+    if vocabulary is None:
+        vocabulary = make_vocabulary(seed=seed)
+    rng = np.random.default_rng(seed)
+    vocab = spacy.blank("en").vocab
+    tags = list(POS_TAGS)
+    # Every word has a fixed part of speech
+    word_pos = rng.choice(len(tags), size=len(vocabulary),
+                          p=[POS_TAGS[tag][0] for tag in tags])
+
+    docs = []
+    for _ in range(n_docs):
+        ranks = np.minimum(rng.zipf(1.3, n_words) - 1, len(vocabulary) - 1)
+        words, pos, heads, deps = [], [], [], []
+        for start in range(0, n_words, WORDS_PER_SENTENCE):
+            sentence = ranks[start:start + WORDS_PER_SENTENCE]
+            offset = len(words)
+            # The first verb is the root; all other words attach to it
+            verbs = [i for i, rank in enumerate(sentence)
+                     if tags[word_pos[rank]] == "VERB"]
+            root = offset + (verbs[0] if verbs else 0)
+            for i, rank in enumerate(sentence):
+                words.append(str(vocabulary[rank]))
+                pos.append(tags[word_pos[rank]])
+                heads.append(root)
+                deps.append("ROOT" if offset + i == root
+                            else POS_TAGS[pos[-1]][2])
+            words.append(".")
+            pos.append("PUNCT")
+            heads.append(root)
+            deps.append("punct")
+
+        # Proper nouns outside of compounds are person entities
+        ents = ["B-PERSON" if tag == "PROPN" else "O" for tag in pos]
+        docs.append(Doc(
+            vocab,
+            words=words,
+            spaces=[i + 1 < len(words) and words[i + 1] != "."
+                    for i in range(len(words))],
+            pos=pos,
+            tags=[POS_TAGS[tag][1] if tag in POS_TAGS else "."
+                  for tag in pos],
+            morphs=[POS_TAGS[tag][3] if tag in POS_TAGS else ""
+                    for tag in pos],
+            lemmas=[word.lower() for word in words],
+            heads=heads,
+            deps=deps,
+            ents=ents,
+        ))
+
+    return docs
+
+def make_data(docs: list[Doc]) -> pl.DataFrame:
+    """
+    Builds the input data of the feature functions from parsed documents.
+
+    Args:
+        docs (list[Doc]): The parsed documents.
+
+    Returns:
+        data (pl.DataFrame): The data with the columns 'text' and 'nlp'.
+    """
+    return pl.DataFrame({"text": [doc.text for doc in docs]}).with_columns(
+        pl.Series("nlp", docs, dtype=pl.Object))
+
+def make_lexicons(vocabulary: np.ndarray | None = None,
+                  seed: int = 0,
+                  ) -> dict[str, pl.DataFrame | list[str]]:
+    """
+    Generates synthetic lexicons over the vocabulary, with the columns of
+    the English resources.
+
+    Args:
+        vocabulary (np.ndarray | None):
+            The vocabulary, see corpus.make_vocabulary.
+        seed (int): The random seed. Defaults to 0.
+
+    Returns:
+        lexicons (dict[str, pl.DataFrame | list[str]]):
+            The lexicons by resource name, see FEATURE_LEXICON_MAP.
+    """
+    if vocabulary is None:
+        vocabulary = make_vocabulary(seed=seed)
+    rng = np.random.default_rng(seed)
+    words = rng.choice(vocabulary,
+                       size=int(len(vocabulary) * LEXICON_COVERAGE),
+                       replace=False).tolist()
+    n = len(words)
+
+    def ratings(low: float, high: float) -> np.ndarray:
+        return rng.uniform(low, high, n)
+
+    sensorimotor = {"Word": words}
+    for var in SENSORIMOTOR_VARS["en"]:
+        sensorimotor[f"{var}.mean"] = ratings(0, 5)
+        sensorimotor[f"{var}.SD"] = ratings(0, 2)
+
+    return {
+        "hedges": words[:200],
+        "sentiment_nrc": pl.DataFrame({
+            "word": np.repeat(words, 2),
+            "emotion": ["positive", "negative"] * n,
+            "label": rng.integers(0, 2, 2 * n).astype(np.uint8),
+        }),
+        "vad_nrc": pl.DataFrame({
+            "word": words,
+            "valence": ratings(0, 1),
+            "arousal": ratings(0, 1),
+            "dominance": ratings(0, 1),
+        }).cast({"valence": pl.Float32, "arousal": pl.Float32,
+                 "dominance": pl.Float32}),
+        "intensity_nrc": pl.DataFrame({
+            "word": words,
+            "emotion": rng.choice(EMOTIONS, n),
+            "emotion_intensity": ratings(0, 1),
+        }).cast({"emotion_intensity": pl.Float32}),
+        "concreteness_brysbaert": pl.DataFrame({
+            "Word": words, "Conc.M": ratings(1, 5), "Conc.SD": ratings(0, 2),
+        }),
+        "aoa_kuperman": pl.DataFrame({
+            "Word": words, "Rating.Mean": ratings(2, 20),
+            "Rating.SD": ratings(0, 5),
+        }),
+        "prevalence_brysbaert": pl.DataFrame({
+            "Word": words, "Prevalence": ratings(-1, 3),
+        }),
+        "socialness": pl.DataFrame({
+            "Word": words, "Mean": ratings(1, 7), "SD": ratings(0, 2),
+        }),
+        "iconicity_winter": pl.DataFrame({
+            "word": words, "rating": ratings(1, 7), "rating_sd": ratings(0, 2),
+        }),
+        "sensorimotor_lancaster": pl.DataFrame(sensorimotor),
+    }
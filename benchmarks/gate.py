@@ -0,0 +1,269 @@
+"""
+Performance regression gate: runs the benchmark suites and compares the
+results against stored baselines.
+
+The end-to-end suite (run.py) is compared per feature area and grid
+point, the micro-benchmarks (micro.py) per feature and per module. A
+case regresses if its throughput drops or its time or peak memory grows
+by more than the tolerance. The gate prints a diff table and exits with
+status 1 if any case regresses.
+
+The baselines are JSON results of the suites in benchmarks/baselines/.
+The grid of a baseline is run again, so the results are comparable.
+Timings depend on the machine: create the baselines on the machine the
+gate runs on, e.g., from the main branch before a change.
+
+Usage:
+
+    # Create or update the baselines
+    python -m benchmarks.gate --update
+
+    # Compare the current tree against the baselines
+    python -m benchmarks.gate --time-tolerance 0.2 --memory-tolerance 0.3
+"""
+import argparse
+import json
+import os
+import sys
+
+import polars as pl
+
+from .run import PRESETS, run_suite, write_results
+from .micro import run_micro
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+SUITES = ["e2e", "micro"]
+
+# The grids run if there is no baseline yet
+DEFAULT_GRIDS = {
+    "e2e": dict(PRESETS["quick"]),
+    "micro": {"modules": None, "lengths": [10, 100, 1_000],
+              "sizes": [100], "features": None},
+}
+
+# Metrics compared per suite; True if higher is better
+METRICS = {
+    "e2e": {"tokens_per_second": True,
+            "feature_tokens_per_second": True,
+            "peak_rss_delta": False},
+    "micro": {"seconds": False},
+}
+
+# Differences below these are noise, regardless of the tolerance
+MIN_SECONDS = 0.002
+MIN_BYTES = 16 * 2 ** 20
+
+DIFF_SCHEMA = {
+    "suite": pl.String,
+    "case": pl.String,
+    "metric": pl.String,
+    "baseline": pl.Float64,
+    "current": pl.Float64,
+    "change": pl.Float64,
+    "status": pl.String,
+}
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the benchmark suites against baselines.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES,
+                        default=SUITES,
+                        help="The suites to run. Defaults to both.")
+    parser.add_argument("--baseline-dir", default=BASELINE_DIR,
+                        help="The directory of the baselines.")
+    parser.add_argument("--time-tolerance", type=float, default=0.25,
+                        help="The tolerated relative drop in throughput or "
+                        "growth in time. Defaults to 0.25.")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="The tolerated relative growth in peak "
+                        "memory. Defaults to 0.25.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="The number of runs per case. Defaults to 3.")
+    parser.add_argument("--update", action="store_true",
+                        help="Write the results as the new baselines "
+                        "instead of comparing.")
+    parser.add_argument("--show-all", action="store_true",
+                        help="Print all cases, not only the changed ones.")
+    args = parser.parse_args(argv)
+
+    diffs = []
+    for suite in args.suites:
+        path = os.path.join(args.baseline_dir, f"{suite}.json")
+        baseline = None
+        if os.path.exists(path):
+            with open(path) as f:
+                baseline = json.load(f)
+        elif not args.update:
+            print(f"No baseline for the {suite} suite at {path}. Run with "
+                  "--update to create it.")
+            sys.exit(2)
+
+        grid = baseline["metadata"]["grid"] if baseline is not None \
+            else DEFAULT_GRIDS[suite]
+        results = run_grid(suite, grid, baseline, repeat=args.repeat)
+        if args.update:
+            write_results(results, path)
+            print(f"Baseline written to {path}")
+            continue
+        diffs.append(compare(suite, baseline, results,
+                             time_tolerance=args.time_tolerance,
+                             memory_tolerance=args.memory_tolerance))
+
+    if args.update:
+        return
+    diff = pl.concat(diffs)
+    shown = diff if args.show_all else \
+        diff.filter(pl.col("status") != "ok")
+    with pl.Config(tbl_rows=-1, tbl_width_chars=140, fmt_str_lengths=60):
+        print(shown)
+    n_regressions = diff.filter(pl.col("status") == "regression").height
+    print(f"{n_regressions} regressions in {diff.height} comparisons.")
+    sys.exit(1 if n_regressions else 0)
+
+def run_grid(suite: str,
+             grid: dict,
+             baseline: dict | None = None,
+             repeat: int = 3,
+             ) -> dict:
+    """
+    Runs a suite on a grid.
+
+    Args:
+        suite (str): The suite, either 'e2e' or 'micro'.
+        grid (dict): The grid, as stored in the metadata of the results.
+        baseline (dict | None): The baseline, whose model is used.
+        repeat (int): The number of runs per case. Defaults to 3.
+
+    Returns:
+        results (dict): The results of the suite.
+    """
+    if suite == "e2e":
+        model = None
+        if baseline is not None and \
+            baseline["metadata"].get("model", "blank_en") != "blank_en":
+            model = baseline["metadata"]["model"]
+        return run_suite(sizes=grid["sizes"],
+                         lengths=grid["lengths"],
+                         areas=grid["areas"],
+                         model=model,
+                         repeat=repeat,
+                         **({"max_words": grid["max_words"]}
+                            if "max_words" in grid else {}))
+    if suite == "micro":
+        return run_micro(**{key: value for key, value in grid.items()
+                            if value is not None},
+                         repeat=repeat)
+    raise ValueError(f"Unknown suite '{suite}'. Available suites are "
+                     f"{SUITES}.")
+
+def compare(suite: str,
+            baseline: dict,
+            results: dict,
+            time_tolerance: float = 0.25,
+            memory_tolerance: float = 0.25,
+            ) -> pl.DataFrame:
+    """
+    Compares the results of a suite against its baseline.
+
+    Args:
+        suite (str): The suite, either 'e2e' or 'micro'.
+        baseline (dict): The baseline results.
+        results (dict): The current results.
+        time_tolerance (float):
+            The tolerated relative drop in throughput or growth in time.
+        memory_tolerance (float):
+            The tolerated relative growth in peak memory.
+
+    Returns:
+        diff (pl.DataFrame): One row per case and metric, with the
+            columns 'suite', 'case', 'metric', 'baseline', 'current',
+            'change' (relative) and 'status' ('ok', 'regression',
+            'improved', 'new', 'missing' or 'error').
+    """
+    before = _cases(suite, baseline)
+    after = _cases(suite, results)
+    rows = []
+    for case in list(before) + [case for case in after
+                                if case not in before]:
+        for metric, higher_is_better in METRICS[suite].items():
+            old = before.get(case, {}).get(metric)
+            new = after.get(case, {}).get(metric)
+            tolerance = memory_tolerance if metric.startswith("peak") \
+                else time_tolerance
+            rows.append({
+                "suite": suite,
+                "case": case,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": None if old in (None, 0) or new is None
+                else (new - old) / old,
+                "status": _status(case in before, case in after, old, new,
+                                  higher_is_better, tolerance,
+                                  MIN_BYTES if metric.startswith("peak")
+                                  else MIN_SECONDS),
+            })
+    return pl.DataFrame(rows, schema=DIFF_SCHEMA)
+
+def _cases(suite: str, results: dict) -> dict[str, dict]:
+    """
+    Indexes the results of a suite by case. The micro-benchmarks are
+    also summed per module.
+    """
+    if suite == "e2e":
+        return {f"{r['area']} ({r['size']} x {r['length']})": r
+                for r in results["results"]}
+    cases = {}
+    modules = {}
+    for r in results["results"]:
+        grid_point = f"({r['size']} x {r['length']})"
+        cases[f"{r['module']}.{r['feature']} {grid_point}"] = r
+        if r["module"] == "helpers":
+            continue
+        module = modules.setdefault(f"{r['module']} {grid_point}",
+                                    {"seconds": 0.0})
+        # A module with a failing feature cannot be compared as a whole
+        if r["seconds"] is None or module["seconds"] is None:
+            module["seconds"] = None
+        else:
+            module["seconds"] += r["seconds"]
+    cases.update(modules)
+    return cases
+
+def _status(in_baseline: bool,
+            in_results: bool,
+            old: float | None,
+            new: float | None,
+            higher_is_better: bool,
+            tolerance: float,
+            min_difference: float,
+            ) -> str:
+    """
+    Classifies the change of a metric.
+    """
+    if not in_baseline:
+        return "new"
+    if not in_results:
+        return "missing"
+    if new is None:
+        # A case that fails now but did not before is a regression
+        return "regression" if old is not None else "error"
+    if old is None:
+        return "improved"
+    # Throughputs are compared relatively; times and memory also need to
+    # exceed an absolute noise floor
+    if higher_is_better:
+        if new < old * (1 - tolerance):
+            return "regression"
+        if new > old * (1 + tolerance):
+            return "improved"
+        return "ok"
+    if new > old * (1 + tolerance) and new - old > min_difference:
+        return "regression"
+    if new < old * (1 - tolerance) and old - new > min_difference:
+        return "improved"
+    return "ok"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Runs micro-benchmarks of the feature functions of each feature module on
+the synthetic parse fixture (see fixtures.py), without parsing.
+
+Every feature is timed on the same input: the parsed documents with the
+shared 'tokens' and 'lemmas' helper columns, whose cost is reported
+separately in the 'helpers' module. Other helper columns a feature needs
+are included in its time. For every feature, the suite reports the time
+per 1k tokens over a grid of document lengths and corpus sizes, and the
+scaling exponents of the time in the document length and in the corpus
+size: 1 means linear, 2 means quadratic.
+
+Usage:
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --modules lexical_richness readability \
+        --lengths 10 100 1000 --sizes 100 1000
+"""
+import argparse
+import contextlib
+import datetime
+import math
+import os
+import time
+import warnings
+
+import polars as pl
+
+from elfen.features import (
+    FEATURE_AREA_MAP,
+    FEATURE_LEXICON_MAP,
+    FUNCTION_MAP,
+    HELPER_FUNCTION_MAP,
+)
+
+from .corpus import make_vocabulary
+from .fixtures import make_data, make_docs, make_lexicons
+from .run import RESULTS_DIR, write_results
+
+MODULES = ["surface", "lexical_richness", "emotion", "psycholinguistic",
+           "semantic", "dependency", "morphological", "readability",
+           "information"]
+
+SHARED_HELPERS = ["tokens", "lemmas"]
+
+TIMING_SCHEMA = {
+    "module": pl.String,
+    "feature": pl.String,
+    "size": pl.Int64,
+    "length": pl.Int64,
+    "n_tokens": pl.Int64,
+    "seconds": pl.Float64,
+    "ms_per_1k_tokens": pl.Float64,
+    "error": pl.String,
+}
+
+SCALING_SCHEMA = {
+    "module": pl.String,
+    "feature": pl.String,
+    "length_exponent": pl.Float64,
+    "size_exponent": pl.Float64,
+}
+
+# Exponents above this are reported as superlinear
+SUPERLINEAR_EXPONENT = 1.3
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the ELFEN micro-benchmarks.")
+    parser.add_argument("--modules", nargs="+", default=MODULES,
+                        help="The feature modules.")
+    parser.add_argument("--features", nargs="+", default=None,
+                        help="Only benchmark these features.")
+    parser.add_argument("--lengths", type=int, nargs="+",
+                        default=[10, 100, 1_000],
+                        help="The document lengths in words.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 1_000],
+                        help="The corpus sizes in documents.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="The number of runs per feature; the minimum "
+                        "time is reported. Defaults to 3.")
+    parser.add_argument("--output", default=None,
+                        help="The JSON file to write. Defaults to "
+                        "benchmarks/results/micro-<timestamp>.json.")
+    args = parser.parse_args(argv)
+
+    results = run_micro(modules=args.modules,
+                        lengths=args.lengths,
+                        sizes=args.sizes,
+                        repeat=args.repeat,
+                        features=args.features)
+    print_summary(results)
+
+    output = args.output
+    if output is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"micro-{timestamp}.json")
+    write_results(results, output)
+    print(f"Results written to {output}")
+
+def run_micro(modules: list[str] = MODULES,
+              lengths: list[int] = [10, 100, 1_000],
+              sizes: list[int] = [100, 1_000],
+              repeat: int = 3,
+              features: list[str] | None = None,
+              ) -> dict:
+    """
+    Times the features of the given modules over the grid of document
+    lengths and corpus sizes.
+
+    Args:
+        modules (list[str]): The feature modules, see FEATURE_AREA_MAP.
+        lengths (list[int]): The document lengths in words.
+        sizes (list[int]): The corpus sizes in documents.
+        repeat (int): The number of runs per feature. Defaults to 3.
+        features (list[str] | None): Only benchmark these features.
+            Defaults to all features of the modules.
+
+    Returns:
+        results (dict):
+            The timings per feature and grid point ('results') and the
+            scaling exponents per feature ('scaling').
+    """
+    vocabulary = make_vocabulary()
+    lexicons = make_lexicons(vocabulary)
+    timings = []
+    for size in sizes:
+        for length in lengths:
+            print(f"Benchmarking {size} documents x {length} words...")
+            docs = make_docs(size, length, vocabulary=vocabulary)
+            n_tokens = sum(len(doc) for doc in docs)
+            data = make_data(docs)
+            for helper in SHARED_HELPERS:
+                elapsed, data = _time(
+                    lambda data, helper=helper:
+                    HELPER_FUNCTION_MAP[helper](data=data,
+                                                backbone="spacy"),
+                    data, repeat)
+                timings.append(_timing("helpers", helper, size, length,
+                                       n_tokens, elapsed))
+            for module in modules:
+                for feature in FEATURE_AREA_MAP[module]:
+                    if features is not None and feature not in features:
+                        continue
+                    timings.append(_time_feature(module, feature, data,
+                                                 lexicons, size, length,
+                                                 n_tokens, repeat))
+
+    return {
+        "metadata": {
+            "timestamp": datetime.datetime.now().isoformat(
+                timespec="seconds"),
+            "repeat": repeat,
+            "polars": pl.__version__,
+            "cpu_count": os.cpu_count(),
+            "grid": {"modules": modules,
+                     "lengths": lengths,
+                     "sizes": sizes,
+                     "features": features},
+        },
+        "results": timings,
+        "scaling": _scaling(timings),
+    }
+
+def print_summary(results: dict) -> None:
+    """
+    Prints the time per 1k tokens at the largest grid point and the
+    scaling exponents of every feature.
+    """
+    timings = pl.DataFrame(results["results"], schema=TIMING_SCHEMA)
+    scaling = pl.DataFrame(results["scaling"], schema=SCALING_SCHEMA)
+    largest = timings.filter(
+        (pl.col("size") == pl.col("size").max()) &
+        (pl.col("length") == pl.col("length").max()))
+    summary = largest.select(
+        "module", "feature", "ms_per_1k_tokens", "error",
+    ).join(scaling, on=["module", "feature"], how="left")
+    with pl.Config(tbl_rows=-1, tbl_width_chars=120, fmt_str_lengths=40):
+        print(summary.sort("ms_per_1k_tokens", descending=True,
+                           nulls_last=True))
+    superlinear = scaling.filter(
+        pl.col("length_exponent") > SUPERLINEAR_EXPONENT)
+    for row in superlinear.iter_rows(named=True):
+        print(f"Superlinear in the document length: {row['feature']} "
+              f"(exponent {row['length_exponent']:.2f})")
+
+def _time_feature(module: str,
+                  feature: str,
+                  data: pl.DataFrame,
+                  lexicons: dict,
+                  size: int,
+                  length: int,
+                  n_tokens: int,
+                  repeat: int,
+                  ) -> dict:
+    """
+    Times one feature function; errors, e.g., missing resources, are
+    recorded instead of raised.
+    """
+    kwargs = {}
+    if feature in FEATURE_LEXICON_MAP:
+        kwargs["lexicon"] = lexicons[FEATURE_LEXICON_MAP[feature]["en"]]
+
+    def call(data):
+        result = FUNCTION_MAP[feature](data=data,
+                                       backbone="spacy",
+                                       text_column="text",
+                                       language="en",
+                                       **kwargs)
+        # Lazy results are materialized
+        if not isinstance(result, pl.DataFrame):
+            result = data.with_columns(result)
+        return result
+
+    try:
+        with warnings.catch_warnings(), \
+            open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+            warnings.simplefilter("ignore")
+            elapsed, _ = _time(call, data, repeat)
+    except Exception as error:
+        return _timing(module, feature, size, length, n_tokens, None,
+                       error=f"{type(error).__name__}: {error}"[:200])
+    return _timing(module, feature, size, length, n_tokens, elapsed)
+
+def _time(function, data: pl.DataFrame, repeat: int):
+    """
+    Returns the minimum time of repeated calls and the last result.
+
+    Every call gets its own copy of the data, as some functions, e.g., the
+    helpers, add their columns in place.
+    """
+    elapsed = math.inf
+    for _ in range(max(1, repeat)):
+        run_data = data.clone()
+        start = time.perf_counter()
+        result = function(run_data)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed, result
+
+def _timing(module: str,
+            feature: str,
+            size: int,
+            length: int,
+            n_tokens: int,
+            elapsed: float | None,
+            error: str | None = None,
+            ) -> dict:
+    return {
+        "module": module,
+        "feature": feature,
+        "size": size,
+        "length": length,
+        "n_tokens": n_tokens,
+        "seconds": elapsed,
+        "ms_per_1k_tokens": None if elapsed is None
+        else elapsed * 1e6 / n_tokens,
+        "error": error,
+    }
+
+def _scaling(timings: list[dict]) -> list[dict]:
+    """
+    Fits the exponents of the time in the document length (at the largest
+    corpus size) and in the corpus size (at the longest documents) with
+    least squares on the log-log scale.
+    """
+    frame = pl.DataFrame(timings, schema=TIMING_SCHEMA).filter(pl.col("seconds").is_not_null())
+    if frame.height == 0:
+        return []
+    scaling = []
+    for (module, feature), group in frame.group_by(["module", "feature"],
+                                                   maintain_order=True):
+        by_length = group.filter(pl.col("size") == group["size"].max())
+        by_size = group.filter(pl.col("length") == group["length"].max())
+        scaling.append({
+            "module": module,
+            "feature": feature,
+            "length_exponent": _exponent(by_length["length"],
+                                         by_length["seconds"]),
+            "size_exponent": _exponent(by_size["size"], by_size["seconds"]),
+        })
+    return scaling
+
+def _exponent(x: pl.Series, y: pl.Series) -> float | None:
+    """
+    The slope of log(y) over log(x), or None for less than two points.
+    """
+    if x.n_unique() < 2:
+        return None
+    log_x = x.cast(pl.Float64).log()
+    log_y = y.clip(lower_bound=1e-9).log()
+    centered = log_x - log_x.mean()
+    return float((centered * (log_y - log_y.mean())).sum() /
+                 (centered ** 2).sum())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Runs the end-to-end benchmark suite and writes the results as JSON.
+
+Every case of the grid, i.e., every combination of corpus size, length
+profile and feature area, is run in a fresh process, so that the peak
+memory of one case does not hide the peak memory of the next one. For
+every case, the suite records the parsing and feature extraction time,
+the throughput in documents and tokens per second and the peak resident
+set size.
+
+By default, a blank spaCy pipeline with a sentencizer is used, so the
+suite runs offline and measures the cost of ELFEN rather than of the
+model. Pass an installed model with --model to include its annotations.
+
+Usage:
+
+    python -m benchmarks.run --preset quick
+    python -m benchmarks.run --sizes 100 10000 --lengths tweet book \
+        --areas surface readability --output results.json
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import datetime
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+
+PRESETS = {
+    "quick": {
+        "sizes": [100, 1_000],
+        "lengths": ["tweet", "review"],
+        "areas": ["surface", "lexical_richness", "readability",
+                  "information"],
+    },
+    "full": {
+        "sizes": [100, 1_000, 10_000, 100_000, 1_000_000],
+        "lengths": ["tweet", "review", "article", "book"],
+        "areas": ["surface", "lexical_richness", "readability",
+                  "information", "pos", "morphological", "dependency",
+                  "entities"],
+    },
+}
+
+# Cases with more words than this are skipped, e.g., a million books
+DEFAULT_MAX_WORDS = 50_000_000
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the ELFEN benchmark suite.")
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick",
+                        help="The grid to run. Overridden by --sizes, "
+                        "--lengths and --areas.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help="The corpus sizes in documents.")
+    parser.add_argument("--lengths", nargs="+",
+                        help="The length profiles, see corpus.py.")
+    parser.add_argument("--areas", nargs="+",
+                        help="The feature areas.")
+    parser.add_argument("--model", default=None,
+                        help="The spaCy model. Defaults to a blank "
+                        "English pipeline with a sentencizer.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="The number of runs per case; the median "
+                        "time is reported. Defaults to 3.")
+    parser.add_argument("--max-words", type=int, default=DEFAULT_MAX_WORDS,
+                        help="Skip cases with more words in expectation.")
+    parser.add_argument("--output", default=None,
+                        help="The JSON file to write. Defaults to "
+                        "benchmarks/results/<preset>-<timestamp>.json.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(sizes=args.sizes or PRESETS[args.preset]["sizes"],
+                        lengths=args.lengths or
+                        PRESETS[args.preset]["lengths"],
+                        areas=args.areas or PRESETS[args.preset]["areas"],
+                        model=args.model,
+                        repeat=args.repeat,
+                        max_words=args.max_words)
+
+    output = args.output
+    if output is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{args.preset}-{timestamp}.json")
+    write_results(results, output)
+    print(f"Results written to {output}")
+
+def run_suite(sizes: list[int],
+              lengths: list[str],
+              areas: list[str],
+              model: str | None = None,
+              repeat: int = 3,
+              max_words: int = DEFAULT_MAX_WORDS,
+              ) -> dict:
+    """
+    Runs every case of the grid in a fresh process.
+
+    Args:
+        sizes (list[int]): The corpus sizes in documents.
+        lengths (list[str]): The length profiles, see corpus.py.
+        areas (list[str]): The feature areas.
+        model (str | None):
+            The spaCy model. Defaults to a blank English pipeline with a
+            sentencizer.
+        repeat (int): The number of runs per case. Defaults to 3.
+        max_words (int): Cases with more words in expectation are
+            skipped.
+
+    Returns:
+        results (dict): The metadata of the run and one result per case.
+    """
+    from .corpus import LENGTH_PROFILES
+
+    with contextlib.ExitStack() as stack:
+        if model is None:
+            model = _blank_model(stack.enter_context(
+                tempfile.TemporaryDirectory()))
+        cases = []
+        for size, length, area in itertools.product(sizes, lengths, areas):
+            if size * LENGTH_PROFILES[length][0] > max_words:
+                print(f"Skipping {size} x {length} ({area}): more than "
+                      f"{max_words} words.")
+                continue
+            print(f"Running {size} x {length} ({area})...")
+            cases.append(_run_case(size, length, area, model, repeat))
+            print(f"    {cases[-1]['docs_per_second']:.1f} docs/s, "
+                  f"{cases[-1]['tokens_per_second']:.1f} tokens/s, "
+                  f"peak RSS {cases[-1]['peak_rss'] / 2 ** 20:.1f} MiB")
+
+    metadata = _metadata(model, repeat)
+    metadata["grid"] = {"sizes": sizes,
+                        "lengths": lengths,
+                        "areas": areas,
+                        "max_words": max_words}
+    return {"metadata": metadata, "results": cases}
+
+def write_results(results: dict, path: str) -> None:
+    """
+    Writes the results of run_suite as JSON.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+def _run_case(size: int,
+              length: str,
+              area: str,
+              model: str,
+              repeat: int,
+              ) -> dict:
+    """
+    Runs one case in fresh processes and aggregates the runs.
+    """
+    runs = []
+    for _ in range(max(1, repeat)):
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+            runs.append(executor.submit(_measure_case, size, length, area,
+                                        model).result())
+
+    run = dict(runs[0])
+    for key in ["parse_time", "feature_time", "wall_time"]:
+        run[key] = statistics.median(r[key] for r in runs)
+    run["docs_per_second"] = size / run["wall_time"]
+    run["tokens_per_second"] = run["n_tokens"] / run["wall_time"]
+    run["feature_tokens_per_second"] = run["n_tokens"] / \
+        max(run["feature_time"], 1e-9)
+    run["peak_rss"] = max(r["peak_rss"] for r in runs)
+    run["peak_rss_delta"] = max(r["peak_rss_delta"] for r in runs)
+    run["repeat"] = len(runs)
+    return run
+
+def _measure_case(size: int,
+                  length: str,
+                  area: str,
+                  model: str,
+                  ) -> dict:
+    """
+    Generates the corpus and extracts the features of one case. Runs in a
+    fresh process.
+    """
+    import polars as pl
+
+    from elfen import Extractor
+    from elfen.configs.extractor_config import CONFIG_ALL
+    from elfen.features import FEATURE_AREA_MAP
+    from elfen.profiling import _peak_rss
+    from .corpus import make_corpus
+
+    data = make_corpus(size, length=length)
+    config = dict(CONFIG_ALL,
+                  model=model,
+                  remove_constant_cols=False,
+                  features={area: FEATURE_AREA_MAP[area]})
+    rss = _peak_rss()
+    with open(os.devnull, "w") as devnull, \
+        contextlib.redirect_stdout(devnull):
+        extractor = Extractor(data, config=config)
+        extractor.extract_features()
+    profile = extractor.profile()
+    peak_rss = _peak_rss()
+
+    parse_time = profile.filter(pl.col("stage") == "parse")[
+        "wall_time"].sum()
+    return {
+        "size": size,
+        "length": length,
+        "area": area,
+        "n_tokens": sum(len(doc) for doc in extractor.data["nlp"]),
+        "n_features": len(extractor.get_feature_names()),
+        "parse_time": parse_time,
+        "feature_time": profile["wall_time"].sum() - parse_time,
+        "wall_time": profile["wall_time"].sum(),
+        "peak_rss": peak_rss,
+        "peak_rss_delta": peak_rss - rss,
+    }
+
+def _blank_model(directory: str) -> str:
+    """
+    Saves a blank English spaCy pipeline with a sentencizer, so that it
+    can be loaded by path in the worker processes.
+    """
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    path = os.path.join(directory, "blank_en")
+    nlp.to_disk(path)
+    return path
+
+def _metadata(model: str, repeat: int) -> dict:
+    """
+    The environment the suite was run in.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    def package_version(package: str) -> str | None:
+        try:
+            return version(package)
+        except PackageNotFoundError:
+            return None
+
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        # Temporary paths are replaced by the pipeline they stand for
+        "model": "blank_en" if model.startswith(tempfile.gettempdir())
+        else model,
+        "repeat": repeat,
+        "elfen": package_version("elfen"),
+        "polars": package_version("polars"),
+        "spacy": package_version("spacy"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,7 @@
+from .checkpoint import extract_checkpointed
 from .extractor import Extractor
-from .resources import list_external_resources, get_bibtex
\ No newline at end of file
+from .incremental import CorpusState, extract_incremental
+from .parallel import extract_sharded
+from .resources import list_external_resources, get_bibtex
+from .scaling import FeatureScaler
+from .server import ExtractionServer
\ No newline at end of file
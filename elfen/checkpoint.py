@@ -0,0 +1,380 @@
+"""
+This module contains functions to extract features with checkpoints, so
+that long extraction runs can be resumed after an interruption.
+
+The input data is split into chunks of rows that are processed one after
+another. The progress is persisted to a work directory:
+
+- The parsed documents of the current chunk, so that an interrupted chunk
+  is not parsed again.
+- The columns of every completed feature of the current chunk.
+- Every completed chunk, with all of its features, as a Parquet file.
+
+A resumed run skips completed chunks and features. The work directory is
+bound to a hash of the configuration and of the input data; resuming with
+a different configuration or input raises an error. Corpus-global
+features are computed once all chunks are completed, from the frequency
+tables of the chunks (see the parallel module).
+
+The work directory is laid out as follows:
+
+    work_dir/
+        manifest.json
+        chunk_00000.parquet            completed chunk
+        chunk_00000_token_freqs.parquet
+        chunk_00001/                   chunk in progress
+            docs.spacy                 parsed documents
+            features/
+                0000_n_tokens.parquet  completed feature
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+
+import polars as pl
+
+from .configs.extractor_config import (
+    CONFIG_ALL,
+)
+from .extractor import (
+    Extractor,
+)
+from .parallel import (
+    drop_carried_columns,
+    get_part_frequencies,
+    get_worker_nlp,
+    init_worker,
+    reduce_global_features,
+    split_global_features,
+)
+from .preprocess import (
+    load_docs,
+    load_nlp,
+    preprocess_data,
+    save_docs,
+)
+
+MANIFEST_FILE = "manifest.json"
+
+def extract_checkpointed(data: pl.DataFrame,
+                         work_dir: str,
+                         config: dict[str, str] = CONFIG_ALL,
+                         chunk_size: int = 10_000,
+                         overwrite: bool = False,
+                         keep_parse: bool = False,
+                         n_workers: int = 1,
+                         verbose: bool = True,
+                         **kwargs,
+                         ) -> pl.DataFrame:
+    """
+    Extracts the features specified in the config chunk by chunk and
+    persists the progress to a work directory. Calling the function again
+    with the same arguments resumes an interrupted run.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+        work_dir (str): The directory to persist the progress to.
+        config (dict[str, str]):
+            The extractor configuration, see the Extractor class.
+        chunk_size (int): The number of rows per chunk. Defaults to 10000.
+        overwrite (bool):
+            Whether to discard a work directory that belongs to a
+            different configuration or input. Defaults to False, i.e.,
+            an error is raised.
+        keep_parse (bool):
+            Whether to keep the parsed documents of completed chunks.
+            Defaults to False.
+        n_workers (int):
+            The number of worker processes the chunks are extracted in.
+            Every worker loads the NLP model once. Defaults to 1, i.e.,
+            the chunks are extracted one after another in this process.
+        verbose (bool):
+            Whether to print the progress of the chunks and features.
+            Defaults to True.
+        **kwargs:
+            Additional configuration settings overriding the config,
+            e.g., backbone, language, model or text_column.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the extracted features. Helper columns are
+            removed.
+    """
+    config = dict(config, **kwargs)
+    for key, value in CONFIG_ALL.items():
+        config.setdefault(key, value)
+    if config["backbone"] not in ["spacy", "stanza"]:
+        raise ValueError("Backbone must be 'spacy' or 'stanza'.")
+
+    manifest = {
+        "config_hash": hash_config(config),
+        "input_hash": hash_input(data),
+        "chunk_size": chunk_size,
+        "n_rows": data.height,
+    }
+    _prepare_work_dir(work_dir, manifest, overwrite=overwrite)
+
+    local_features, global_features = split_global_features(
+        config["features"])
+    features = [feature for area_features in local_features.values()
+                for feature in area_features]
+    chunk_config = dict(config,
+                        features=local_features,
+                        # Constant columns are only known for all chunks
+                        remove_constant_cols=False)
+
+    offsets = list(range(0, data.height, chunk_size))
+    pending = [index for index in range(len(offsets))
+               if not os.path.exists(_chunk_path(work_dir, index))]
+    if n_workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(pending)),
+            # Forking a process that runs Polars threads can deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(config["backbone"],
+                      config["model"],
+                      config["max_length"]),
+            ) as executor:
+            futures = {
+                executor.submit(_extract_chunk_in_worker,
+                                data.slice(offsets[index], chunk_size),
+                                work_dir,
+                                index,
+                                # No nested process or thread pools
+                                dict(chunk_config,
+                                     n_process=1,
+                                     n_threads=1,
+                                     n_doc_processes=0),
+                                features,
+                                global_features,
+                                keep_parse=keep_parse): index
+                for index in pending}
+            for n_done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if verbose:
+                    print(f"Completed chunk {futures[future]} "
+                          f"({n_done}/{len(pending)})")
+    else:
+        nlp = None
+        for index in pending:
+            if nlp is None:
+                nlp = load_nlp(backbone=config["backbone"],
+                               model=config["model"],
+                               max_length=config["max_length"])
+            if verbose:
+                print(f"Extracting chunk {index}...")
+            _extract_chunk(data.slice(offsets[index], chunk_size),
+                           work_dir,
+                           index,
+                           chunk_config,
+                           features,
+                           global_features,
+                           nlp=nlp,
+                           keep_parse=keep_parse,
+                           verbose=verbose)
+
+    chunks = []
+    frequencies = []
+    for index in range(len(offsets)):
+        chunk_path = _chunk_path(work_dir, index)
+        chunks.append(pl.read_parquet(chunk_path))
+        frequencies.append({
+            kind: pl.read_parquet(_frequency_path(work_dir, index, kind))
+            for kind in _frequency_kinds(work_dir, index)
+        })
+
+    out = pl.concat(chunks, how="diagonal_relaxed") if chunks else \
+        data.clear()
+    out = reduce_global_features(out,
+                                 global_features,
+                                 frequencies,
+                                 backbone=config["backbone"],
+                                 text_column=config["text_column"],
+                                 language=config["language"])
+    out = out.drop([column for column in ["tokens", "lemmas"]
+                    if column not in data.columns], strict=False)
+    out = drop_carried_columns(out, config["features"], data.columns)
+
+    if config["remove_constant_cols"] and len(out) > 1:
+        out = out.drop([column for column in out.columns
+                        if column not in data.columns and
+                        out[column].n_unique() == 1])
+
+    return out
+
+def hash_config(config: dict[str, str]) -> str:
+    """
+    Hashes an extractor configuration.
+
+    Args:
+        config (dict[str, str]): The extractor configuration.
+
+    Returns:
+        hash (str): The SHA-256 hex digest of the configuration.
+    """
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+def hash_input(data: pl.DataFrame) -> str:
+    """
+    Hashes the input data: the column names and the values of every
+    column as text. The hash only depends on the data, not on the Polars
+    version, so that a run can be resumed after an upgrade. Columns
+    holding Python objects are not hashed.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+
+    Returns:
+        hash (str): The SHA-256 hex digest of the data.
+    """
+    digest = hashlib.sha256()
+    for column in data.select(pl.exclude(pl.Object)).columns:
+        if data[column].dtype.is_nested():
+            values = data.select(
+                pl.struct(column).struct.json_encode()).to_series()
+        else:
+            values = data[column].cast(pl.String)
+        digest.update(json.dumps(column).encode())
+        # The byte lengths separate the values and mark nulls (-1)
+        digest.update(values.str.len_bytes().cast(pl.Int64).fill_null(-1)
+                      .to_numpy().tobytes())
+        digest.update(values.str.join("").item().encode())
+    return digest.hexdigest()
+
+def _prepare_work_dir(work_dir: str,
+                      manifest: dict[str, str],
+                      overwrite: bool = False,
+                      ) -> None:
+    """
+    Creates the work directory or validates an existing one against the
+    manifest of the current run.
+    """
+    manifest_path = os.path.join(work_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            existing = json.load(f)
+        if existing == manifest:
+            return
+        if not overwrite:
+            raise ValueError(f"The work directory '{work_dir}' belongs to "
+                             "a different configuration or input. Use "
+                             "another directory or overwrite=True.")
+        shutil.rmtree(work_dir)
+    elif os.path.isdir(work_dir) and os.listdir(work_dir):
+        raise ValueError(f"The work directory '{work_dir}' is not empty "
+                         "and is not a checkpoint directory.")
+
+    os.makedirs(work_dir, exist_ok=True)
+    _atomic_write(manifest_path,
+                  lambda path: _write_json(manifest, path))
+
+def _extract_chunk(data: pl.DataFrame,
+                   work_dir: str,
+                   index: int,
+                   config: dict[str, str],
+                   features: list[str],
+                   global_features: list[str],
+                   nlp,
+                   keep_parse: bool = False,
+                   verbose: bool = True,
+                   ) -> None:
+    """
+    Extracts the features of one chunk, resuming from the parse and the
+    completed features in the chunk directory.
+    """
+    chunk_dir = os.path.join(work_dir, f"chunk_{index:05d}")
+    feature_dir = os.path.join(chunk_dir, "features")
+    os.makedirs(feature_dir, exist_ok=True)
+
+    docs_path = os.path.join(chunk_dir, f"docs.{config['backbone']}")
+    if os.path.exists(docs_path):
+        docs = load_docs(docs_path, backbone=config["backbone"], nlp=nlp)
+        parsed = data.with_columns(pl.Series("nlp", docs, dtype=pl.Object))
+    else:
+        parsed = preprocess_data(data=data,
+                                 text_column=config["text_column"],
+                                 backbone=config["backbone"],
+                                 batch_size=config.get("batch_size", 1),
+                                 n_process=config.get("n_process", 1),
+                                 nlp=nlp)
+        _atomic_write(docs_path,
+                      lambda path: save_docs(parsed["nlp"].to_list(), path,
+                                              backbone=config["backbone"]))
+
+    # Restore the columns of the completed features
+    completed = {}
+    for filename in sorted(os.listdir(feature_dir)):
+        # Skip files an interruption left behind while writing
+        if not filename.endswith(".parquet"):
+            continue
+        completed[filename.split("_", 1)[1][:-len(".parquet")]] = \
+            pl.read_parquet(os.path.join(feature_dir, filename))
+    for columns in completed.values():
+        parsed = parsed.hstack(columns)
+
+    extractor = Extractor(parsed, config=config, verbose=verbose)
+    for position, feature in enumerate(features):
+        if feature in completed:
+            continue
+        columns = extractor.data.columns
+        extractor.extract(feature)
+        new_columns = [column for column in extractor.data.columns
+                       if column not in columns and
+                       column not in extractor.helper_cols]
+        _atomic_write(
+            os.path.join(feature_dir, f"{position:04d}_{feature}.parquet"),
+            extractor.data.select(new_columns).write_parquet)
+
+    out, frequencies = get_part_frequencies(extractor.data,
+                                            global_features,
+                                            backbone=config["backbone"])
+    for kind, table in frequencies.items():
+        _atomic_write(_frequency_path(work_dir, index, kind),
+                      table.write_parquet)
+    keep = [f"{kind}s" for kind in frequencies]
+    out = out.drop([column for column in extractor.helper_cols
+                    if column in out.columns and column not in keep])
+    # The chunk file marks the chunk as completed, so it is written last
+    _atomic_write(_chunk_path(work_dir, index), out.write_parquet)
+
+    if keep_parse:
+        shutil.rmtree(feature_dir)
+    else:
+        shutil.rmtree(chunk_dir)
+
+def _extract_chunk_in_worker(*args, **kwargs) -> None:
+    """
+    Extracts one chunk in a worker process, with the NLP pipeline the
+    worker loaded once, see _extract_chunk.
+    """
+    # The feature progress of every chunk is not printed
+    _extract_chunk(*args, nlp=get_worker_nlp(), verbose=False, **kwargs)
+
+def _atomic_write(path: str, write) -> None:
+    """
+    Writes a file with `write(path)` to a temporary path first and moves it
+    into place, so that an interruption never leaves a partial file.
+    """
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def _write_json(obj: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(obj, f)
+
+def _chunk_path(work_dir: str, index: int) -> str:
+    return os.path.join(work_dir, f"chunk_{index:05d}.parquet")
+
+def _frequency_path(work_dir: str, index: int, kind: str) -> str:
+    return os.path.join(work_dir, f"chunk_{index:05d}_{kind}_freqs.parquet")
+
+def _frequency_kinds(work_dir: str, index: int) -> list[str]:
+    return [kind for kind in ["token", "lemma"]
+            if os.path.exists(_frequency_path(work_dir, index, kind))]
@@ -0,0 +1,329 @@
+"""
+This module contains the command-line interface of elfen, e.g., to run
+extraction jobs from cron or Slurm without a Python driver script.
+
+Commands:
+
+- elfen extract INPUT OUTPUT:
+    Extracts the features of a CSV, TSV, Parquet, JSONL or Arrow IPC file
+    and writes them to a Parquet, Arrow IPC, CSV or JSONL file. The rows
+    are extracted in shards of --chunk-size rows in --workers worker
+    processes (see extract_sharded), and written as soon as they are
+    done. With --work-dir, the progress is persisted and an interrupted
+    job resumes when it is run again (see extract_checkpointed).
+- elfen serve:
+    Serves the extraction over HTTP on this machine, see the server
+    module.
+
+The configuration is a JSON or YAML file in the format of CONFIG_ALL;
+settings that are missing are taken from CONFIG_ALL. Reading YAML
+requires PyYAML.
+
+Example:
+
+    elfen extract corpus.parquet features.parquet --config config.yaml \\
+        --workers 8 --chunk-size 5000 --work-dir /scratch/elfen_job
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import polars as pl
+
+from .checkpoint import (
+    extract_checkpointed,
+)
+from .configs.extractor_config import (
+    CONFIG_ALL,
+)
+from .parallel import (
+    extract_sharded,
+)
+from .sinks import (
+    IPCSink,
+    ParquetSink,
+)
+
+# File formats by file extension
+INPUT_FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".parquet": "parquet",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+}
+
+OUTPUT_FORMATS = ["parquet", "ipc", "csv", "jsonl"]
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Runs the command-line interface.
+
+    Args:
+        argv (list[str] | None): The arguments. Defaults to the arguments
+            of the process.
+
+    Returns:
+        exit_code (int): 0 on success.
+    """
+    parser = argparse.ArgumentParser(
+        prog="elfen",
+        description="Efficient linguistic feature extraction.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser(
+        "extract", help="Extract the features of a file.")
+    extract.add_argument("input",
+                         help="The input file (.csv, .tsv, .parquet, "
+                         ".jsonl, .ndjson, .arrow, .ipc or .feather).")
+    extract.add_argument("output", help="The output file.")
+    _add_config_arguments(extract)
+    extract.add_argument("--format", choices=OUTPUT_FORMATS,
+                         help="The output format. Defaults to the format "
+                         "of the output file extension.")
+    extract.add_argument("--workers", type=int, default=1,
+                         help="The number of worker processes. "
+                         "Defaults to 1.")
+    extract.add_argument("--chunk-size", type=int, default=10_000,
+                         help="The number of rows per shard or chunk. "
+                         "Defaults to 10000.")
+    extract.add_argument("--batch-size", type=int,
+                         help="The batch size of the NLP pipeline.")
+    extract.add_argument("--work-dir",
+                         help="The directory to persist the progress to. "
+                         "Running the same job again resumes it.")
+    extract.add_argument("--overwrite", action="store_true",
+                         help="Discard a work directory of a different "
+                         "job.")
+    extract.add_argument("--quiet", action="store_true",
+                         help="Do not report the progress.")
+
+    serve = commands.add_parser(
+        "serve", help="Serve the extraction over HTTP on this machine.")
+    _add_config_arguments(serve)
+    serve.add_argument("--host", default="127.0.0.1",
+                       help="The host to bind to. Defaults to 127.0.0.1.")
+    serve.add_argument("--port", type=int, default=8000,
+                       help="The port to bind to. Defaults to 8000.")
+    serve.add_argument("--max-batch-size", type=int, default=32,
+                       help="The maximum number of texts per batch. "
+                       "Defaults to 32.")
+    serve.add_argument("--max-wait", type=float, default=0.01,
+                       help="The maximum time in seconds to wait for "
+                       "further requests of a batch. Defaults to 0.01.")
+
+    args = parser.parse_args(argv)
+    try:
+        config = _get_config(args)
+        if args.command == "extract":
+            run_extract(args, config)
+        else:
+            # Imported here, as the server is only needed by this command
+            from .server import ExtractionServer
+            ExtractionServer(config,
+                             max_batch_size=args.max_batch_size,
+                             max_wait=args.max_wait,
+                             ).serve_http(host=args.host, port=args.port)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"elfen: error: {e}\n")
+    return 0
+
+def run_extract(args: argparse.Namespace,
+                config: dict[str, str],
+                ) -> None:
+    """
+    Runs the extract command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        config (dict[str, str]): The extraction configuration.
+    """
+    if args.workers < 1:
+        raise ValueError("The number of workers must be at least 1.")
+    if args.chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1.")
+    if args.batch_size is not None:
+        config["batch_size"] = args.batch_size
+    output_format = args.format or _file_format(args.output,
+                                                {ext: fmt for ext, fmt
+                                                 in INPUT_FORMATS.items()
+                                                 if fmt in OUTPUT_FORMATS})
+
+    data = read_input(args.input)
+    if config["text_column"] not in data.columns:
+        raise ValueError(f"The input has no text column "
+                         f"'{config['text_column']}'.")
+    writer = _ProgressWriter(args.output, output_format, config,
+                             n_rows=data.height, quiet=args.quiet)
+    start = time.perf_counter()
+    try:
+        if args.work_dir is not None:
+            out = extract_checkpointed(data,
+                                       args.work_dir,
+                                       config=config,
+                                       chunk_size=args.chunk_size,
+                                       overwrite=args.overwrite,
+                                       n_workers=args.workers,
+                                       verbose=not args.quiet)
+            for offset in range(0, out.height, args.chunk_size):
+                writer.write(out.slice(offset, args.chunk_size))
+        else:
+            # Shards are written as soon as they are done
+            extract_sharded(data,
+                            config=config,
+                            n_workers=args.workers,
+                            n_shards=-(-data.height // args.chunk_size),
+                            sink=writer)
+    finally:
+        writer.close()
+    if not args.quiet:
+        print(f"Extracted the features of {writer.n_rows} rows in "
+              f"{time.perf_counter() - start:.1f}s to {args.output}",
+              file=sys.stderr)
+
+def read_input(path: str) -> pl.DataFrame:
+    """
+    Reads an input file by its extension.
+
+    Args:
+        path (str): The path of a .csv, .tsv, .parquet, .jsonl, .ndjson,
+            .arrow, .ipc or .feather file.
+
+    Returns:
+        data (pl.DataFrame): The data.
+    """
+    input_format = _file_format(path, INPUT_FORMATS)
+    if input_format == "csv":
+        return pl.read_csv(path)
+    if input_format == "tsv":
+        return pl.read_csv(path, separator="\t")
+    if input_format == "parquet":
+        return pl.read_parquet(path)
+    if input_format == "jsonl":
+        return pl.read_ndjson(path)
+    return pl.read_ipc(path)
+
+def load_config(path: str) -> dict[str, str]:
+    """
+    Loads an extraction configuration from a JSON or YAML file. Settings
+    that are missing are taken from CONFIG_ALL.
+
+    Args:
+        path (str): The path of a .json, .yaml or .yml file.
+
+    Returns:
+        config (dict[str, str]): The configuration.
+    """
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Reading YAML configurations requires "
+                                 "PyYAML. Install it with "
+                                 "'pip install pyyaml'.")
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"The configuration in '{path}' is not a mapping.")
+    return dict(CONFIG_ALL, **config)
+
+def _add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Helper function to add the configuration arguments of all commands.
+    """
+    parser.add_argument("--config",
+                        help="A JSON or YAML configuration in the format "
+                        "of CONFIG_ALL. Defaults to CONFIG_ALL.")
+    parser.add_argument("--backbone", choices=["spacy", "stanza"],
+                        help="Overrides the backbone of the config.")
+    parser.add_argument("--model",
+                        help="Overrides the model of the config.")
+    parser.add_argument("--language",
+                        help="Overrides the language of the config.")
+    parser.add_argument("--text-column",
+                        help="Overrides the text column of the config.")
+
+def _get_config(args: argparse.Namespace) -> dict[str, str]:
+    """
+    Helper function to load the configuration and apply the overrides.
+    """
+    config = load_config(args.config) if args.config is not None \
+        else dict(CONFIG_ALL)
+    for key in ["backbone", "model", "language", "text_column"]:
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    return config
+
+def _file_format(path: str,
+                 formats: dict[str, str],
+                 ) -> str:
+    """
+    Helper function to get the format of a file by its extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in formats:
+        raise ValueError(f"Unsupported file extension '{extension}' of "
+                         f"'{path}'. Supported are {sorted(formats)}.")
+    return formats[extension]
+
+class _ProgressWriter:
+    """
+    Writes the extracted chunks to the output file and reports the
+    progress. Parquet and Arrow IPC files are written with the sinks;
+    CSV and JSONL chunks are aligned to the columns of the first chunk.
+    """
+    def __init__(self,
+                 path: str,
+                 output_format: str,
+                 config: dict[str, str],
+                 n_rows: int,
+                 quiet: bool = False,
+                 ) -> None:
+        self.output_format = output_format
+        self.n_rows = 0
+        self.total_rows = n_rows
+        self.quiet = quiet
+        self.start = time.perf_counter()
+        self.columns = None
+        if output_format == "parquet":
+            self.sink = ParquetSink(path, config=config)
+        elif output_format == "ipc":
+            self.sink = IPCSink(path, config=config)
+        else:
+            self.sink = None
+            self.file = open(path, "w")
+
+    def write(self,
+              data: pl.DataFrame,
+              ) -> None:
+        data = data.select(pl.exclude(pl.Object))
+        if self.sink is not None:
+            self.sink.write(data)
+        else:
+            if self.columns is None:
+                self.columns = data.columns
+            data = data.select([pl.col(column) if column in data.columns
+                                else pl.lit(None).alias(column)
+                                for column in self.columns])
+            if self.output_format == "csv":
+                data.write_csv(self.file, include_header=self.n_rows == 0)
+            else:
+                data.write_ndjson(self.file)
+        self.n_rows += data.height
+        if not self.quiet:
+            print(f"Wrote {self.n_rows}/{self.total_rows} rows "
+                  f"({time.perf_counter() - self.start:.1f}s)",
+                  file=sys.stderr)
+
+    def close(self) -> None:
+        if self.sink is not None:
+            self.sink.close()
+        else:
+            self.file.close()
@@ -0,0 +1,760 @@
+"""
+This module contains the single-document extraction path, which computes
+the features of one parsed document without building a Polars DataFrame.
+It is used by Extractor.extract_one and Extractor.extract_docs for
+low-latency extraction with a warm extractor, e.g., for online scoring.
+
+For a single short text, the DataFrame path is dominated by the fixed
+cost of every column operation rather than by the text. Here, the counts
+the features are built on (tokens, types, lemmas, sentences, syllables,
+token frequencies) are gathered once from the document, and the features
+in DOCUMENT_FEATURE_MAP are computed from them in plain Python with the
+same formulas as the expressions in EXPRESSION_MAP, including the
+conventions for texts without tokens (e.g., NaN for divisions by zero).
+
+The rating-based lexicon features in RATING_FEATURE_MAP, e.g., the
+average valence or the number of concrete words, are aggregated from the
+ratings of the lemmas, which are looked up in a dictionary that is built
+once per lexicon (see get_ratings).
+
+Other features, e.g., sentiment or hedges, are extracted with their
+feature function (FUNCTION_MAP) on a one-row DataFrame that holds only
+the text and the document, so every feature of the Extractor is
+available. Only spaCy documents are supported by the
+document functions; for stanza, all features take the DataFrame route.
+
+Corpus-global features (see GLOBAL_FEATURE_MAP) depend on the other texts
+of a corpus and are not extracted.
+"""
+from collections import Counter
+from functools import cached_property
+import math
+
+import numpy as np
+import polars as pl
+
+from .configs.dependency_config import (
+    CLEARNLP_DEPENDENCIES_CONFIG,
+    UNIVERSAL_DEPENDENCIES_CONFIG,
+)
+from .configs.morphological_config import (
+    MORPH_CONFIG,
+)
+from .entities import (
+    ENT_TYPES,
+)
+from .features import (
+    FUNCTION_MAP,
+    GLOBAL_FEATURE_MAP,
+)
+from .information import (
+    entropy,
+)
+from .pos import (
+    UPOS_TAGS,
+)
+from .readability import (
+    SYLLABLE_CACHE_DIR,
+    count_syllables,
+)
+from .resource_utils.psycholinguistics import (
+    SENSORIMOTOR_VARS,
+)
+
+# Features computed by DocumentFeatures and the name of their value,
+# which is the name of the column of the feature in the DataFrame path.
+# Features with one column per tag, e.g., n_per_pos, are dictionaries of
+# their columns.
+DOCUMENT_FEATURE_MAP = {
+    # SURFACE FEATURES
+    "raw_sequence_length": "raw_sequence_length",
+    "n_tokens": "n_tokens",
+    "n_lemmas": "n_lemmas",
+    "n_sentences": "n_sentences",
+    "n_types": "n_types",
+    "avg_word_length": "avg_word_length",
+    "n_long_words": "n_long_words",
+    "n_tokens_per_sentence": "tokens_per_sentence",
+    "n_characters": "n_characters",
+    # MORPHOLOGICAL FEATURES
+    "n_per_morph_feature": "morph_feature_counts",
+    # DEPENDENCY FEATURES
+    "tree_width": "tree_width",
+    "tree_depth": "tree_depth",
+    "tree_branching": "tree_branching",
+    "n_per_dependency_type": "dependency_counts",
+    # ENTITY FEATURES
+    "n_entities": "n_entities",
+    "n_per_entity_type": "entity_counts",
+    # INFORMATION THEORETIC FEATURES
+    "entropy": "entropy",
+    # LEXICAL RICHNESS FEATURES
+    "lemma_token_ratio": "lemma_token_ratio",
+    "ttr": "ttr",
+    "cttr": "cttr",
+    "rttr": "rttr",
+    "herdan_c": "herdan_c",
+    "summer_index": "summer_index",
+    "dugast_u": "dugast_u",
+    "maas_index": "maas_index",
+    "n_hapax_legomena": "n_hapax_legomena",
+    "lexical_density": "lexical_density",
+    "n_hapax_dislegomena": "n_hapax_dislegomena",
+    "sichel_s": "sichel_s",
+    "giroud_index": "giroud_index",
+    "yule_k": "yule_k",
+    "simpsons_d": "simpsons_d",
+    "herdan_v": "herdan_v",
+    # POS FEATURES
+    "n_lexical_tokens": "n_lexical_tokens",
+    "n_per_pos": "pos_counts",
+    # READABILITY FEATURES
+    "flesch_reading_ease": "flesch_reading_ease",
+    "flesch_kincaid_grade": "flesch_kincaid_grade",
+    "smog": "smog",
+    "ari": "ari",
+    "cli": "cli",
+    "gunning_fog": "gunning_fog",
+    "lix": "lix",
+    "rix": "rix",
+    "n_monosyllables": "n_monosyllables",
+    "n_polysyllables": "n_polysyllables",
+    "n_syllables": "n_syllables",
+}
+
+# Lexicon-based features computed from the ratings of the lemmas, see the
+# generic module: the aggregation, the word and rating columns of the
+# lexicon, the column name and the default threshold. {var} stands for
+# every sensorimotor variable. The controversial counts are the counts of
+# high standard deviations. The columns are those of the English
+# lexicons, so the features are only computed this way for English.
+RATING_FEATURE_MAP = {
+    # EMOTION FEATURES
+    "avg_valence": ("avg", "word", "valence", "avg_valence", None),
+    "n_low_valence": ("n_low", "word", "valence", "n_low_valence", 0.33),
+    "n_high_valence": ("n_high", "word", "valence", "n_high_valence", 0.66),
+    "max_valence": ("max", "word", "valence", "max_valence", None),
+    "min_valence": ("min", "word", "valence", "min_valence", None),
+    "sd_valence": ("sd", "word", "valence", "sd_valence", None),
+    "avg_arousal": ("avg", "word", "arousal", "avg_arousal", None),
+    "n_low_arousal": ("n_low", "word", "arousal", "n_low_arousal", 0.33),
+    "n_high_arousal": ("n_high", "word", "arousal", "n_high_arousal", 0.66),
+    "max_arousal": ("max", "word", "arousal", "max_arousal", None),
+    "min_arousal": ("min", "word", "arousal", "min_arousal", None),
+    "sd_arousal": ("sd", "word", "arousal", "sd_arousal", None),
+    "avg_dominance": ("avg", "word", "dominance", "avg_dominance", None),
+    "n_low_dominance": ("n_low", "word", "dominance", "n_low_dominance",
+                        0.33),
+    "n_high_dominance": ("n_high", "word", "dominance", "n_high_dominance",
+                         0.66),
+    "max_dominance": ("max", "word", "dominance", "max_dominance", None),
+    "min_dominance": ("min", "word", "dominance", "min_dominance", None),
+    "sd_dominance": ("sd", "word", "dominance", "sd_dominance", None),
+    # PSYCHOLINGUISTIC FEATURES
+    "avg_concreteness": ("avg", "Word", "Conc.M", "avg_concreteness",
+                         None),
+    "n_low_concreteness": ("n_low", "Word", "Conc.M", "n_low_concreteness",
+                           1.66),
+    "n_high_concreteness": ("n_high", "Word", "Conc.M",
+                            "n_high_concreteness", 3.33),
+    "avg_sd_concreteness": ("avg", "Word", "Conc.SD", "avg_sd_concreteness",
+                            None),
+    "n_controversial_concreteness": ("n_high", "Word", "Conc.SD",
+                                     "n_controversial_concreteness", 2.0),
+    "min_concreteness": ("min", "Word", "Conc.M", "min_concreteness", None),
+    "max_concreteness": ("max", "Word", "Conc.M", "max_concreteness", None),
+    "sd_concreteness": ("sd", "Word", "Conc.M", "sd_concreteness", None),
+    "avg_aoa": ("avg", "Word", "Rating.Mean", "avg_aoa", None),
+    "n_low_aoa": ("n_low", "Word", "Rating.Mean", "n_low_aoa", 10.0),
+    "n_high_aoa": ("n_high", "Word", "Rating.Mean", "n_high_aoa", 10.0),
+    "avg_sd_aoa": ("avg", "Word", "Rating.SD", "avg_sd_aoa", None),
+    "n_controversial_aoa": ("n_high", "Word", "Rating.SD",
+                            "n_controversial_aoa", 4.5),
+    "min_aoa": ("min", "Word", "Rating.Mean", "min_aoa", None),
+    "max_aoa": ("max", "Word", "Rating.Mean", "max_aoa", None),
+    "sd_aoa": ("sd", "Word", "Rating.Mean", "sd_aoa", None),
+    "avg_prevalence": ("avg", "Word", "Prevalence", "avg_prevalence", None),
+    "n_low_prevalence": ("n_low", "Word", "Prevalence", "n_low_prevalence",
+                         1.0),
+    "n_high_prevalence": ("n_high", "Word", "Prevalence",
+                          "n_high_prevalence", 1.0),
+    "min_prevalence": ("min", "Word", "Prevalence", "min_prevalence", None),
+    "max_prevalence": ("max", "Word", "Prevalence", "max_prevalence", None),
+    "sd_prevalence": ("sd", "Word", "Prevalence", "sd_prevalence", None),
+    "avg_socialness": ("avg", "Word", "Mean", "avg_socialness", None),
+    "n_low_socialness": ("n_low", "Word", "Mean", "n_low_socialness", 2.33),
+    "n_high_socialness": ("n_high", "Word", "Mean", "n_high_socialness",
+                          3.66),
+    "avg_sd_socialness": ("avg", "Word", "SD", "avg_sd_socialness", None),
+    "n_controversial_socialness": ("n_high", "Word", "SD",
+                                   "n_controversial_socialness", 2.0),
+    "min_socialness": ("min", "Word", "Mean", "min_socialness", None),
+    "max_socialness": ("max", "Word", "Mean", "max_socialness", None),
+    "sd_socialness": ("sd", "Word", "Mean", "sd_socialness", None),
+    "avg_iconicity": ("avg", "word", "rating", "avg_iconicity", None),
+    "n_low_iconicity": ("n_low", "word", "rating", "n_low_iconicity", 2.33),
+    "n_high_iconicity": ("n_high", "word", "rating", "n_high_iconicity",
+                         3.66),
+    "avg_sd_iconicity": ("avg", "word", "rating_sd", "avg_sd_iconicity",
+                         None),
+    "n_controversial_iconicity": ("n_high", "word", "rating_sd",
+                                  "n_controversial_iconicity", 2.5),
+    "min_iconicity": ("min", "word", "rating", "min_iconicity", None),
+    "max_iconicity": ("max", "word", "rating", "max_iconicity", None),
+    "sd_iconicity": ("sd", "word", "rating", "sd_iconicity", None),
+    "avg_sensorimotor": ("avg", "Word", "{var}.mean",
+                         "avg_{var}_sensorimotor", None),
+    "n_low_sensorimotor": ("n_low", "Word", "{var}.mean",
+                           "n_low_{var}_sensorimotor", 2.33),
+    "n_high_sensorimotor": ("n_high", "Word", "{var}.mean",
+                            "n_high_{var}_sensorimotor", 3.66),
+    "avg_sd_sensorimotor": ("avg", "Word", "{var}.SD",
+                            "avg_sd_{var}_sensorimotor", None),
+    "n_controversial_sensorimotor": ("n_high", "Word", "{var}.SD",
+                                     "n_controversial_{var}_sensorimotor",
+                                     2.0),
+    "min_sensorimotor": ("min", "Word", "{var}.mean",
+                         "min_{var}_sensorimotor", None),
+    "max_sensorimotor": ("max", "Word", "{var}.mean",
+                         "max_{var}_sensorimotor", None),
+    "sd_sensorimotor": ("sd", "Word", "{var}.mean",
+                        "sd_{var}_sensorimotor", None),
+}
+
+# Ratings of the lexicons by lemma, by lexicon, word and rating column
+_RATINGS_CACHE = {}
+
+# Universal part-of-speech tags of lexical tokens, see
+# get_num_lexical_tokens
+LEXICAL_POS = ["NOUN", "VERB", "ADJ", "ADV"]
+
+def extract_document(doc,
+                     features: list[str],
+                     text: str | None = None,
+                     backbone: str = 'spacy',
+                     text_column: str = 'text',
+                     language: str = 'en',
+                     lexicons: dict[str, pl.DataFrame] | None = None,
+                     helper_columns: list[str] = [],
+                     cache_dir: str | None = SYLLABLE_CACHE_DIR,
+                     ) -> dict[str, int | float | None]:
+    """
+    Extracts the features of a single parsed document.
+
+    Args:
+        doc (spacy.tokens.Doc | stanza.Document): The parsed document.
+        features (list[str]): The features to extract. Corpus-global
+            features and unknown features are skipped.
+        text (str | None): The text of the document. Defaults to None,
+                i.e., the text of the document.
+        backbone (str): The NLP library used to parse the document.
+                Either 'spacy' or 'stanza'.
+        text_column (str): The name of the text column of the one-row
+                DataFrame of features without a document function.
+        language (str): The language of the text.
+        lexicons (dict[str, pl.DataFrame] | None):
+            The lexicons of the lexicon-based features by feature name.
+            Lexicon-based features without a lexicon are skipped.
+        helper_columns (list[str]):
+            Helper columns of the feature functions, which are not
+            returned, e.g., 'lemmas'.
+        cache_dir (str | None): The directory of the syllable cache,
+                see count_syllables.
+
+    Returns:
+        features (dict[str, int | float | None]):
+            The feature values by column name, in the order of the
+            features. Features without a document function return all
+            columns their feature function adds, as in the DataFrame
+            path.
+    """
+    if text is None:
+        text = doc.text
+    lexicons = lexicons or {}
+    document = DocumentFeatures(doc, text, language=language,
+                                cache_dir=cache_dir) \
+        if backbone == 'spacy' else None
+    data = None
+    values = {}
+    for feature in features:
+        if feature in GLOBAL_FEATURE_MAP:
+            continue
+        if document is not None and feature in DOCUMENT_FEATURE_MAP:
+            name = DOCUMENT_FEATURE_MAP[feature]
+            value = getattr(document, name)
+            if isinstance(value, dict):
+                values.update(value)
+            else:
+                values[name] = value
+            continue
+        if document is not None and language == 'en' and \
+            feature in RATING_FEATURE_MAP and feature in lexicons:
+            values.update(document.rating_features(feature,
+                                                   lexicons[feature]))
+            continue
+        if feature not in FUNCTION_MAP:
+            print(f"Feature {feature} not found. Check spelling. "
+                  "Skipping...")
+            continue
+        if data is None:
+            data = pl.DataFrame({text_column: [text]}).with_columns(
+                pl.Series("nlp", [doc], dtype=pl.Object))
+        columns = data.columns
+        data = _apply_function(data, feature,
+                               backbone=backbone,
+                               text_column=text_column,
+                               language=language,
+                               lexicons=lexicons)
+        new_columns = [column for column in data.columns
+                       if column not in columns
+                       and column not in helper_columns]
+        if new_columns:
+            values.update(data.select(new_columns).row(0, named=True))
+    return values
+
+def _apply_function(data: pl.DataFrame,
+                    feature: str,
+                    backbone: str,
+                    text_column: str,
+                    language: str,
+                    lexicons: dict[str, pl.DataFrame],
+                    ) -> pl.DataFrame:
+    """
+    Helper function to extract a feature with its feature function on
+    the one-row DataFrame, see Extractor.__apply_function.
+    """
+    kwargs = {}
+    if feature in lexicons:
+        kwargs["lexicon"] = lexicons[feature]
+    result = FUNCTION_MAP[feature](data=data,
+                                   backbone=backbone,
+                                   text_column=text_column,
+                                   language=language,
+                                   **kwargs)
+    if isinstance(result, pl.DataFrame):
+        return result
+    if isinstance(result, (pl.Series, pl.Expr)):
+        result = [result]
+    return data.with_columns(result)
+
+class DocumentFeatures:
+    """
+    The features of a single parsed spaCy document, computed on first
+    access. Every property is the value of the column of the same name in
+    the DataFrame path, see DOCUMENT_FEATURE_MAP.
+
+    Args:
+        doc (spacy.tokens.Doc): The parsed document.
+        text (str | None): The text of the document. Defaults to None,
+                i.e., the text of the document.
+        language (str): The language of the text, for syllable counting.
+        threshold (int): The minimum length of a long word.
+                Defaults to 6.
+        cache_dir (str | None): The directory of the syllable cache,
+                see count_syllables.
+    """
+    def __init__(self,
+                 doc,
+                 text: str | None = None,
+                 language: str = 'en',
+                 threshold: int = 6,
+                 cache_dir: str | None = SYLLABLE_CACHE_DIR,
+                 ) -> None:
+        self.doc = doc
+        self.text = doc.text if text is None else text
+        self.language = language
+        self.threshold = threshold
+        self.cache_dir = cache_dir
+
+    # ----------------------------- Counts ----------------------------- #
+
+    @cached_property
+    def tokens(self) -> list[str]:
+        return [token.text for token in self.doc]
+
+    @cached_property
+    def token_counts(self) -> list[int]:
+        # The counts of the token frequency table ('token_freqs')
+        return list(Counter(self.tokens).values())
+
+    @cached_property
+    def syllables(self) -> list[int]:
+        # Tokens without a syllable count are ignored, as in the sums of
+        # the 'syllables' column
+        words = [token.lower() for token in self.tokens]
+        counts = count_syllables(words, language=self.language,
+                                 cache_dir=self.cache_dir)
+        return [counts[word] for word in words if counts[word] is not None]
+
+    @cached_property
+    def lemmas(self) -> list[str]:
+        return [token.lemma_ for token in self.doc]
+
+    # ------------------------ Surface Features ------------------------ #
+
+    @cached_property
+    def raw_sequence_length(self) -> int:
+        return len(self.text)
+
+    @cached_property
+    def n_tokens(self) -> int:
+        return len(self.tokens)
+
+    @cached_property
+    def n_lemmas(self) -> int:
+        return len(set(self.lemmas))
+
+    @cached_property
+    def n_sentences(self) -> int:
+        return sum(1 for _ in self.doc.sents)
+
+    @cached_property
+    def n_types(self) -> int:
+        return len(self.token_counts)
+
+    @cached_property
+    def n_characters(self) -> int:
+        return sum(len(token) for token in self.tokens)
+
+    @cached_property
+    def n_long_words(self) -> int:
+        return sum(len(token) >= self.threshold for token in self.tokens)
+
+    @cached_property
+    def avg_word_length(self) -> float:
+        return _divide(self.n_characters, self.n_tokens)
+
+    @cached_property
+    def tokens_per_sentence(self) -> float:
+        return _divide(self.n_tokens, self.n_sentences)
+
+    # ----------------------- Dependency Features ---------------------- #
+
+    @cached_property
+    def tree_width(self) -> int:
+        return max((len(list(token.children)) for token in self.doc),
+                   default=0)
+
+    @cached_property
+    def tree_depth(self) -> float:
+        depths = [_walk_tree(sent.root, 0) for sent in self.doc.sents]
+        return float(np.mean(depths)) if depths else 0.0
+
+    @cached_property
+    def tree_branching(self) -> float:
+        if len(self.doc) == 0:
+            return 0.0
+        return sum(len(list(token.children)) for token in self.doc) / \
+            len(self.doc)
+
+    @cached_property
+    def dependency_counts(self) -> dict[str, int]:
+        if self.language in ['en', 'de']:
+            dependencies = CLEARNLP_DEPENDENCIES_CONFIG
+        else:
+            dependencies = UNIVERSAL_DEPENDENCIES_CONFIG
+        counts = Counter(token.dep_ for token in self.doc)
+        return {f"n_dependency_{dep}": counts[dep] for dep in dependencies}
+
+    # ---------------------- Counts per Tag Features --------------------- #
+
+    @cached_property
+    def pos_counts(self) -> dict[str, int]:
+        counts = Counter(token.pos_ for token in self.doc)
+        return {f"n_{pos.lower()}": counts[pos] for pos in UPOS_TAGS}
+
+    @cached_property
+    def entity_counts(self) -> dict[str, int]:
+        counts = Counter(ent.label_ for ent in self.doc.ents)
+        return {f"n_{ent_type.lower()}": counts[ent_type]
+                for ent_type in ENT_TYPES}
+
+    @cached_property
+    def morph_feature_counts(self) -> dict[str, int]:
+        # Counted in one pass over the tokens rather than once per column
+        counts = Counter()
+        for token in self.doc:
+            for feat in MORPH_CONFIG.get(token.pos_, {}):
+                for val in token.morph.get(feat):
+                    counts[(token.pos_, feat, val)] += 1
+        return {f"n_{pos}_{feat}_{val}": counts[(pos, feat, val)]
+                for pos, feats in MORPH_CONFIG.items()
+                for feat, values in feats.items()
+                for val in values}
+
+    # ------------------------- Other Features ------------------------- #
+
+    @cached_property
+    def n_entities(self) -> int:
+        return len(self.doc.ents)
+
+    @cached_property
+    def entropy(self) -> float:
+        return float(entropy(self.text))
+
+    @cached_property
+    def n_lexical_tokens(self) -> int:
+        return sum(token.pos_ in LEXICAL_POS for token in self.doc)
+
+    # -------------------- Lexical Richness Features ------------------- #
+
+    @cached_property
+    def lemma_token_ratio(self) -> float:
+        return _divide(self.n_lemmas, self.n_tokens)
+
+    @cached_property
+    def ttr(self) -> float:
+        return _divide(self.n_types, self.n_tokens)
+
+    @cached_property
+    def rttr(self) -> float:
+        return _divide(self.n_types, self.n_tokens ** 0.5)
+
+    @cached_property
+    def cttr(self) -> float:
+        return _divide(self.n_types, (2 * self.n_tokens) ** 0.5)
+
+    @cached_property
+    def herdan_c(self) -> float:
+        return _fill_nan(_divide(_log(self.n_types), _log(self.n_tokens)))
+
+    @cached_property
+    def summer_index(self) -> float:
+        return _fill_nan(_divide(_log(_log(self.n_types)),
+                                 _log(_log(self.n_tokens))))
+
+    @cached_property
+    def dugast_u(self) -> float:
+        return _fill_nan(_divide(_log(self.n_tokens) ** 2,
+                                 _log(self.n_tokens) - _log(self.n_types)))
+
+    @cached_property
+    def maas_index(self) -> float:
+        return _fill_nan(_divide(self.n_tokens - self.n_types,
+                                 _log(self.n_types) ** 2))
+
+    @cached_property
+    def n_hapax_legomena(self) -> int:
+        return sum(count == 1 for count in self.token_counts)
+
+    @cached_property
+    def n_hapax_dislegomena(self) -> int:
+        return sum(count <= 2 for count in self.token_counts)
+
+    @cached_property
+    def sichel_s(self) -> float:
+        return _divide(self.n_hapax_dislegomena, self.n_types)
+
+    @cached_property
+    def lexical_density(self) -> float:
+        return _divide(self.n_lexical_tokens, self.n_tokens)
+
+    @cached_property
+    def giroud_index(self) -> float:
+        return _divide(self.n_types, math.sqrt(self.n_tokens))
+
+    @cached_property
+    def yule_k(self) -> float:
+        n = float(self.n_types)
+        inner_sum = sum(float(count) ** 2 for count in self.token_counts) \
+            / n ** 4 if n > 0 else 0.0
+        return 10 ** 4 * inner_sum - _divide(1, self.n_tokens)
+
+    @cached_property
+    def simpsons_d(self) -> float:
+        n = float(self.n_types)
+        if n <= 1:
+            return 0.0
+        return sum(float(count) * (count - 1)
+                   for count in self.token_counts) / (n * (n - 1))
+
+    @cached_property
+    def herdan_v(self) -> float:
+        return self.yule_k + _divide(1, self.n_tokens) - \
+            _divide(1, self.n_types) ** 0.5
+
+    # ------------------------ Lexicon Features ------------------------ #
+
+    def rating_features(self,
+                        feature: str,
+                        lexicon: pl.DataFrame,
+                        ) -> dict[str, int | float | None]:
+        """
+        Computes a lexicon-based feature of RATING_FEATURE_MAP from the
+        ratings of the lemmas, with one column per sensorimotor variable
+        for the sensorimotor features.
+
+        Args:
+            feature (str): The feature.
+            lexicon (pl.DataFrame): The lexicon of the feature.
+
+        Returns:
+            features (dict[str, int | float | None]):
+                The feature values by column name.
+        """
+        aggregation, word_column, rating_column, column, threshold = \
+            RATING_FEATURE_MAP[feature]
+        variables = SENSORIMOTOR_VARS["en"] if "{var}" in column else [None]
+        values = {}
+        for var in variables:
+            ratings = get_ratings(lexicon, word_column,
+                                  rating_column.format(var=var))
+            lemma_ratings = [rating for lemma in self.lemmas
+                             for rating in ratings.get(lemma, ())]
+            values[column.format(var=var)] = _aggregate_ratings(
+                lemma_ratings, aggregation, threshold)
+        return values
+
+    # ---------------------- Readability Features ---------------------- #
+
+    @cached_property
+    def n_syllables(self) -> int:
+        return sum(self.syllables)
+
+    @cached_property
+    def n_monosyllables(self) -> int:
+        return sum(count == 1 for count in self.syllables)
+
+    @cached_property
+    def n_polysyllables(self) -> int:
+        return sum(count >= 3 for count in self.syllables)
+
+    @cached_property
+    def flesch_reading_ease(self) -> float:
+        return 206.835 - 1.015 * self.tokens_per_sentence - \
+            84.6 * _divide(self.n_syllables, self.n_tokens)
+
+    @cached_property
+    def flesch_kincaid_grade(self) -> float:
+        return 0.39 * self.tokens_per_sentence + \
+            11.8 * _divide(self.n_syllables, self.n_tokens) - 15.59
+
+    @cached_property
+    def ari(self) -> float:
+        return 4.71 * self.avg_word_length + \
+            0.5 * self.tokens_per_sentence - 21.43
+
+    @cached_property
+    def smog(self) -> float:
+        return 1.0430 * _divide(30 * self.n_polysyllables,
+                                self.n_sentences) ** 0.5 + 3.1291
+
+    @cached_property
+    def cli(self) -> float:
+        return 0.0588 * (self.avg_word_length * 100) - \
+            0.296 * (_divide(self.n_sentences, self.n_tokens) * 100) - 15.8
+
+    @cached_property
+    def gunning_fog(self) -> float:
+        return 0.4 * (self.tokens_per_sentence +
+                      100 * _divide(self.n_polysyllables, self.n_tokens))
+
+    @cached_property
+    def lix(self) -> float:
+        return self.tokens_per_sentence + \
+            _divide(100 * self.n_long_words, self.n_tokens)
+
+    @cached_property
+    def rix(self) -> float:
+        return _divide(self.n_long_words, self.n_sentences)
+
+def get_ratings(lexicon: pl.DataFrame,
+                word_column: str,
+                rating_column: str,
+                ) -> dict[str, list[float]]:
+    """
+    Gets the ratings of a lexicon by word. The ratings are gathered once
+    per lexicon and column and kept for the process.
+
+    A word that occurs more than once in the lexicon has all of its
+    ratings, and missing ratings are left out, as in the join of the
+    lemmas with the lexicon in the generic module.
+
+    Args:
+        lexicon (pl.DataFrame): The lexicon.
+        word_column (str): The column of the words.
+        rating_column (str): The column of the ratings.
+
+    Returns:
+        ratings (dict[str, list[float]]): The ratings by word.
+    """
+    key = (id(lexicon), word_column, rating_column)
+    if key not in _RATINGS_CACHE:
+        grouped = (
+            lexicon
+            .select(pl.col(word_column).alias("word"),
+                    pl.col(rating_column).alias("rating"))
+            .drop_nulls()
+            .group_by("word", maintain_order=True)
+            .agg(pl.col("rating"))
+        )
+        # The lexicon is kept, so that its id is not reused
+        _RATINGS_CACHE[key] = (lexicon,
+                               dict(zip(grouped["word"].to_list(),
+                                        grouped["rating"].to_list())))
+    return _RATINGS_CACHE[key][1]
+
+def _aggregate_ratings(ratings: list[float],
+                       aggregation: str,
+                       threshold: float | None = None,
+                       ) -> int | float | None:
+    """
+    Helper function to aggregate the ratings of the lemmas of a text as
+    the generic functions do: averages, extremes and standard deviations
+    are None without ratings, counts are 0.
+    """
+    if aggregation == "n_low":
+        return sum(rating < threshold for rating in ratings)
+    if aggregation == "n_high":
+        return sum(rating > threshold for rating in ratings)
+    if aggregation == "avg":
+        return sum(ratings) / len(ratings) if ratings else None
+    if aggregation == "max":
+        return max(ratings, default=None)
+    if aggregation == "min":
+        return min(ratings, default=None)
+    # Sample standard deviation, which is undefined for a single rating
+    if len(ratings) < 2:
+        return None
+    mean = sum(ratings) / len(ratings)
+    return math.sqrt(sum((rating - mean) ** 2 for rating in ratings) /
+                     (len(ratings) - 1))
+
+def _walk_tree(token, depth: int) -> int:
+    """
+    Helper function to get the depth of the subtree of a token, see
+    get_tree_depth.
+    """
+    children = list(token.children)
+    if len(children) == 0:
+        return depth
+    return max(_walk_tree(child, depth + 1) for child in children)
+
+def _divide(numerator: float, denominator: float) -> float:
+    """
+    Helper function to divide as Polars does, i.e., a division by zero is
+    infinite, or NaN if the numerator is zero or NaN.
+    """
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * \
+            math.copysign(1.0, denominator)
+    return numerator / denominator
+
+def _log(x: float) -> float:
+    """
+    Helper function for the natural logarithm as in Polars, i.e., -inf
+    for zero and NaN for negative numbers.
+    """
+    if x == 0:
+        return -math.inf
+    if x < 0 or math.isnan(x):
+        return math.nan
+    return math.log(x)
+
+def _fill_nan(x: float, value: float = 1.0) -> float:
+    """
+    Helper function to replace NaN with a value, see herdan_c_expr.
+    """
+    return value if math.isnan(x) else x
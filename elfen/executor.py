@@ -0,0 +1,241 @@
+"""
+This module contains functions to extract independent feature areas
+concurrently.
+
+After parsing, most feature areas only read the parsed documents and
+helper columns and add their own feature columns, so they do not depend
+on each other. Each area is extracted on its own view of the data:
+
+- Areas computed with native Polars operations (and lexicon joins) run in
+  a thread pool, as Polars releases the GIL.
+- Areas that traverse the parsed documents in Python (dependency,
+  entities, morphological and part-of-speech features) are GIL-bound.
+  They can be run in a process pool instead, where each worker extracts
+  the area on a contiguous shard of the rows.
+
+The new columns of all areas are merged in the order of the feature
+areas, so the result does not depend on the order in which the areas
+finish.
+"""
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+import multiprocessing
+
+import polars as pl
+
+from .features import (
+    FEATURE_AREA_MAP,
+    FUNCTION_MAP,
+    HELPER_FUNCTION_MAP,
+)
+
+# Features that traverse the parsed documents in Python
+DOC_BOUND_FEATURES = {
+    feature
+    for area in ["dependency", "entities", "morphological", "pos"]
+    for feature in FEATURE_AREA_MAP[area]
+}
+
+# Helper columns used by most of the other feature areas
+SHARED_HELPER_COLUMNS = ["tokens", "lemmas"]
+
+def extract_areas(data: pl.DataFrame,
+                  features: dict[str, list[str]],
+                  backbone: str = 'spacy',
+                  text_column: str = 'text',
+                  language: str = 'en',
+                  lexicons: dict[str, pl.DataFrame] | None = None,
+                  n_threads: int | None = None,
+                  n_processes: int = 0,
+                  function_map: dict = FUNCTION_MAP,
+                  **kwargs: dict[str, str],
+                  ) -> pl.DataFrame:
+    """
+    Extracts feature areas concurrently and merges their feature columns.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data
+            and the parsed documents.
+        features (dict[str, list[str]]):
+            The features to extract, grouped by feature area.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        text_column (str): The name of the column containing the text data.
+        language (str): The language of the text data.
+        lexicons (dict[str, pl.DataFrame] | None):
+            The lexicons of the features that require one, by feature.
+        n_threads (int | None):
+            The number of feature areas extracted concurrently in threads.
+            Defaults to the size of the Polars thread pool.
+        n_processes (int):
+            The number of worker processes for feature areas that traverse
+            the parsed documents. The rows are split into as many shards.
+            Defaults to 0, i.e., these areas run in the thread pool as
+            well.
+        function_map (dict):
+            A dictionary mapping features to their feature extraction
+            functions. Process workers always use the default
+            FUNCTION_MAP.
+        **kwargs:
+            Additional keyword arguments passed to the feature extraction
+            functions, e.g., thresholds.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the extracted features added as new columns.
+            Helper columns computed by the areas, and the shared tokens
+            and lemmas if more than one area runs in the thread pool, are
+            added as well.
+    """
+    if lexicons is None:
+        lexicons = {}
+    if n_threads is None:
+        n_threads = pl.thread_pool_size()
+
+    areas = {area: area_features for area, area_features in features.items()
+             if area_features}
+    if not areas:
+        return data
+
+    process_areas = [
+        area for area in areas
+        if n_processes > 0 and function_map is FUNCTION_MAP and
+        all(feature in DOC_BOUND_FEATURES for feature in areas[area])
+    ]
+
+    # Compute shared helper columns once instead of once per area
+    if len(process_areas) < len(areas) - 1:
+        for helper in SHARED_HELPER_COLUMNS:
+            if helper not in data.columns:
+                data = HELPER_FUNCTION_MAP[helper](data=data,
+                                                   backbone=backbone,
+                                                   text_column=text_column,
+                                                   language=language)
+
+    area_kwargs = dict(backbone=backbone,
+                       text_column=text_column,
+                       language=language,
+                       **kwargs)
+    with ThreadPoolExecutor(max_workers=max(1, n_threads)) as threads:
+        futures = {
+            area: threads.submit(_extract_area,
+                                 data, areas[area],
+                                 lexicons=lexicons,
+                                 function_map=function_map,
+                                 **area_kwargs)
+            for area in areas if area not in process_areas
+        }
+        results = {}
+        if process_areas:
+            # The process areas are extracted while the thread pool works
+            # on the other areas
+            results = _extract_areas_sharded(
+                data,
+                {area: areas[area] for area in process_areas},
+                n_shards=n_processes,
+                **area_kwargs)
+        results.update({area: future.result()
+                        for area, future in futures.items()})
+
+    # Merge in the order of the feature areas; helper columns computed by
+    # several areas are taken from the first one
+    new_columns = {}
+    for area in areas:
+        for column in results[area].get_columns():
+            if column.name not in data.columns:
+                new_columns.setdefault(column.name, column)
+
+    return data.with_columns(list(new_columns.values()))
+
+def _extract_area(data: pl.DataFrame,
+                  features: list[str],
+                  backbone: str = 'spacy',
+                  text_column: str = 'text',
+                  language: str = 'en',
+                  lexicons: dict[str, pl.DataFrame] | None = None,
+                  function_map: dict = FUNCTION_MAP,
+                  **kwargs: dict[str, str],
+                  ) -> pl.DataFrame:
+    """
+    Extracts the features of one feature area and returns the new columns.
+    """
+    if lexicons is None:
+        lexicons = {}
+    initial_columns = set(data.columns)
+    for feature in features:
+        feature_kwargs = dict(kwargs)
+        if feature in lexicons:
+            feature_kwargs["lexicon"] = lexicons[feature]
+        result = function_map[feature](data=data,
+                                       backbone=backbone,
+                                       text_column=text_column,
+                                       language=language,
+                                       **feature_kwargs)
+        if isinstance(result, pl.DataFrame):
+            data = result
+        else:
+            data = data.with_columns(result)
+
+    return data.select([column for column in data.columns
+                        if column not in initial_columns])
+
+def _extract_areas_sharded(data: pl.DataFrame,
+                           areas: dict[str, list[str]],
+                           n_shards: int,
+                           text_column: str = 'text',
+                           **kwargs: dict[str, str],
+                           ) -> dict[str, pl.DataFrame]:
+    """
+    Extracts feature areas on contiguous shards of the rows in worker
+    processes and concatenates the shards of each area in order.
+
+    Only the text column and the parsed documents are sent to the workers,
+    once per shard for all areas. The documents are sent as a list, as
+    Polars object columns cannot be pickled.
+    """
+    texts = data[text_column].to_list()
+    docs = data["nlp"].to_list()
+    shard_size = max(1, -(-len(texts) // max(1, n_shards)))
+    with ProcessPoolExecutor(
+        max_workers=n_shards,
+        # Forking a process that runs Polars threads can deadlock
+        mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+        shards = [
+            executor.submit(_extract_shard,
+                            texts[i:i + shard_size],
+                            docs[i:i + shard_size],
+                            areas,
+                            text_column=text_column,
+                            **kwargs)
+            for i in range(0, len(texts), shard_size)
+        ]
+        shards = [shard.result() for shard in shards]
+
+    # Relaxed, as the dtype of a column may differ between shards, e.g.,
+    # if it is null in all rows of a shard
+    return {area: pl.concat([shard[area] for shard in shards],
+                            how="diagonal_relaxed")
+            for area in areas}
+
+def _extract_shard(texts: list[str],
+                   docs: list,
+                   areas: dict[str, list[str]],
+                   text_column: str = 'text',
+                   **kwargs: dict[str, str],
+                   ) -> dict[str, pl.DataFrame]:
+    """
+    Extracts feature areas on a shard of the rows. Runs in a worker
+    process.
+    """
+    data = pl.DataFrame({text_column: texts}).with_columns(
+        pl.Series("nlp", docs, dtype=pl.Object),
+    )
+    # Helper columns holding Python objects cannot be sent back
+    return {
+        area: _extract_area(data, features, text_column=text_column,
+                            **kwargs).select(pl.exclude(pl.Object))
+        for area, features in areas.items()
+    }
@@ -2,8 +2,11 @@
 This module contains the Extractor class. The Extractor class is the main
 class in the ELFEN package and is used to extract features from text data.
 """
+import cProfile
+import json
 import os
 import re
+import tempfile
 from typing import Union
 import warnings
 
@@ -13,9 +16,19 @@ from .configs.extractor_config import (
     CONFIG_ALL,
 )
 from .preprocess import (
+    load_docs,
+    load_nlp,
     preprocess_data,
+    save_docs,
+)
+from .document import (
+    extract_document,
+)
+from .executor import (
+    extract_areas,
 )
 from .features import (
+    EXPRESSION_MAP,
     FUNCTION_MAP,
     FEATURE_AREA_MAP,
     FEATURE_LEXICON_MAP,
@@ -25,6 +38,15 @@ from .emotion import (
     load_intensity_lexicon,
     load_vad_lexicon,
 )
+from .profiling import (
+    hotspots,
+    measure,
+    records_to_frame,
+)
+from .plan import (
+    collect_plan,
+    plan_features,
+)
 from .psycholinguistic import (
     load_concreteness_norms,
     load_aoa_norms,
@@ -46,6 +68,23 @@ from .semantic import (
     load_hedges,
 )
 
+from .sentences import (
+    aggregate_sentences,
+    get_sentence_table,
+)
+from .sinks import (
+    IPCSink,
+    ParquetSink,
+    PartitionedParquetSink,
+)
+from .scaling import (
+    FeatureScaler,
+)
+from .tokens import (
+    TOKEN_RATING_MAP,
+    get_token_table,
+    write_token_table,
+)
 from .surface import (
     get_global_lemma_frequencies,
     get_global_token_frequencies,
@@ -53,10 +92,11 @@ from .surface import (
 )
 
 from .util import (
-    rescale_column,
-    normalize_column,
+    zero_token_warning_nan,
 )
 
+# Lexicons loaded in this process, by file path and language
+_LEXICON_CACHE = {}
 
 class Extractor:
     """
@@ -76,6 +116,39 @@ class Extractor:
 
     To access the data with the extracted features, use the data attribute
     of the Extractor class: ``extractor.data``.
+
+    With ``lazy=True``, features that can be computed with native Polars
+    expressions are not computed one by one. Instead, they are gathered
+    into a single lazy query plan that is optimized and collected once
+    per extraction call with the Polars streaming engine. Only the
+    requested features are added as columns in this mode.
+
+    An already loaded NLP pipeline can be passed with ``nlp=...`` (see
+    ``load_nlp`` in the preprocess module) to avoid loading the model
+    again, e.g., when extracting features from many shards of a corpus.
+    If the data already contains the parsed documents in an ``nlp``
+    column, they are used as they are.
+
+    An extraction session, i.e., the parsed documents, the helper columns,
+    the extracted features and the configuration, can be saved with
+    ``save_session`` and reopened with ``Extractor.load_session``. Features
+    that were already extracted are skipped, so only missing features are
+    computed on a reopened session.
+
+    The wall time, CPU time, memory and output columns of parsing and of
+    every feature call are recorded, see ``profile``. With
+    ``trace_memory=True``, the peak memory allocated by Python is measured
+    as well, which slows down the extraction.
+
+    With ``profile=True``, ``extract_features`` and ``extract`` also write
+    a call profile of every feature call (cProfile by default, see the
+    ``profiler`` keyword argument), and ``hotspots`` aggregates them into a
+    table of the functions that take the most time.
+
+    With ``verbose=False``, the progress of the extraction (e.g.,
+    "Extracting ttr...") is not printed, e.g., when the Extractor runs in
+    a server or a batch job. Features that are not found are still
+    reported.
     """
     def __init__(self, 
                  data: pl.DataFrame,
@@ -83,7 +156,22 @@ class Extractor:
                  **kwargs,
                  ) -> None:
         self.data = data
-        self.config = config
+        # Copy the config so settings do not leak into the default config
+        self.config = dict(config)
+        # Feature columns waiting to be attached to the data
+        self.__pending_columns = []
+        # Features whose columns are pending, for the profile
+        self.__pending_features = []
+        # Measurements of the extraction steps, see profile
+        self.__records = []
+        # Directory of the call profiles while profiling, see __profiled
+        self.__profile_dir = None
+        # Creates the profiler of the call profiles
+        self.profiler = kwargs.get("profiler", cProfile.Profile)
+        # Whether the progress of the extraction is printed
+        self.verbose = kwargs.get("verbose", True)
+        # Features that were already extracted, see __missing_features
+        self.extracted_features = set()
         self.basic_features = []
         self.ratio_features = {
             "type": [],
@@ -105,6 +193,22 @@ class Extractor:
         if "remove_constant_cols" in kwargs:
             self.config["remove_constant_cols"] = kwargs[
                 "remove_constant_cols"]
+        if "lazy" in kwargs:
+            self.config["lazy"] = kwargs["lazy"]
+        if "lazy" not in self.config:
+            self.config["lazy"] = False
+        if "n_threads" in kwargs:
+            self.config["n_threads"] = kwargs["n_threads"]
+        if "n_threads" not in self.config:
+            self.config["n_threads"] = 1
+        if "n_doc_processes" in kwargs:
+            self.config["n_doc_processes"] = kwargs["n_doc_processes"]
+        if "n_doc_processes" not in self.config:
+            self.config["n_doc_processes"] = 0
+        if "trace_memory" in kwargs:
+            self.config["trace_memory"] = kwargs["trace_memory"]
+        if "trace_memory" not in self.config:
+            self.config["trace_memory"] = False
 
         if "max_length" in self.config:
             max_length = self.config["max_length"]
@@ -131,20 +235,38 @@ class Extractor:
                              "contains Null/None values. Please remove or "
                              "impute these values before proceeding.")
 
-        self.data = preprocess_data(data=self.data,
-                                    text_column=self.config["text_column"],
-                                    backbone=self.config["backbone"],
-                                    lang=self.config["language"],
-                                    model=self.config["model"],
-                                    batch_size=batch_size,
-                                    n_process=n_process,
-                                    max_length=max_length)
+        # The NLP pipeline is kept to parse texts in extract_one; if the
+        # data is already parsed, it is only loaded when needed
+        self.nlp = kwargs.get("nlp")
+        # Lexicons of the features extracted with extract_one
+        self.__document_lexicons = {}
+
+        # Documents that were parsed before, e.g., restored from a
+        # checkpoint, are reused
+        if "nlp" not in self.data.columns:
+            with self.__measure("parse", self.config["model"]) as record:
+                if self.nlp is None:
+                    self.nlp = load_nlp(backbone=self.config["backbone"],
+                                        model=self.config["model"],
+                                        max_length=max_length)
+                self.data = preprocess_data(
+                    data=self.data,
+                    text_column=self.config["text_column"],
+                    backbone=self.config["backbone"],
+                    lang=self.config["language"],
+                    model=self.config["model"],
+                    batch_size=batch_size,
+                    n_process=n_process,
+                    max_length=max_length,
+                    nlp=self.nlp)
+                record["output_columns"] = ["nlp"]
         
         self.helper_cols = [
             "nlp",
             "lemmas",
             "tokens",
             "token_freqs",
+            "syllables",
             'synsets',
             'synsets_noun',
             'synsets_verb',
@@ -171,6 +293,11 @@ class Extractor:
         Helper function to apply a feature extraction function to the
         data. Handles features that require additional parameters.
 
+        Feature functions either return the full data with the new
+        columns, or only the new columns as Polars Series or expressions
+        (or a list of these). The latter are buffered and attached in one
+        step per feature area, see __flush.
+
         NOTE: Currently works for all kwargs except pos_tags
         specification. This is a known issue that will be fixed in
         future versions.
@@ -191,13 +318,342 @@ class Extractor:
         """
         backbone = self.config["backbone"]
         text_column = self.config["text_column"]
-  
-        self.data = function_map[feature](
-            data=self.data,
-            backbone=backbone,
-            text_column=text_column,
-            language=self.config["language"],
-            **kwargs)
+
+        # Features whose expression only depends on columns that are
+        # already in the data are buffered and attached with the other
+        # pending columns of the feature area
+        expr = None
+        if function_map is FUNCTION_MAP and feature in EXPRESSION_MAP:
+            expr = EXPRESSION_MAP[feature](
+                backbone=backbone,
+                text_column=text_column,
+                language=self.config["language"],
+                **kwargs)
+            if expr is not None and not all(
+                root in self.data.columns
+                for root in expr.meta.root_names()):
+                expr = None
+            if expr is not None and not self.__measures_each_feature():
+                # Computed and measured when the columns are attached
+                self.__pending_columns.append(expr)
+                self.__pending_features.append(feature)
+                self.extracted_features.add(feature)
+                return
+
+        with self.__measure("feature", feature) as record:
+            columns = self.data.columns
+            if expr is not None:
+                result = expr
+            else:
+                result = function_map[feature](
+                    data=self.data,
+                    backbone=backbone,
+                    text_column=text_column,
+                    language=self.config["language"],
+                    **kwargs)
+            if isinstance(result, pl.DataFrame):
+                self.data = result
+                record["output_columns"] = [column for column in
+                                            self.data.columns
+                                            if column not in columns]
+            else:
+                if isinstance(result, (pl.Series, pl.Expr)):
+                    result = [result]
+                record["output_columns"] = [_column_name(column)
+                                            for column in result]
+                if self.__measures_each_feature():
+                    # Attached in the step of the feature, so that the
+                    # step and its call profile cover the computation
+                    self.data = self.data.with_columns(result)
+                    self.__warn_nan(record["output_columns"])
+                else:
+                    self.__pending_columns.extend(result)
+                    self.__pending_features.append(feature)
+        self.extracted_features.add(feature)
+
+    def __measures_each_feature(self) -> bool:
+        """
+        Helper function to check whether every feature is attached and
+        measured on its own instead of in batches, i.e., while the call
+        profiles are written or the Python memory is traced.
+        """
+        return self.__profile_dir is not None or self.config["trace_memory"]
+
+    def __warn_nan(self, columns: list[str]) -> None:
+        """
+        Helper function to warn once per feature column that is NaN for
+        texts without tokens.
+        """
+        for name in columns:
+            if self.data[name].dtype.is_float() and \
+                self.data[name].is_nan().any():
+                zero_token_warning_nan(name)
+
+    def __flush(self) -> None:
+        """
+        Helper function to attach the pending feature columns to the data
+        in a single with_columns call.
+        """
+        if not self.__pending_columns:
+            return
+        pending = self.__pending_columns
+        features = self.__pending_features
+        self.__pending_columns = []
+        self.__pending_features = []
+        # A feature may be requested more than once; the last one wins
+        columns = {_column_name(column): column for column in pending}
+        with self.__measure("flush", ", ".join(features)) as record:
+            self.data = self.data.with_columns(list(columns.values()))
+            record["output_columns"] = list(columns)
+
+        self.__warn_nan(list(columns))
+
+    def __apply_planned(self,
+                        features: list[str],
+                        **kwargs,
+                        ) -> None:
+        """
+        Helper function to extract features with a single lazy query plan.
+        See the plan module for details.
+
+        Args:
+            features (list[str]): The features to extract.
+            **kwargs:
+                Additional keyword arguments for the feature extraction.
+        """
+        self.__flush()
+        if not features:
+            return
+        with self.__measure("plan", ", ".join(features)) as record:
+            columns = self.data.columns
+            self.data, stages = plan_features(
+                data=self.data,
+                features=features,
+                backbone=self.config["backbone"],
+                text_column=self.config["text_column"],
+                language=self.config["language"],
+                **kwargs)
+            self.data = collect_plan(self.data, stages)
+            record["output_columns"] = [column for column in
+                                        self.data.columns
+                                        if column not in columns]
+        self.extracted_features.update(features)
+
+    def __is_concurrent(self) -> bool:
+        """
+        Helper function to check whether feature areas are extracted
+        concurrently.
+        """
+        return self.config["n_threads"] > 1 or \
+            self.config["n_doc_processes"] > 0
+
+    def __extract_concurrently(self,
+                               features: dict[str, list[str]],
+                               ) -> None:
+        """
+        Helper function to extract feature areas concurrently. See the
+        executor module for details.
+
+        Lexicons are gathered before the areas are extracted, as they may
+        have to be downloaded first. Features planned in the lazy mode are
+        extracted afterwards.
+
+        Args:
+            features (dict[str, list[str]]):
+                The features to extract, grouped by feature area.
+        """
+        self.__flush()
+        areas = {}
+        lexicons = {}
+        planned_features = []
+        for feature_area in features:
+            areas[feature_area] = []
+            for feature in features[feature_area]:
+                self.__progress(f"Extracting {feature}...")
+                if self.__is_planned(feature):
+                    planned_features.append(feature)
+                elif feature in FEATURE_LEXICON_MAP:
+                    lexicon = self.__gather_resource_from_featurename(
+                        language=self.config["language"],
+                        feature=feature,
+                        feature_lexicon_map=FEATURE_LEXICON_MAP)
+                    if lexicon is not None:
+                        lexicons[feature] = lexicon
+                        areas[feature_area].append(feature)
+                elif feature in FUNCTION_MAP:
+                    areas[feature_area].append(feature)
+                else:
+                    print(f"Feature {feature} not found. Check spelling. "
+                          "Skipping...")
+
+        with self.__measure("areas", ", ".join(
+            area for area in areas if areas[area])) as record:
+            columns = self.data.columns
+            self.data = extract_areas(
+                data=self.data,
+                features=areas,
+                backbone=self.config["backbone"],
+                text_column=self.config["text_column"],
+                language=self.config["language"],
+                lexicons=lexicons,
+                n_threads=self.config["n_threads"],
+                n_processes=self.config["n_doc_processes"])
+            record["output_columns"] = [column for column in
+                                        self.data.columns
+                                        if column not in columns]
+        self.extracted_features.update(
+            feature for area_features in areas.values()
+            for feature in area_features)
+        self.__apply_planned(planned_features)
+
+    def __measure(self,
+                  stage: str,
+                  name: str,
+                  ):
+        """
+        Helper function to measure an extraction step, see the profiling
+        module. While profiling, the call profile of the step is written
+        to the profile directory.
+        """
+        profile_path = None
+        if self.__profile_dir is not None:
+            filename = re.sub(r"[^\w.-]+", "_", name)[:100]
+            profile_path = os.path.join(
+                self.__profile_dir,
+                f"{len(self.__records):03d}_{stage}_{filename}.prof")
+        return measure(self.__records,
+                       stage=stage,
+                       name=name,
+                       rows=self.data.height,
+                       trace_memory=self.config["trace_memory"],
+                       profile_path=profile_path,
+                       profiler=self.profiler)
+
+    def __profiled(self,
+                   extract,
+                   profile: bool | str,
+                   ) -> None:
+        """
+        Helper function to run an extraction with the call profiles of
+        its steps written to a directory, followed by the aggregated
+        hotspots as 'hotspots.csv'.
+
+        Args:
+            extract (Callable): Runs the extraction.
+            profile (bool | str):
+                Whether to profile, or the directory to write the call
+                profiles to. With True, a new temporary directory is
+                created.
+        """
+        if not profile:
+            extract()
+            return
+        if profile is True:
+            profile = tempfile.mkdtemp(prefix="elfen_profile_")
+        os.makedirs(profile, exist_ok=True)
+        n_records = len(self.__records)
+        self.__profile_dir = profile
+        try:
+            extract()
+        finally:
+            self.__profile_dir = None
+        records = [record for record in self.__records[n_records:]
+                   if record["profile_path"] is not None]
+        hotspots(
+            [record["profile_path"] for record in records],
+            top=100,
+            step_names=[record["name"] for record in records],
+        ).with_columns(
+            pl.col("steps").list.join(", ")
+        ).write_csv(os.path.join(profile, "hotspots.csv"))
+        self.__progress(f"Call profiles written to {profile}")
+
+    def hotspots(self,
+                 top: int = 20,
+                 ) -> pl.DataFrame:
+        """
+        Get the functions that take the most time in the profiled
+        extraction steps so far, aggregated over their call profiles.
+
+        Args:
+            top (int): The number of functions. Defaults to 20.
+
+        Returns:
+            hotspots (pl.DataFrame):
+                One row per function, with the columns 'function',
+                'calls', 'total_time', 'cumulative_time' (seconds) and
+                'steps', the features or steps that call it. See
+                hotspots in the profiling module for details.
+        """
+        records = [record for record in self.__records
+                   if record["profile_path"] is not None]
+        return hotspots([record["profile_path"] for record in records],
+                        top=top,
+                        step_names=[record["name"] for record in records])
+
+    def profile(self,
+                filepath: str | None = None,
+                ) -> pl.DataFrame:
+        """
+        Get the measurements of parsing and of every feature call so far.
+
+        Features computed with native Polars expressions are attached in
+        batches; they are measured together in a 'flush' step, unless the
+        call profiles are written (profile=True) or trace_memory=True, in
+        which case every feature is attached and measured on its own. Features
+        extracted with the lazy query plan are measured together in a
+        'plan' step, and concurrently extracted feature areas in an
+        'areas' step.
+
+        Args:
+            filepath (str | None):
+                The path to write the measurements to as JSON. Defaults to
+                None, i.e., nothing is written.
+
+        Returns:
+            profile (pl.DataFrame):
+                One row per step, with the columns 'stage', 'name',
+                'wall_time', 'cpu_time' (seconds), 'rss_delta',
+                'peak_memory' (bytes), 'rows', 'output_columns' and
+                'profile_path'. See the profiling module for details.
+        """
+        profile = records_to_frame(self.__records)
+        if filepath is not None:
+            profile.write_json(filepath)
+        return profile
+
+    def __progress(self, message: str) -> None:
+        """
+        Helper function to print the progress of the extraction, unless
+        the Extractor is not verbose.
+        """
+        if self.verbose:
+            print(message)
+
+    def __missing_features(self,
+                           features: list[str],
+                           ) -> list[str]:
+        """
+        Helper function to skip features that were already extracted,
+        e.g., before the session was saved.
+        """
+        missing = []
+        for feature in features:
+            if feature in self.extracted_features:
+                self.__progress(f"Feature {feature} already extracted. "
+                                "Skipping...")
+            else:
+                missing.append(feature)
+        return missing
+
+    def __is_planned(self,
+                     feature: str,
+                     ) -> bool:
+        """
+        Helper function to check whether a feature is extracted with the
+        lazy query plan.
+        """
+        return self.config["lazy"] and feature in EXPRESSION_MAP
 
     def extract_feature_group(self,
                               feature_group: Union[str, list[str]],
@@ -227,10 +683,25 @@ class Extractor:
         """
         if type(feature_group) == str:
             feature_group = [feature_group]
+        feature_area_map = {
+            group: self.__missing_features(feature_area_map[group])
+            for group in feature_group if group in feature_area_map}
+        if self.__is_concurrent():
+            for group in feature_group:
+                if group not in feature_area_map:
+                    print(f"Feature group {group} not found. Check "
+                          "spelling.")
+            self.__extract_concurrently({
+                group: feature_area_map[group] for group in feature_group
+                if group in feature_area_map})
+            return
+        planned_features = []
         for group in feature_group:
             if group in feature_area_map:
                 for feature in feature_area_map[group]:
-                    if feature in FEATURE_LEXICON_MAP:
+                    if self.__is_planned(feature):
+                        planned_features.append(feature)
+                    elif feature in FEATURE_LEXICON_MAP:
                         lexicon = self.__gather_resource_from_featurename(
                             language=self.config["language"],
                             feature=feature,
@@ -243,8 +714,10 @@ class Extractor:
                     else:
                         print(f"Feature {feature} not found. Check "
                               "spelling.")
+                self.__flush()
             else:
                 print(f"Feature group {group} not found. Check spelling.")
+        self.__apply_planned(planned_features)
     
     def __load_lexicon_from_featurename(self,
                                         filepath: str,
@@ -261,6 +734,12 @@ class Extractor:
             lexicon (pl.DataFrame):
                 The lexicon to use for feature extraction.
         """
+        # Lexicons are shared between features, e.g., the VAD lexicon
+        # for all valence, arousal and dominance features
+        cache_key = (filepath, self.config["language"])
+        if cache_key in _LEXICON_CACHE:
+            return _LEXICON_CACHE[cache_key]
+
         if "aoa" in featurename:
             lexicon = load_aoa_norms(filepath, 
                                      language=self.config["language"])
@@ -296,7 +775,8 @@ class Extractor:
                                             language=self.config["language"])
         else:
             print(f"Feature {featurename} not found. Skipping...")
-            lexicon = None
+            return None
+        _LEXICON_CACHE[cache_key] = lexicon
         return lexicon
     
     def token_normalize(self,
@@ -316,15 +796,9 @@ class Extractor:
         Returns:
             None
         """
-        if type(features) == list:
-            for feature in features:
-                self.data = self.data.with_columns(
-                    (pl.col(feature) / pl.col("n_tokens")). \
-                        alias(feature)
-                )
-        elif features == "all":
+        if features == "all":
             # exclude n_tokens, n_types, and n_sentences
-            feats = [f for f in self.get_feature_names() if f not in
+            features = [f for f in self.get_feature_names() if f not in
                         ["n_tokens",
                          "n_types",
                          "n_sentences",
@@ -332,11 +806,11 @@ class Extractor:
                          "n_lemmas",
                          "n_syllables"] and
                         f.startswith("n_")]
-            for feature in feats:
-                self.data = self.data.with_columns(
-                    (pl.col(feature) / pl.col("n_tokens")). \
-                        alias(feature)
-                )
+        elif type(features) == str:
+            features = [features]
+        if features:
+            self.data = self.data.with_columns(
+                pl.col(features) / pl.col("n_tokens"))
 
     def ratio_normalize(self,
                         features: Union[list[str], str] = "all",
@@ -386,44 +860,45 @@ class Extractor:
 
     def normalize(self,
                   features: Union[list[str], str] = "all",
+                  scaler: FeatureScaler | None = None,
                   **kwargs,
-                  ) -> None:
+                  ) -> FeatureScaler:
         """
         Normalize the extracted features to have a mean of 0 and a
         standard deviation of 1.
 
+        The statistics of all features are computed in a single pass and
+        returned as a fitted FeatureScaler, which can be saved and applied
+        to other data, e.g., the next batch of a stream.
+
         Args:
             features (Union[list[str], str]):
                 The features to normalize. Default is "all".
                 Allows for a list of features or a single feature in str
                 format, or 'all' to normalize all features.
+            scaler (FeatureScaler | None):
+                A fitted scaler to normalize with instead of the
+                statistics of the data. Defaults to None.
 
         Returns:
-            None
+            scaler (FeatureScaler): The fitted scaler.
         """
-        if type(features) == list:
-            for feature in features:
-                self.data = normalize_column(data=self.data,
-                                             column=feature)
-        else:
-            if features == "all":
-                features = self.get_feature_names()
-                for feature in features:
-                    self.data = normalize_column(data=self.data,
-                                                 column=feature)
-            else:
-                self.data = normalize_column(data=self.data,
-                                             column=features)
-        
+        return self.__scale(features, scaler, FeatureScaler())
+
     def rescale(self,
                 features: Union[list[str], str] = "all",
                 minimum: float = 0,
                 maximum: float = 1,
+                scaler: FeatureScaler | None = None,
                 **kwargs,
-                ) -> None:
+                ) -> FeatureScaler:
         """
         Rescale the extracted features to a specific range.
 
+        The minima and maxima of all features are computed in a single
+        pass and returned as a fitted FeatureScaler, which can be saved
+        and applied to other data, e.g., the next batch of a stream.
+
         Args:
             features (Union[list[str], str]):
                 The features to rescale. Default is "all".
@@ -435,29 +910,36 @@ class Extractor:
             maximum (float):
                 The maximum value to rescale the features to.
                 Default is 1.
+            scaler (FeatureScaler | None):
+                A fitted scaler to rescale with instead of the minima and
+                maxima of the data. Its range takes precedence over
+                minimum and maximum. Defaults to None.
 
         Returns:
-            None
+            scaler (FeatureScaler): The fitted scaler.
         """
-        if type(features) == list:
-            for feature in features:
-                self.data = rescale_column(data=self.data,
-                                           column=feature,
-                                           minimum=minimum,
-                                           maximum=maximum)
-        else:
-            if features == "all":
-                features = self.get_feature_names()
-                for feature in features:
-                    self.data = rescale_column(data=self.data,
-                                               column=feature,
-                                               minimum=minimum,
-                                               maximum=maximum)
-            else:
-                self.data = rescale_column(data=self.data,
-                                           column=features,
-                                           minimum=minimum,
-                                           maximum=maximum)
+        return self.__scale(features, scaler,
+                            FeatureScaler(method="rescale",
+                                          minimum=minimum,
+                                          maximum=maximum))
+
+    def __scale(self,
+                features: Union[list[str], str],
+                scaler: FeatureScaler | None,
+                new_scaler: FeatureScaler,
+                ) -> FeatureScaler:
+        """
+        Helper function to normalize or rescale features with a fitted
+        scaler, or with a new scaler fitted on the data.
+        """
+        if features == "all":
+            features = self.get_feature_names()
+        elif type(features) == str:
+            features = [features]
+        if scaler is None:
+            scaler = new_scaler.fit(self.data, features)
+        self.data = scaler.transform(self.data, features)
+        return scaler
 
     def __gather_resource_from_featurename(self,
                                            language: str,
@@ -514,18 +996,44 @@ class Extractor:
             print(f"Feature {feature} not found. Skipping...")
             return None
 
-    def extract_features(self) -> None:
+    def extract_features(self,
+                         profile: bool | str = False,
+                         ) -> None:
         """
         Extracts all features specified in the config.
 
+        Args:
+            profile (bool | str):
+                Whether to write a call profile of every feature call and
+                the aggregated hotspots ('hotspots.csv'), or the directory
+                to write them to. With True, a new temporary directory is
+                created. Defaults to False. In the concurrent mode, only
+                the calling thread is profiled.
+
         Returns:
             None
         """
-        features = self.config["features"]
+        self.__profiled(self.__extract_features, profile)
+
+    def __extract_features(self) -> None:
+        """
+        Helper function to extract all features specified in the config.
+        """
+        features = {area: self.__missing_features(area_features)
+                    for area, area_features in
+                    self.config["features"].items()}
+        if self.__is_concurrent():
+            self.__extract_concurrently(features)
+            if self.config["remove_constant_cols"] and len(self.data) > 1:
+                self.remove_constant_cols()
+            return
+        planned_features = []
         for feature_area in features:
             for feature in features[feature_area]:
-                print(f"Extracting {feature}...")
-                if feature in FUNCTION_MAP:
+                self.__progress(f"Extracting {feature}...")
+                if self.__is_planned(feature):
+                    planned_features.append(feature)
+                elif feature in FUNCTION_MAP:
                     if feature in FEATURE_LEXICON_MAP:
                         lexicon = self.__gather_resource_from_featurename(
                             language=self.config["language"],
@@ -540,6 +1048,8 @@ class Extractor:
                 else:
                     print(f"Feature {feature} not found. Check spelling. "
                           "Skipping...")
+            self.__flush()
+        self.__apply_planned(planned_features)
 
         # Remove constant columns if specified and if there is more than 
         # one row
@@ -548,6 +1058,7 @@ class Extractor:
     
     def extract(self,
                 features: Union[str|list[str]],
+                profile: bool | str = False,
                 **kwargs,
                 ):
         """
@@ -557,6 +1068,10 @@ class Extractor:
             features (Union[str, list[str]]):
                 The feature to extract. Can be a single feature in str
                 format or a list of features.
+            profile (bool | str):
+                Whether to write a call profile of every feature call and
+                the aggregated hotspots, or the directory to write them
+                to. See extract_features. Defaults to False.
             **kwargs:
                 Additional keyword arguments for the feature extraction.
                 Any lexicons or thresholds required for the feature, or
@@ -566,10 +1081,26 @@ class Extractor:
         Returns:
             None
         """
+        self.__profiled(lambda: self.__extract(features, **kwargs),
+                        profile)
+
+    def __extract(self,
+                  features: Union[str|list[str]],
+                  **kwargs,
+                  ) -> None:
+        """
+        Helper function to extract features, see extract.
+        """
         if type(features) == str:
             features = [features]
+        # Features requested with other settings are extracted again
+        if not kwargs:
+            features = self.__missing_features(features)
+        planned_features = []
         for feature_name in features:
-            if feature_name in FUNCTION_MAP:
+            if self.__is_planned(feature_name):
+                planned_features.append(feature_name)
+            elif feature_name in FUNCTION_MAP:
                 # handle lexicon separately from other kwargs to ensure
                 # that the lexicon is loaded correctly if specified by 
                 # the user
@@ -588,10 +1119,116 @@ class Extractor:
                                               lexicon=lexicon,
                                               **kwargs)
                 else:
-                    self.__apply_function(feature_name)
+                    self.__apply_function(feature_name, **kwargs)
             else:
                 print(f"Feature {feature_name} not found. Check spelling.")
+        self.__apply_planned(planned_features, **kwargs)
     
+    def extract_one(self,
+                    text,
+                    features: list[str] | None = None,
+                    ) -> dict[str, int | float | None]:
+        """
+        Extract the features of a single text without the DataFrame
+        machinery, e.g., for online scoring with a warm extractor. The
+        text is parsed with the NLP pipeline of the extractor, and the
+        features are computed directly from the parsed document and the
+        cached lexicons. See the document module for details.
+
+        The features are the same as in the DataFrame path, except that
+        corpus-global features are skipped. The data of the extractor is
+        not changed.
+
+        Args:
+            text (str | spacy.tokens.Doc | stanza.Document):
+                The text, or an already parsed document.
+            features (list[str] | None):
+                The features to extract. Defaults to None, i.e., the
+                features in the config.
+
+        Returns:
+            features (dict[str, int | float | None]):
+                The feature values by column name.
+        """
+        return self.extract_docs([text], features=features)[0]
+
+    def extract_docs(self,
+                     texts: list,
+                     features: list[str] | None = None,
+                     ) -> list[dict[str, int | float | None]]:
+        """
+        Extract the features of a small batch of texts without the
+        DataFrame machinery, see extract_one. The texts are parsed with
+        one call of the NLP pipeline.
+
+        Args:
+            texts (list[str | spacy.tokens.Doc | stanza.Document]):
+                The texts, or already parsed documents.
+            features (list[str] | None):
+                The features to extract. Defaults to None, i.e., the
+                features in the config.
+
+        Returns:
+            features (list[dict[str, int | float | None]]):
+                The feature values by column name, one dictionary per
+                text.
+        """
+        if features is None:
+            features = [feature for area_features in
+                        self.config["features"].values()
+                        for feature in area_features]
+        elif type(features) == str:
+            features = [features]
+        for feature in features:
+            if feature in FEATURE_LEXICON_MAP and \
+                feature not in self.__document_lexicons:
+                self.__document_lexicons[feature] = \
+                    self.__gather_resource_from_featurename(
+                        language=self.config["language"],
+                        feature=feature,
+                        feature_lexicon_map=FEATURE_LEXICON_MAP)
+        lexicons = {feature: lexicon for feature, lexicon
+                    in self.__document_lexicons.items()
+                    if lexicon is not None}
+        # Lexicon-based features without a lexicon for the language are
+        # skipped, as in extract_features
+        features = [feature for feature in features
+                    if feature not in FEATURE_LEXICON_MAP
+                    or feature in lexicons]
+        return [extract_document(doc,
+                                 features=features,
+                                 backbone=self.config["backbone"],
+                                 text_column=self.config["text_column"],
+                                 language=self.config["language"],
+                                 lexicons=lexicons,
+                                 helper_columns=self.helper_cols)
+                for doc in self.__parse(texts)]
+
+    def __parse(self,
+                texts: list,
+                ) -> list:
+        """
+        Helper function to parse the texts that are not yet parsed with
+        the NLP pipeline of the extractor.
+        """
+        positions = [i for i, text in enumerate(texts)
+                     if isinstance(text, str)]
+        docs = list(texts)
+        if not positions:
+            return docs
+        if self.nlp is None:
+            self.nlp = load_nlp(backbone=self.config["backbone"],
+                                model=self.config["model"],
+                                max_length=self.config.get("max_length",
+                                                           1_000_000))
+        if self.config["backbone"] == "spacy":
+            parsed = self.nlp.pipe([texts[i] for i in positions])
+        else:
+            parsed = [self.nlp(texts[i]) for i in positions]
+        for i, doc in zip(positions, parsed):
+            docs[i] = doc
+        return docs
+
     def __cleanup_cols(self):
         """
         Helper function to remove helper columns from the data.
@@ -606,10 +1243,15 @@ class Extractor:
         Helper function to remove constant columns from the data.
         Constant columns are columns with only one unique value.
         """
-        # Remove constant feature columns
-        cols_to_drop = [col for col in self.get_feature_names() if
-                        self.data[col].n_unique() == 1]
-        
+        feature_names = self.get_feature_names()
+        if not feature_names:
+            return
+        # Count the unique values of all feature columns in one pass
+        n_unique = self.data.select(
+            pl.col(feature_names).n_unique()).row(0, named=True)
+        cols_to_drop = [col for col, count in n_unique.items()
+                        if count == 1]
+
         self.data = self.data.drop(cols_to_drop)
 
     def get_feature_names(self) -> list[str]:
@@ -644,6 +1286,161 @@ class Extractor:
         self.__cleanup_cols()
         self.data.write_csv(filepath, **kwargs)
 
+    def write_parquet(self,
+                      filepath: str,
+                      compression: str = "zstd",
+                      compression_level: int | None = None,
+                      row_group_size: int | None = None,
+                      ) -> None:
+        """
+        Save the extracted features to a Parquet file.
+        Cleans up the data by removing helper columns before saving. The
+        configuration is stored in the file metadata, see the sinks
+        module.
+
+        Args:
+            filepath (str): The path to save the Parquet file.
+            compression (str):
+                The compression codec, e.g., 'zstd', 'snappy' or 'none'.
+                Defaults to 'zstd'.
+            compression_level (int | None):
+                The compression level. Defaults to the default level of
+                the codec.
+            row_group_size (int | None):
+                The maximum number of rows per row group.
+        """
+        self.__cleanup_cols()
+        with ParquetSink(filepath,
+                         config=self.config,
+                         compression=compression,
+                         compression_level=compression_level,
+                         row_group_size=row_group_size) as sink:
+            sink.write(self.data)
+
+    def write_ipc(self,
+                  filepath: str,
+                  compression: str | None = None,
+                  ) -> None:
+        """
+        Save the extracted features to an Arrow IPC (Feather v2) file.
+        Cleans up the data by removing helper columns before saving. The
+        configuration is stored in the file metadata, see the sinks
+        module.
+
+        Args:
+            filepath (str): The path to save the IPC file.
+            compression (str | None):
+                The compression codec, either 'lz4', 'zstd' or None.
+                Defaults to None, which allows memory-mapping the file.
+        """
+        self.__cleanup_cols()
+        with IPCSink(filepath,
+                     config=self.config,
+                     compression=compression) as sink:
+            sink.write(self.data)
+
+    def write_parquet_dataset(self,
+                              path: str,
+                              partition_by: str,
+                              compression: str = "zstd",
+                              row_group_size: int | None = None,
+                              ) -> None:
+        """
+        Save the extracted features to a hive-style partitioned Parquet
+        dataset with one directory per value of the partition column.
+        Cleans up the data by removing helper columns before saving. The
+        configuration is stored in the file metadata, see the sinks
+        module.
+
+        Args:
+            path (str): The root directory of the dataset.
+            partition_by (str): The column to partition by.
+            compression (str):
+                The compression codec, e.g., 'zstd', 'snappy' or 'none'.
+                Defaults to 'zstd'.
+            row_group_size (int | None):
+                The maximum number of rows per row group.
+        """
+        self.__cleanup_cols()
+        with PartitionedParquetSink(path,
+                                    partition_by=partition_by,
+                                    config=self.config,
+                                    compression=compression,
+                                    row_group_size=row_group_size) as sink:
+            sink.write(self.data)
+
+    def save_session(self,
+                     path: str,
+                     ) -> None:
+        """
+        Save the extraction session to a directory, so that features can
+        be added later without parsing the text data again. The session
+        consists of the parsed documents, the data with the helper columns
+        and the extracted features, and the configuration. Helper columns
+        holding Python objects other than the parsed documents are not
+        saved and are computed again when needed.
+
+        Args:
+            path (str): The directory to save the session to.
+        """
+        os.makedirs(path, exist_ok=True)
+        backbone = self.config["backbone"]
+        save_docs(self.data["nlp"].to_list(),
+                  os.path.join(path, f"docs.{backbone}"),
+                  backbone=backbone)
+        self.data.select(pl.exclude(pl.Object)).write_parquet(
+            os.path.join(path, "data.parquet"))
+        with open(os.path.join(path, "session.json"), "w") as f:
+            json.dump({
+                "config": self.config,
+                "columns": self.data.columns,
+                "initial_cols": self.initial_cols,
+                "extracted_features": sorted(self.extracted_features),
+            }, f, default=str)
+
+    @classmethod
+    def load_session(cls,
+                     path: str,
+                     **kwargs,
+                     ) -> "Extractor":
+        """
+        Reopen an extraction session saved with save_session. The text
+        data is not parsed again; only the NLP pipeline is loaded to
+        restore the parsed documents.
+
+        Args:
+            path (str): The directory the session was saved to.
+            **kwargs:
+                Configuration settings overriding the saved configuration,
+                e.g., n_threads, or an already loaded NLP pipeline with
+                ``nlp=...``.
+
+        Returns:
+            extractor (Extractor):
+                The Extractor with the data of the session.
+        """
+        with open(os.path.join(path, "session.json")) as f:
+            session = json.load(f)
+        config = session["config"]
+        nlp = kwargs.pop("nlp", None)
+        if nlp is None and config["backbone"] == "spacy":
+            nlp = load_nlp(backbone=config["backbone"],
+                           model=kwargs.get("model", config["model"]),
+                           max_length=config.get("max_length", 1_000_000))
+        docs = load_docs(os.path.join(path, f"docs.{config['backbone']}"),
+                         backbone=config["backbone"],
+                         nlp=nlp)
+        data = pl.read_parquet(os.path.join(path, "data.parquet"))
+        data = data.with_columns(pl.Series("nlp", docs, dtype=pl.Object))
+        data = data.select([column for column in session["columns"]
+                            if column in data.columns])
+
+        extractor = cls(data, config=config, nlp=nlp, **kwargs)
+        extractor.initial_cols = session["initial_cols"]
+        extractor.extracted_features = set(session["extracted_features"])
+
+        return extractor
+
     def get_data(self) -> pl.DataFrame:
         """
         Get the data with the extracted features.
@@ -654,9 +1451,169 @@ class Extractor:
         """
         return self.data
     
+    def get_token_table(self,
+                        ratings: list[str] | None = None,
+                        syllables: bool = True,
+                        synsets: bool = False,
+                        ) -> pl.DataFrame:
+        """
+        Get the token-level features, i.e., one row per token with its
+        document ID, sentence, position, text, lemma, part-of-speech tag,
+        dependency relation, syllable count and lexicon ratings. See the
+        tokens module for details.
+
+        Args:
+            ratings (list[str] | None):
+                The lexicon ratings to attach, see TOKEN_RATING_MAP in the
+                tokens module, e.g., ['vad', 'concreteness']. The lexicons
+                are downloaded if necessary. Defaults to None, i.e., no
+                ratings.
+            syllables (bool): Whether to count the syllables of the
+                tokens. Defaults to True.
+            synsets (bool): Whether to count the WordNet synsets of the
+                tokens. Requires the WordNet of the language.
+                Defaults to False.
+
+        Returns:
+            token_table (pl.DataFrame): One row per token.
+        """
+        return get_token_table(self.data,
+                               backbone=self.config["backbone"],
+                               language=self.config["language"],
+                               lexicons=self.__token_lexicons(ratings),
+                               syllables=syllables,
+                               synsets=synsets)
+
+    def write_token_table(self,
+                          filepath: str,
+                          ratings: list[str] | None = None,
+                          syllables: bool = True,
+                          synsets: bool = False,
+                          chunk_size: int = 1_000,
+                          compression: str = "zstd",
+                          ) -> int:
+        """
+        Write the token-level features to a Parquet file in chunks of
+        documents, see get_token_table. The configuration is stored in
+        the file metadata.
+
+        Args:
+            filepath (str): The path of the Parquet file.
+            ratings (list[str] | None):
+                The lexicon ratings to attach. Defaults to None.
+            syllables (bool): Whether to count the syllables of the
+                tokens. Defaults to True.
+            synsets (bool): Whether to count the WordNet synsets of the
+                tokens. Defaults to False.
+            chunk_size (int): The number of documents per chunk.
+                Defaults to 1000.
+            compression (str): The Parquet compression codec.
+                Defaults to 'zstd'.
+
+        Returns:
+            n_tokens (int): The number of rows written.
+        """
+        return write_token_table(self.data,
+                                 filepath,
+                                 backbone=self.config["backbone"],
+                                 chunk_size=chunk_size,
+                                 compression=compression,
+                                 config=self.config,
+                                 language=self.config["language"],
+                                 lexicons=self.__token_lexicons(ratings),
+                                 syllables=syllables,
+                                 synsets=synsets)
+
+    def __token_lexicons(self,
+                         ratings: list[str] | None,
+                         ) -> dict[str, pl.DataFrame]:
+        """
+        Helper function to gather the lexicons of token-level ratings.
+        """
+        lexicons = {}
+        for name in ratings or []:
+            if name not in TOKEN_RATING_MAP:
+                raise ValueError(f"Unknown token rating '{name}'. Available "
+                                 f"ratings are {list(TOKEN_RATING_MAP)}.")
+            lexicon = self.__gather_resource_from_featurename(
+                language=self.config["language"],
+                feature=TOKEN_RATING_MAP[name]["feature"],
+                feature_lexicon_map=FEATURE_LEXICON_MAP)
+            if lexicon is not None:
+                lexicons[name] = lexicon
+        return lexicons
+
+    def get_sentence_table(self,
+                           ratings: list[str] | None = None,
+                           dependency: bool = True,
+                           threshold: int = 6,
+                           ) -> pl.DataFrame:
+        """
+        Get the sentence-level features, i.e., one row per sentence with
+        its surface, readability, lexicon and dependency features. The
+        features are computed from the token table, without parsing the
+        sentences again. See the sentences module for details.
+
+        Args:
+            ratings (list[str] | None):
+                The lexicon ratings to average, see TOKEN_RATING_MAP in
+                the tokens module, e.g., ['vad', 'concreteness'].
+                Defaults to None, i.e., no lexicon features.
+            dependency (bool): Whether to compute the dependency
+                features. Defaults to True.
+            threshold (int): The minimum length of a long word.
+                Defaults to 6.
+
+        Returns:
+            sentence_table (pl.DataFrame): One row per sentence.
+        """
+        return get_sentence_table(self.data,
+                                  backbone=self.config["backbone"],
+                                  language=self.config["language"],
+                                  lexicons=self.__token_lexicons(ratings),
+                                  dependency=dependency,
+                                  threshold=threshold)
+
+    def extract_sentence_features(self,
+                                  aggregations: list[str] | None = None,
+                                  features: list[str] | None = None,
+                                  ratings: list[str] | None = None,
+                                  dependency: bool = True,
+                                  threshold: int = 6,
+                                  ) -> None:
+        """
+        Extract sentence-level features and add their aggregations per
+        document to the data, e.g., 'tree_depth_mean' or
+        'n_tokens_p90'. Documents without sentences have nulls.
+
+        Args:
+            aggregations (list[str] | None):
+                The aggregations, any of 'mean', 'median', 'min', 'max',
+                'std' and 'sum', or percentiles such as 'p90'.
+                Defaults to None, i.e., ['mean'].
+            features (list[str] | None):
+                The sentence features to aggregate. Defaults to all.
+            ratings (list[str] | None):
+                The lexicon ratings to average. Defaults to None.
+            dependency (bool): Whether to compute the dependency
+                features. Defaults to True.
+            threshold (int): The minimum length of a long word.
+                Defaults to 6.
+        """
+        if aggregations is None:
+            aggregations = ["mean"]
+        sentences = self.get_sentence_table(ratings=ratings,
+                                            dependency=dependency,
+                                            threshold=threshold)
+        documents = aggregate_sentences(sentences,
+                                        aggregations=aggregations,
+                                        features=features,
+                                        n_docs=self.data.height)
+        self.data = self.data.with_columns(documents.drop("doc_id"))
+
     def get_corpus_frequencies(self,
                                kind: str = "token",
-                               ) -> dict[str, int]:
+                               ) -> pl.DataFrame:
         """
         Get the global frequencies of tokens or lemmas in the data.
 
@@ -666,9 +1623,9 @@ class Extractor:
                 Options are "token" or "lemma".
         
         Returns:
-            frequencies (dict[str, int]):
-                A dictionary of the global frequencies of tokens or lemmas
-                in the data.
+            frequencies (pl.DataFrame):
+                A Polars DataFrame with the columns 'token' or 'lemma'
+                and 'frequency', sorted by descending frequency.
         """
         if kind == "token":
             frequencies = get_global_token_frequencies(
@@ -678,6 +1635,16 @@ class Extractor:
             frequencies = get_global_lemma_frequencies(
                 data=self.data,
                 backbone=self.config["backbone"])
+        else:
+            raise ValueError(f"Unsupported kind '{kind}'. "
+                             "Supported kinds are 'token' and 'lemma'.")
             
         return frequencies
 
+def _column_name(column: Union[pl.Series, pl.Expr]) -> str:
+    """
+    Helper function to get the name of a feature column.
+    """
+    if isinstance(column, pl.Expr):
+        return column.meta.output_name()
+    return column.name
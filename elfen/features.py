@@ -2,6 +2,10 @@
 This module contains helper mappings to map feature names to the
 respective functions that calculate them. Additionally, it contains
 mappings to group features by their respective feature areas.
+
+Features that can be computed from helper columns with native Polars
+expressions are additionally mapped to their expression builders in
+EXPRESSION_MAP, which are used to build lazy query plans.
 """
 from .preprocess import (
     get_lemmas,
@@ -57,6 +61,7 @@ from .entities import (
 from .information import (
     get_compressibility,
     get_entropy,
+    entropy_expr,
 )
 from .lexical_richness import (
     get_lemma_token_ratio,
@@ -84,6 +89,24 @@ from .lexical_richness import (
     get_yule_k,
     get_simpsons_d,
     get_herdan_v,
+    # expression builders
+    lemma_token_ratio_expr,
+    ttr_expr,
+    cttr_expr,
+    rttr_expr,
+    herdan_c_expr,
+    summer_index_expr,
+    dugast_u_expr,
+    maas_index_expr,
+    n_hapax_legomena_expr,
+    n_hapax_dislegomena_expr,
+    lexical_density_expr,
+    sichel_s_expr,
+    global_sichel_s_expr,
+    giroud_index_expr,
+    yule_k_expr,
+    simpsons_d_expr,
+    herdan_v_expr,
 )
 from .morphological import (
     get_morph_feats,
@@ -159,6 +182,19 @@ from .readability import (
     get_num_monosyllables,
     get_num_polysyllables,
     get_num_syllables,
+    get_syllables,
+    # expression builders
+    flesch_reading_ease_expr,
+    flesch_kincaid_grade_expr,
+    smog_expr,
+    ari_expr,
+    cli_expr,
+    gunning_fog_expr,
+    lix_expr,
+    rix_expr,
+    n_monosyllables_expr,
+    n_polysyllables_expr,
+    n_syllables_expr,
 )
 from .resource_utils.langs import LANGUAGES_NRC
 from .semantic import (
@@ -172,6 +208,8 @@ from .semantic import (
 )
 from .surface import (
     get_avg_word_length,
+    get_global_lemma_frequencies,
+    get_global_token_frequencies,
     get_num_lemmas,
     get_num_long_words,
     get_num_sentences,
@@ -179,7 +217,17 @@ from .surface import (
     get_num_tokens_per_sentence,
     get_num_types,
     get_raw_sequence_length,
-    get_num_characters
+    get_num_characters,
+    get_token_freqs,
+    # expression builders
+    avg_word_length_expr,
+    n_characters_expr,
+    n_lemmas_expr,
+    n_long_words_expr,
+    n_tokens_expr,
+    n_tokens_per_sentence_expr,
+    n_types_expr,
+    raw_sequence_length_expr,
 )
 
 FUNCTION_MAP = {
@@ -348,6 +396,78 @@ FUNCTION_MAP = {
     "n_per_dependency_type": get_n_per_dependency_type,
 }
 
+# Expression builders for the features that are computed natively from
+# helper columns. Each builder returns an aliased expression, or None if
+# the feature cannot be expressed for the given backbone.
+EXPRESSION_MAP = {
+    # SURFACE FEATURES
+    "raw_sequence_length": raw_sequence_length_expr,
+    "n_tokens": n_tokens_expr,
+    "n_lemmas": n_lemmas_expr,
+    "n_types": n_types_expr,
+    "avg_word_length": avg_word_length_expr,
+    "n_long_words": n_long_words_expr,
+    "n_tokens_per_sentence": n_tokens_per_sentence_expr,
+    "n_characters": n_characters_expr,
+    # INFORMATION THEORETIC FEATURES
+    "entropy": entropy_expr,
+    # LEXICAL RICHNESS FEATURES
+    "lemma_token_ratio": lemma_token_ratio_expr,
+    "ttr": ttr_expr,
+    "cttr": cttr_expr,
+    "rttr": rttr_expr,
+    "herdan_c": herdan_c_expr,
+    "summer_index": summer_index_expr,
+    "dugast_u": dugast_u_expr,
+    "maas_index": maas_index_expr,
+    "n_hapax_legomena": n_hapax_legomena_expr,
+    "lexical_density": lexical_density_expr,
+    "n_hapax_dislegomena": n_hapax_dislegomena_expr,
+    "sichel_s": sichel_s_expr,
+    "global_sichel_s": global_sichel_s_expr,
+    "giroud_index": giroud_index_expr,
+    "yule_k": yule_k_expr,
+    "simpsons_d": simpsons_d_expr,
+    "herdan_v": herdan_v_expr,
+    # READABILITY FEATURES
+    "flesch_reading_ease": flesch_reading_ease_expr,
+    "flesch_kincaid_grade": flesch_kincaid_grade_expr,
+    "smog": smog_expr,
+    "ari": ari_expr,
+    "cli": cli_expr,
+    "gunning_fog": gunning_fog_expr,
+    "lix": lix_expr,
+    "rix": rix_expr,
+    "n_monosyllables": n_monosyllables_expr,
+    "n_polysyllables": n_polysyllables_expr,
+    "n_syllables": n_syllables_expr,
+}
+
+# Functions materializing the helper columns the expressions are built on.
+HELPER_FUNCTION_MAP = {
+    "tokens": get_tokens,
+    "lemmas": get_lemmas,
+    "token_freqs": get_token_freqs,
+    "syllables": get_syllables,
+}
+
+# Corpus-global features and the kind of corpus frequency table they are
+# computed on. When the corpus is processed in parts, the frequency tables
+# of the parts are merged before these features are computed.
+GLOBAL_FEATURE_MAP = {
+    "n_global_token_hapax_legomena": "token",
+    "n_global_lemma_hapax_legomena": "lemma",
+    "n_global_token_hapax_dislegomena": "token",
+    "n_global_lemma_hapax_dislegomena": "lemma",
+    "global_sichel_s": "token",
+}
+
+# Functions computing the corpus frequency tables by kind.
+FREQUENCY_FUNCTION_MAP = {
+    "token": get_global_token_frequencies,
+    "lemma": get_global_lemma_frequencies,
+}
+
 FEATURE_AREA_MAP = {
     "surface": [
         "raw_sequence_length",
@@ -39,17 +39,19 @@ def get_avg(data: pl.DataFrame,
             DataFrame with new column for average ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_rating_col)
 
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        pl.col(lexicon_rating_col).mean(),
-        new_col_name,
-        fill=None # If no words are found, leave as null
+    return data.with_columns(
+        _aggregate(exploded,
+                   pl.col(lexicon_rating_col).mean(),
+                   new_col_name,
+                   fill=None) # If no words are found, leave as null
     )
 
 def get_n_low(data: pl.DataFrame,
@@ -85,17 +87,19 @@ def get_n_low(data: pl.DataFrame,
             DataFrame with new column for count of low ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_rating_col)
-    
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        (pl.col(lexicon_rating_col) < threshold).sum(),
-        new_col_name,
-        fill=0 # If no words are found, set count to 0
+
+    return data.with_columns(
+        _aggregate(exploded,
+                   (pl.col(lexicon_rating_col) < threshold).sum(),
+                   new_col_name,
+                   fill=0) # If no words are found, set count to 0
     )
 
 def get_n_high(data: pl.DataFrame,
@@ -131,17 +135,19 @@ def get_n_high(data: pl.DataFrame,
             DataFrame with new column for count of high ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_rating_col)
-    
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        (pl.col(lexicon_rating_col) > threshold).sum(),
-        new_col_name,
-        fill=0 # If no words are found, set count to 0
+
+    return data.with_columns(
+        _aggregate(exploded,
+                   (pl.col(lexicon_rating_col) > threshold).sum(),
+                   new_col_name,
+                   fill=0) # If no words are found, set count to 0
     )
 
 def get_n_controversial(data: pl.DataFrame,
@@ -179,17 +185,19 @@ def get_n_controversial(data: pl.DataFrame,
             DataFrame with new column for count of controversial ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_sd_col)
-    
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        (pl.col(lexicon_sd_col) > threshold).sum(),
-        new_col_name,
-        fill=0 # If no words are found, set count to 0
+
+    return data.with_columns(
+        _aggregate(exploded,
+                   (pl.col(lexicon_sd_col) > threshold).sum(),
+                   new_col_name,
+                   fill=0) # If no words are found, set count to 0
     )
 
 def get_max(data: pl.DataFrame,
@@ -223,17 +231,19 @@ def get_max(data: pl.DataFrame,
             DataFrame with new column for maximum ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_rating_col)
-    
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        pl.col(lexicon_rating_col).max(),
-        new_col_name,
-        fill=None # If no words are found, leave as null
+
+    return data.with_columns(
+        _aggregate(exploded,
+                   pl.col(lexicon_rating_col).max(),
+                   new_col_name,
+                   fill=None) # If no words are found, leave as null
     )
 
 def get_min(data: pl.DataFrame,
@@ -267,17 +277,19 @@ def get_min(data: pl.DataFrame,
             DataFrame with new column for minimum ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_rating_col)
-    
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        pl.col(lexicon_rating_col).min(),
-        new_col_name,
-        fill=None # If no words are found, leave as null
+
+    return data.with_columns(
+        _aggregate(exploded,
+                   pl.col(lexicon_rating_col).min(),
+                   new_col_name,
+                   fill=None) # If no words are found, leave as null
     )
 
 def get_sd(data: pl.DataFrame,
@@ -311,17 +323,19 @@ def get_sd(data: pl.DataFrame,
             DataFrame with new column for standard deviation of ratings.
             Named as specified by `new_col_name`.
     """
+    if "lemmas" not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
     exploded = _explode_and_join(data,
                                  lexicon,
                                  lexicon_word_col,
                                  lexicon_rating_col)
-    
-    return _aggregate_and_rejoin(
-        data,
-        exploded,
-        pl.col(lexicon_rating_col).std(),
-        new_col_name,
-        fill=None # If no words are found, leave as null
+
+    return data.with_columns(
+        _aggregate(exploded,
+                   pl.col(lexicon_rating_col).std(),
+                   new_col_name,
+                   fill=None) # If no words are found, leave as null
     )
 
 def _explode_and_join(data: pl.DataFrame,
@@ -331,6 +345,8 @@ def _explode_and_join(data: pl.DataFrame,
                      ) -> pl.DataFrame:
     """
     Helper function to explode lemmas and join with lexicon ratings.
+    Only the lemmas are exploded, together with the index of the row they
+    belong to.
 
     Args:
         data (pl.DataFrame):
@@ -346,14 +362,12 @@ def _explode_and_join(data: pl.DataFrame,
         pl.DataFrame:
             DataFrame with exploded lemmas and joined ratings.
     """
-    
-    if "lemmas" not in data.columns:
-        data = get_lemmas(data, backbone="spacy")
-
     return (
         data
+        .select(pl.col("lemmas"))
         .with_row_index("__row_idx")
-        .explode("lemmas")
+        # Texts without lemmas keep a (null) row, see _aggregate
+        .explode("lemmas", empty_as_null=True)
         .join(
             lexicon.select(
                 pl.col(lexicon_word_col).alias("lemmas"),
@@ -364,19 +378,20 @@ def _explode_and_join(data: pl.DataFrame,
         )
     )
 
-def _aggregate_and_rejoin(
-        data: pl.DataFrame,
-        exploded: pl.DataFrame,
-        agg_expr: pl.Expr,
-        new_col_name: str,
-        fill: float | int | None = None
-) -> pl.DataFrame:
+def _aggregate(exploded: pl.DataFrame,
+               agg_expr: pl.Expr,
+               new_col_name: str,
+               fill: float | int | None = None,
+               ) -> pl.Series:
     """
-    Helper function to aggregate exploded data and rejoin with original DataFrame.
+    Helper function to aggregate exploded data back to one value per row
+    of the original DataFrame.
+
+    _explode_and_join keeps a row for texts without lemmas
+    (empty_as_null=True), so every row index is present after grouping and the sorted result is aligned with the
+    original DataFrame without joining it.
 
     Args:
-        data (pl.DataFrame):
-            Original DataFrame before exploding.
         exploded (pl.DataFrame):
             DataFrame after exploding and joining with lexicon.
         agg_expr (pl.Expr):
@@ -388,24 +403,18 @@ def _aggregate_and_rejoin(
             leaves as null. Defaults to None.
     
     Returns:
-        pl.DataFrame:
-            DataFrame with new column for aggregated ratings.
+        pl.Series:
+            The aggregated ratings, named `new_col_name`.
     """
     result = (
         exploded
         .group_by("__row_idx")
         .agg(agg_expr.alias(new_col_name))
-    )
-
-    data = (
-        data
-        .with_row_index("__row_idx")
-        .join(result, on="__row_idx", how="left")
-        .drop("__row_idx")
+        .sort("__row_idx")
+        .get_column(new_col_name)
     )
 
     if fill is not None:
-        data = data.with_columns(pl.col(new_col_name).fill_null(fill))
-
-    return data
+        result = result.fill_null(fill)
 
+    return result
@@ -0,0 +1,435 @@
+"""
+This module contains functions to extend a feature table with new rows
+without extracting the features of the existing rows again.
+
+Besides the feature table, an incremental extraction keeps the state of
+the corpus (see CorpusState):
+
+- The corpus frequency tables of the tokens and lemmas, which the global
+  hapax legomena/dislegomena and the global Sichel's S are computed on.
+- An index of the rare words, i.e., the words with a corpus frequency of
+  at most two, and the rows they occur in.
+- Running statistics (count, mean, variance, minimum and maximum) of the
+  feature columns, to normalize or rescale features corpus-wide.
+
+Only the new rows are parsed and run through the feature pipeline. The
+global features of existing rows only change if the new rows contain one
+of their rare words; these rows are found with the rare word index and
+updated in place. Thus, the cost of an update is proportional to the
+size of the new data and the number of rare words it touches.
+"""
+import json
+import os
+
+import polars as pl
+
+from .checkpoint import (
+    hash_config,
+)
+from .configs.extractor_config import (
+    CONFIG_ALL,
+)
+from .extractor import (
+    Extractor,
+)
+from .features import (
+    GLOBAL_FEATURE_MAP,
+)
+from .lexical_richness import (
+    global_sichel_s_expr,
+)
+from .parallel import (
+    get_part_frequencies,
+    reduce_global_features,
+    split_global_features,
+)
+from .scaling import (
+    STATISTICS_SCHEMA,
+    FeatureScaler,
+    column_statistics,
+    merge_statistics,
+)
+from .surface import (
+    merge_frequencies,
+)
+
+# The highest corpus frequency counted by a global feature
+MAX_GLOBAL_FREQUENCY = 2
+
+class CorpusState:
+    """
+    The state of a corpus needed to extend its feature table with new
+    rows. See the module documentation for details.
+
+    Args:
+        config_hash (str): The hash of the extractor configuration.
+        n_rows (int): The number of rows of the feature table.
+        input_columns (list[str]): The columns of the input data.
+        frequencies (dict[str, pl.DataFrame]):
+            The corpus frequency tables by kind ('token' or 'lemma').
+        rare_words (dict[str, pl.DataFrame]):
+            The rare word index by kind, with the columns `kind`, 'row'
+            and 'count'.
+        statistics (pl.DataFrame):
+            The running statistics of the feature columns, with the
+            columns 'feature', 'count', 'mean', 'm2', 'min' and 'max'.
+    """
+    def __init__(self,
+                 config_hash: str,
+                 n_rows: int,
+                 input_columns: list[str],
+                 frequencies: dict[str, pl.DataFrame],
+                 rare_words: dict[str, pl.DataFrame],
+                 statistics: pl.DataFrame,
+                 ) -> None:
+        self.config_hash = config_hash
+        self.n_rows = n_rows
+        self.input_columns = input_columns
+        self.frequencies = frequencies
+        self.rare_words = rare_words
+        self.statistics = statistics
+
+    def save(self,
+             path: str,
+             ) -> None:
+        """
+        Saves the state to a directory.
+
+        Args:
+            path (str): The directory to save the state to.
+        """
+        os.makedirs(path, exist_ok=True)
+        for kind, table in self.frequencies.items():
+            table.write_parquet(os.path.join(path, f"{kind}_freqs.parquet"))
+        for kind, table in self.rare_words.items():
+            table.write_parquet(os.path.join(path, f"rare_{kind}s.parquet"))
+        self.statistics.write_parquet(os.path.join(path,
+                                                   "statistics.parquet"))
+        with open(os.path.join(path, "state.json"), "w") as f:
+            json.dump({
+                "config_hash": self.config_hash,
+                "n_rows": self.n_rows,
+                "input_columns": self.input_columns,
+                "kinds": list(self.frequencies),
+            }, f)
+
+    @classmethod
+    def load(cls,
+             path: str,
+             ) -> "CorpusState":
+        """
+        Loads a state saved with save.
+
+        Args:
+            path (str): The directory the state was saved to.
+
+        Returns:
+            state (CorpusState): The loaded state.
+        """
+        with open(os.path.join(path, "state.json")) as f:
+            meta = json.load(f)
+        return cls(
+            config_hash=meta["config_hash"],
+            n_rows=meta["n_rows"],
+            input_columns=meta["input_columns"],
+            frequencies={
+                kind: pl.read_parquet(
+                    os.path.join(path, f"{kind}_freqs.parquet"))
+                for kind in meta["kinds"]},
+            rare_words={
+                kind: pl.read_parquet(
+                    os.path.join(path, f"rare_{kind}s.parquet"))
+                for kind in meta["kinds"]},
+            statistics=pl.read_parquet(os.path.join(path,
+                                                    "statistics.parquet")),
+        )
+
+    def normalize(self,
+                  data: pl.DataFrame,
+                  features: list[str] | None = None,
+                  ) -> pl.DataFrame:
+        """
+        Normalizes features to a mean of 0 and a standard deviation of 1
+        with the corpus statistics.
+
+        Args:
+            data (pl.DataFrame): The feature table.
+            features (list[str] | None):
+                The features to normalize. Defaults to all features with
+                statistics.
+
+        Returns:
+            data (pl.DataFrame): The feature table with the normalized
+                features.
+        """
+        return FeatureScaler(statistics=self.__statistics(features)) \
+            .transform(data)
+
+    def rescale(self,
+                data: pl.DataFrame,
+                features: list[str] | None = None,
+                minimum: float = 0.0,
+                maximum: float = 1.0,
+                ) -> pl.DataFrame:
+        """
+        Rescales features to a range with the corpus minima and maxima.
+
+        Args:
+            data (pl.DataFrame): The feature table.
+            features (list[str] | None):
+                The features to rescale. Defaults to all features with
+                statistics.
+            minimum (float): The desired minimum. Defaults to 0.
+            maximum (float): The desired maximum. Defaults to 1.
+
+        Returns:
+            data (pl.DataFrame): The feature table with the rescaled
+                features.
+        """
+        return FeatureScaler(method="rescale",
+                             minimum=minimum,
+                             maximum=maximum,
+                             statistics=self.__statistics(features)) \
+            .transform(data)
+
+    def __statistics(self,
+                     features: list[str] | None = None,
+                     ) -> pl.DataFrame:
+        """
+        Helper function to get the statistics of the given features.
+        """
+        statistics = self.statistics
+        if features is not None:
+            statistics = statistics.filter(pl.col("feature").is_in(features))
+        return statistics
+
+def extract_incremental(data: pl.DataFrame,
+                        features: pl.DataFrame | None = None,
+                        state: CorpusState | None = None,
+                        config: dict[str, str] = CONFIG_ALL,
+                        **kwargs,
+                        ) -> tuple[pl.DataFrame, CorpusState]:
+    """
+    Extracts the features of new rows and appends them to a feature table.
+
+    For the first extraction, pass only the data; the returned feature
+    table and state are then passed to the next call together with the
+    new rows.
+
+    Args:
+        data (pl.DataFrame): The new rows, with the text data.
+        features (pl.DataFrame | None):
+            The previous feature table, as returned by the last call.
+        state (CorpusState | None):
+            The previous corpus state, as returned by the last call.
+        config (dict[str, str]):
+            The extractor configuration, see the Extractor class. Must be
+            the same for all calls.
+        **kwargs:
+            Additional configuration settings overriding the config,
+            e.g., backbone, language, model or text_column.
+
+    Returns:
+        features (pl.DataFrame):
+            The feature table with the new rows appended. Global features
+            of existing rows are updated. Helper columns are removed.
+            With the global Sichel's S, the number of types is kept, as
+            the global Sichel's S of existing rows is updated from it.
+        state (CorpusState):
+            The updated corpus state.
+    """
+    config = dict(config, **kwargs)
+    for key, value in CONFIG_ALL.items():
+        config.setdefault(key, value)
+    if (features is None) != (state is None):
+        raise ValueError("Pass both the previous features and the corpus "
+                         "state, or neither of them.")
+    if state is not None:
+        if state.config_hash != hash_config(config):
+            raise ValueError("The corpus state belongs to a different "
+                             "configuration.")
+        if state.n_rows != features.height:
+            raise ValueError(f"The corpus state has {state.n_rows} rows, "
+                             f"but the features have {features.height}.")
+    else:
+        state = CorpusState(config_hash=hash_config(config),
+                            n_rows=0,
+                            input_columns=data.columns,
+                            frequencies={},
+                            rare_words={},
+                            statistics=pl.DataFrame(
+                                schema=STATISTICS_SCHEMA))
+
+    local_features, global_features = split_global_features(
+        config["features"])
+    extractor = Extractor(data,
+                          config=dict(config,
+                                      features=local_features,
+                                      remove_constant_cols=False))
+    extractor.extract_features()
+    new, part_frequencies = get_part_frequencies(
+        extractor.data, global_features, backbone=config["backbone"])
+
+    frequencies = {}
+    rare_words = {}
+    for kind, part in part_frequencies.items():
+        previous = state.frequencies.get(
+            kind, pl.DataFrame(schema={kind: pl.String,
+                                       "frequency": pl.UInt32}))
+        frequencies[kind] = merge_frequencies([previous, part],
+                                              word_column=kind)
+        if features is not None:
+            features = _update_global_features(
+                features,
+                state.rare_words[kind],
+                part,
+                frequencies[kind],
+                kind=kind)
+        rare_words[kind] = _update_rare_words(
+            state.rare_words.get(kind),
+            new,
+            frequencies[kind],
+            kind=kind,
+            offset=state.n_rows)
+
+    new = reduce_global_features(new,
+                                 global_features,
+                                 [frequencies],
+                                 backbone=config["backbone"],
+                                 text_column=config["text_column"],
+                                 language=config["language"])
+    new = new.drop([column for column in extractor.helper_cols
+                    if column in new.columns])
+
+    feature_columns = [column for column in new.columns
+                       if column not in state.input_columns and
+                       new[column].dtype.is_numeric()]
+    global_columns = [column for column in feature_columns
+                      if column in GLOBAL_FEATURE_MAP]
+    out = new if features is None else \
+        pl.concat([features, new], how="diagonal_relaxed")
+
+    # Global features of existing rows may have changed, so their
+    # statistics are computed on all rows
+    statistics = merge_statistics(
+        state.statistics.filter(~pl.col("feature").is_in(global_columns)),
+        column_statistics(new, [column for column in feature_columns
+                                if column not in global_columns]))
+    statistics = pl.concat([statistics,
+                            column_statistics(out, global_columns)])
+
+    state = CorpusState(config_hash=state.config_hash,
+                        n_rows=out.height,
+                        input_columns=state.input_columns,
+                        frequencies=frequencies,
+                        rare_words=rare_words,
+                        statistics=statistics)
+
+    return out, state
+
+def _update_global_features(features: pl.DataFrame,
+                            rare_words: pl.DataFrame,
+                            part: pl.DataFrame,
+                            frequencies: pl.DataFrame,
+                            kind: str = 'token',
+                            ) -> pl.DataFrame:
+    """
+    Updates the global features of the existing rows that contain a rare
+    word that occurs in the new rows.
+
+    Args:
+        features (pl.DataFrame): The previous feature table.
+        rare_words (pl.DataFrame): The previous rare word index.
+        part (pl.DataFrame): The frequency table of the new rows.
+        frequencies (pl.DataFrame): The updated corpus frequency table.
+        kind (str): The kind of words, either 'token' or 'lemma'.
+
+    Returns:
+        features (pl.DataFrame): The feature table with updated global
+            features.
+    """
+    max_frequencies = {
+        f"n_global_{kind}_hapax_legomena": 1,
+        f"n_global_{kind}_hapax_dislegomena": 2,
+    }
+    columns = {column: max_frequency
+               for column, max_frequency in max_frequencies.items()
+               if column in features.columns}
+    if not columns:
+        return features
+
+    # Occurrences of rare words whose corpus frequency has increased
+    changed = (
+        rare_words
+        .join(part.rename({"frequency": "added"}), on=kind, how="inner")
+        .join(frequencies, on=kind, how="inner")
+        .with_columns((pl.col("frequency") - pl.col("added"))
+                      .alias("previous"))
+    )
+    if changed.height == 0:
+        return features
+
+    # A word stops counting once its frequency exceeds the maximum
+    deltas = changed.group_by("row").agg([
+        (pl.col("count").cast(pl.Int64) *
+         ((pl.col("previous") <= max_frequency) &
+          (pl.col("frequency") > max_frequency)).cast(pl.Int64)
+         ).sum().alias(column)
+        for column, max_frequency in columns.items()
+    ]).sort("row")
+    rows = deltas["row"]
+
+    updates = []
+    for column in columns:
+        values = features[column].gather(rows).cast(pl.Int64) - \
+            deltas[column]
+        updates.append(features[column].scatter(
+            rows, values.cast(features[column].dtype)))
+    features = features.with_columns(updates)
+
+    if kind == "token" and "global_sichel_s" in features.columns:
+        values = features.select(global_sichel_s_expr())[
+            "global_sichel_s"].gather(rows)
+        features = features.with_columns(
+            features["global_sichel_s"].scatter(rows, values))
+
+    return features
+
+def _update_rare_words(rare_words: pl.DataFrame | None,
+                       new: pl.DataFrame,
+                       frequencies: pl.DataFrame,
+                       kind: str = 'token',
+                       offset: int = 0,
+                       ) -> pl.DataFrame:
+    """
+    Adds the rare words of the new rows to the rare word index and
+    removes the words that are no longer rare.
+
+    Args:
+        rare_words (pl.DataFrame | None): The previous rare word index.
+        new (pl.DataFrame): The new rows, with the tokens or lemmas.
+        frequencies (pl.DataFrame): The updated corpus frequency table.
+        kind (str): The kind of words, either 'token' or 'lemma'.
+        offset (int): The row number of the first new row.
+
+    Returns:
+        rare_words (pl.DataFrame): The updated rare word index.
+    """
+    occurrences = (
+        new
+        .select(pl.col(f"{kind}s").alias(kind))
+        .with_row_index("row", offset=offset)
+        .explode(kind, empty_as_null=True)
+        .drop_nulls(kind)
+        .group_by([kind, "row"])
+        .len(name="count")
+        .select([kind, "row", "count"])
+    )
+    if rare_words is not None:
+        occurrences = pl.concat([rare_words, occurrences])
+
+    return occurrences.join(
+        frequencies.filter(pl.col("frequency") <= MAX_GLOBAL_FREQUENCY),
+        on=kind,
+        how="semi",
+    ).sort(["row", kind])
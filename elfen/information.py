@@ -11,12 +11,33 @@ The information-theoretic metrics implemented in this module are:
     The Shannon entropy of the text data.
 """
 import bz2
+from concurrent.futures import ThreadPoolExecutor
+import lzma
+import zlib
 
 import numpy as np
 import polars as pl
 
+# Compression functions taking the encoded text and a compression level.
+# All of them release the GIL while compressing, so they can be run in a
+# thread pool.
+COMPRESSORS = {
+    "bz2": lambda text, level: bz2.compress(text, compresslevel=level),
+    "zlib": lambda text, level: zlib.compress(text, level),
+    "lzma": lambda text, level: lzma.compress(text, preset=level),
+}
+
+DEFAULT_COMPRESSION_LEVELS = {
+    "bz2": 9,
+    "zlib": 6,
+    "lzma": 6,
+}
+
 def get_compressibility(data: pl.DataFrame,
                         text_column: str = 'text',
+                        codec: str = 'bz2',
+                        level: int | None = None,
+                        n_threads: int | None = None,
                         **kwargs: dict[str, str],
                         ) -> pl.DataFrame:
     """
@@ -26,9 +47,21 @@ def get_compressibility(data: pl.DataFrame,
     to the length of the original text. This is used as a proxy for the
     Kolmogorov complexity of the text.
 
+    The texts are compressed in a thread pool, as the compression codecs
+    release the GIL.
+
     Args:
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         text_column (str): The name of the column containing the text data.
+        codec (str):
+            The compression codec to use. Either 'bz2', 'zlib' or 'lzma'.
+            Defaults to 'bz2'.
+        level (int | None):
+            The compression level. Defaults to the default level of the
+            codec (9 for bz2, 6 for zlib and lzma).
+        n_threads (int | None):
+            The number of threads to compress with. Defaults to the size
+            of the Polars thread pool.
 
     Returns:
         data (pl.DataFrame):
@@ -36,16 +69,41 @@ def get_compressibility(data: pl.DataFrame,
             data. The compressibility is stored in a new column named
             'compressibility'.
     """
-    data = data.with_columns(
-        pl.col(text_column).map_elements(
-            lambda x: len(bz2.compress(x.encode('utf-8'))) / len(x) if \
+    if codec not in COMPRESSORS:
+        raise ValueError(f"Unsupported codec '{codec}'. "
+                         f"Supported codecs are {list(COMPRESSORS)}.")
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[codec]
+    if n_threads is None:
+        n_threads = pl.thread_pool_size()
+
+    def compressibility(texts: list[str]) -> list[float]:
+        """
+        Calculate the compressibility of a chunk of texts.
+        """
+        compress = COMPRESSORS[codec]
+        return [
+            len(compress(text.encode('utf-8'), level)) / len(text) if \
                 # Handle empty strings; lower bound is 0 which maps to
                 # basically no information, no complexity
-                len(x) > 0 else 0,
-            return_dtype=pl.Float64
-            ).alias("compressibility"),
+                len(text) > 0 else 0.0
+            for text in texts
+        ]
+
+    texts = data[text_column].to_list()
+    # Contiguous chunks keep the per-task overhead low and the order of
+    # the results intact
+    chunk_size = max(1, -(-len(texts) // max(1, n_threads)))
+    chunks = [texts[i:i + chunk_size]
+              for i in range(0, len(texts), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max(1, n_threads)) as executor:
+        results = [value for chunk in executor.map(compressibility, chunks)
+                   for value in chunk]
+
+    data = data.with_columns(
+        pl.Series("compressibility", results, dtype=pl.Float64),
     )
-    
+
     return data
 
 def get_entropy(data: pl.DataFrame,
@@ -56,6 +114,7 @@ def get_entropy(data: pl.DataFrame,
     Calculates the Shannon entropy of the texts in the text column.
 
     The Shannon entropy is a measure of the uncertainty in a random variable.
+    The character distribution of each text is computed natively in Polars.
 
     Args:
         data (pl.DataFrame): A Polars DataFrame containing the text data.
@@ -68,20 +127,34 @@ def get_entropy(data: pl.DataFrame,
             'entropy'.
     """
     data = data.with_columns(
-        pl.col(text_column).map_elements(
-            entropy,
-            return_dtype=pl.Float64
-            ).alias("entropy"),
+        entropy_expr(text_column=text_column),
     )
 
     return data
 
+def entropy_expr(text_column: str = 'text',
+                 **kwargs: dict[str, str],
+                 ) -> pl.Expr:
+    """
+    Expression for the Shannon entropy of the characters of each text,
+    see get_entropy.
+    """
+    counts = pl.col(text_column).str.split("").list.eval(
+        pl.element().value_counts().struct.field("count").cast(pl.Float64)
+    )
+    prob = pl.element() / pl.element().sum()
+
+    return counts.list.eval(-(prob * prob.log(2)).sum()).list.first(). \
+        fill_null(0.0).alias("entropy")
+
 def entropy(string: str,
             **kwargs: dict[str, str],
             ) -> float:
     """
     Calculate the Shannon entropy of a string.
-    Helper function for get_entropy.
+
+    The characters are counted on the UTF-32 code points of the string,
+    which avoids creating one Python string per character.
 
     Args:
         string( str): The input string.
@@ -89,11 +162,12 @@ def entropy(string: str,
     Returns:
         entropy (float): The Shannon entropy of the input string.
     """
-    chars = np.array(list(string))
+    if len(string) == 0:
+        return 0.0
+    codepoints = np.frombuffer(string.encode('utf-32-le'), dtype=np.uint32)
 
-    _, counts = np.unique(chars, return_counts=True)
+    _, counts = np.unique(codepoints, return_counts=True)
     prob = counts / len(string)
     entropy = -np.sum(prob * np.log2(prob))
-    
-    return entropy
 
+    return entropy
@@ -61,12 +61,11 @@ The lexical richness metrics implemented in this module are:
 - Simpson's D
 - Herdan's Vm
 """
-from collections import Counter
 import warnings
 
 import numpy as np
 import polars as pl
-from scipy.stats import hypergeom
+from scipy.special import gammaln
 
 from .surface import (
     get_num_tokens,
@@ -80,6 +79,7 @@ from .pos import (
     get_num_lexical_tokens,
 )
 from .preprocess import (
+    get_lemmas,
     get_tokens,
 )
 from .util import (
@@ -112,8 +112,7 @@ def get_lemma_token_ratio(data: pl.DataFrame,
         data = get_num_lemmas(data, backbone=backbone)
     
     data = data.with_columns(
-        (pl.col("n_lemmas") / pl.col("n_tokens")
-         ).alias("lemma_token_ratio"),
+        lemma_token_ratio_expr(),
     )
     # Warn if there are any NaN values in the lemma/token ratio column
     if data.filter(pl.col("lemma_token_ratio").is_nan()).height > 0:
@@ -147,7 +146,7 @@ def get_ttr(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (pl.col("n_types") / pl.col("n_tokens")).alias("ttr"),
+        ttr_expr(),
     )
 
     # Warn if there are any NaN values in the type-token ratio column
@@ -181,9 +180,7 @@ def get_rttr(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (
-            pl.col("n_types") / pl.col("n_tokens") **0.5
-         ).alias("rttr"),
+        rttr_expr(),
     )
 
     # Warn if there are any NaN values in the root type-token ratio column
@@ -217,9 +214,7 @@ def get_cttr(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (
-            pl.col("n_types") / ((2 * pl.col("n_tokens")) ** 0.5)
-        ).alias("cttr"),
+        cttr_expr(),
     )
 
     # Warn if there are any NaN values in the corrected type-token ratio column
@@ -255,11 +250,7 @@ def get_herdan_c(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (
-            pl.col("n_types").log() / pl.col("n_tokens").log()
-         ).fill_nan(1).alias("herdan_c")
-         # convention to fill NaNs with 1 as log(1) = 0 and 
-         # division by 0 is not defined.
+        herdan_c_expr(),
     )
 
     return data
@@ -292,10 +283,7 @@ def get_summer_index(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (pl.col("n_types").log().log() / pl.col("n_tokens").log().log()
-         ).fill_nan(1).alias("summer_index")
-         # convention to fill NaNs with 1 as log(1) = 0 and
-         # division by 0 is not defined.
+        summer_index_expr(),
     )
 
     return data
@@ -328,11 +316,7 @@ def get_dugast_u(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (pl.col("n_tokens").log()**2 / (pl.col("n_tokens").log() - \
-                                       pl.col("n_types").log())
-         ).fill_nan(1).alias("dugast_u")
-         # convention to fill NaNs with 1 as log(1) = 0 and
-         # division by 0 is not defined.
+        dugast_u_expr(),
     )
 
     return data
@@ -363,11 +347,7 @@ def get_maas_index(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        ((pl.col("n_tokens") - pl.col("n_types")) / \
-            pl.col("n_types").log()**2 
-         ).fill_nan(1).alias("maas_index")
-         # convention to fill NaNs with 1 as log(1) = 0 and
-         # division by 0 is not defined.
+        maas_index_expr(),
     )
 
     return data
@@ -391,32 +371,18 @@ def get_n_hapax_legomena(data: pl.DataFrame,
             the text data. The number of hapax legomena is stored in a new
             column named 'n_hapax_legomena'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-             pl.col("nlp").map_elements(lambda x: np.sum(
-                  np.unique(np.array([token.text for token in x]),
-                            return_counts=True)[1] == 1),
-                            return_dtype=pl.UInt32).alias("n_hapax_legomena")
-        )
+    if 'token_freqs' not in data.columns:
+        data = get_token_freqs(data, backbone=backbone)
 
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: np.sum(
-                np.unique(np.array([token.text 
-                                    for sent 
-                                    in x.sentences 
-                                    for token in sent.tokens]),
-                          return_counts=True)[1] == 1),
-                          return_dtype=pl.UInt32).alias("n_hapax_legomena")
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    data = data.with_columns(
+        n_hapax_legomena_expr(),
+    )
     
     return data
 
 def get_n_global_token_hapax_legomena(data: pl.DataFrame,
                                       backbone: str = 'spacy',
+                                      frequencies: pl.DataFrame | None = None,
                                       **kwargs: dict[str, str],
                                       ) -> pl.DataFrame:
     """
@@ -427,6 +393,10 @@ def get_n_global_token_hapax_legomena(data: pl.DataFrame,
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
                 Either 'spacy' or 'stanza'.
+        frequencies (pl.DataFrame | None):
+            The corpus frequency table of the tokens, see
+            get_global_token_frequencies. Defaults to the frequencies
+            in the data, i.e., the data is the corpus.
     
     Returns:
         data (pl.DataFrame):
@@ -434,30 +404,23 @@ def get_n_global_token_hapax_legomena(data: pl.DataFrame,
             legomena in the text data. The number of global hapax legomena
             is stored in a new column named 'n_global_hapax_legomena'.
     """
-    token_freqs = get_global_token_frequencies(data, backbone=backbone)
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token for token in x if token_freqs[token.text] == 1]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_token_hapax_legomena")
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token for sent in x.sentences for token in sent.tokens
-                 if token_freqs[token.text] == 1]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_token_hapax_legomena")
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'tokens' not in data.columns:
+        data = get_tokens(data, backbone=backbone)
+    if frequencies is None:
+        frequencies = get_global_token_frequencies(data, backbone=backbone)
+
+    data = _get_n_global(data,
+                         column="tokens",
+                         frequencies=frequencies,
+                         word_column="token",
+                         max_frequency=1,
+                         new_col_name="n_global_token_hapax_legomena")
 
     return data
 
 def get_n_global_lemma_hapax_legomena(data: pl.DataFrame,
                                       backbone: str = 'spacy',
+                                      frequencies: pl.DataFrame | None = None,
                                       **kwargs: dict[str, str],
                                       ) -> pl.DataFrame:
     """
@@ -468,6 +431,10 @@ def get_n_global_lemma_hapax_legomena(data: pl.DataFrame,
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
                 Either 'spacy' or 'stanza'.
+        frequencies (pl.DataFrame | None):
+            The corpus frequency table of the lemmas, see
+            get_global_lemma_frequencies. Defaults to the frequencies
+            in the data, i.e., the data is the corpus.
 
     Returns:
         data (pl.DataFrame):
@@ -475,27 +442,17 @@ def get_n_global_lemma_hapax_legomena(data: pl.DataFrame,
             legomena in the text data. The number of global hapax legomena
             is stored in a new column named 'n_global_lemma_hapax_legomena'.
     """
-    lemma_freqs = get_global_lemma_frequencies(data, backbone=backbone)
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token.lemma_ for token in x if 
-                 lemma_freqs[token.lemma_] == 1]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_lemma_hapax_legomena")
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token.lemma for sent in x.sentences for 
-                 token in sent.tokens
-                 if lemma_freqs[token.lemma] == 1]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_lemma_hapax_legomena")
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'lemmas' not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+    if frequencies is None:
+        frequencies = get_global_lemma_frequencies(data, backbone=backbone)
+
+    data = _get_n_global(data,
+                         column="lemmas",
+                         frequencies=frequencies,
+                         word_column="lemma",
+                         max_frequency=1,
+                         new_col_name="n_global_lemma_hapax_legomena")
 
     return data
 
@@ -518,34 +475,18 @@ def get_n_hapax_dislegomena(data: pl.DataFrame,
             in the text data. The number of hapax dislegomena is stored in
             a new column named 'n_hapax_dislegomena'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-             pl.col("nlp").map_elements(lambda x: np.sum(
-                  np.unique(np.array([token.text for token in x]),
-                            return_counts=True)[1] <= 2),
-                            return_dtype=pl.UInt32). \
-                                alias("n_hapax_dislegomena")
-        )
+    if 'token_freqs' not in data.columns:
+        data = get_token_freqs(data, backbone=backbone)
 
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: np.sum(
-                np.unique(np.array([token.text 
-                                    for sent 
-                                    in x.sentences 
-                                    for token in sent.tokens]),
-                          return_counts=True)[1] <= 2),
-                          return_dtype=pl.UInt32). \
-                            alias("n_hapax_dislegomena")
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    data = data.with_columns(
+        n_hapax_dislegomena_expr(),
+    )
     
     return data
 
 def get_n_global_token_hapax_dislegomena(data: pl.DataFrame,
                                        backbone: str = 'spacy',
+                                       frequencies: pl.DataFrame | None = None,
                                        **kwargs: dict[str, str],
                                        ) -> pl.DataFrame:
     """
@@ -556,6 +497,10 @@ def get_n_global_token_hapax_dislegomena(data: pl.DataFrame,
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
                         Either 'spacy' or 'stanza'.
+        frequencies (pl.DataFrame | None):
+            The corpus frequency table of the tokens, see
+            get_global_token_frequencies. Defaults to the frequencies
+            in the data, i.e., the data is the corpus.
 
     Returns:
         data (pl.DataFrame):
@@ -564,31 +509,23 @@ def get_n_global_token_hapax_dislegomena(data: pl.DataFrame,
             dislegomena is stored in a new column named
             'n_global_token_hapax_dislegomena'.
     """
-    token_freqs = get_global_token_frequencies(data, backbone=backbone)
+    if 'tokens' not in data.columns:
+        data = get_tokens(data, backbone=backbone)
+    if frequencies is None:
+        frequencies = get_global_token_frequencies(data, backbone=backbone)
 
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token for token in x if token_freqs[token.text] <= 2]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_token_hapax_dislegomena")
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token for sent in x.sentences for token in sent.tokens
-                 if token_freqs[token.text] <= 2]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_token_hapax_dislegomena")
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    data = _get_n_global(data,
+                         column="tokens",
+                         frequencies=frequencies,
+                         word_column="token",
+                         max_frequency=2,
+                         new_col_name="n_global_token_hapax_dislegomena")
 
     return data
 
 def get_n_global_lemma_hapax_dislegomena(data: pl.DataFrame,
                                        backbone: str = 'spacy',
+                                       frequencies: pl.DataFrame | None = None,
                                        **kwargs: dict[str, str],
                                        ) -> pl.DataFrame:
     """
@@ -599,6 +536,10 @@ def get_n_global_lemma_hapax_dislegomena(data: pl.DataFrame,
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
                         Either 'spacy' or 'stanza'.
+        frequencies (pl.DataFrame | None):
+            The corpus frequency table of the lemmas, see
+            get_global_lemma_frequencies. Defaults to the frequencies
+            in the data, i.e., the data is the corpus.
 
     Returns:
         data (pl.DataFrame):
@@ -607,28 +548,63 @@ def get_n_global_lemma_hapax_dislegomena(data: pl.DataFrame,
             dislegomena is stored in a new column named
             'n_global_lemma_hapax_dislegomena'.
     """
-    lemma_freqs = get_global_lemma_frequencies(data, backbone=backbone)
+    if 'lemmas' not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+    if frequencies is None:
+        frequencies = get_global_lemma_frequencies(data, backbone=backbone)
+
+    data = _get_n_global(data,
+                         column="lemmas",
+                         frequencies=frequencies,
+                         word_column="lemma",
+                         max_frequency=2,
+                         new_col_name="n_global_lemma_hapax_dislegomena")
 
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token.lemma_ for token in x if 
-                 lemma_freqs[token.lemma_] <= 2]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_lemma_hapax_dislegomena")
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(
-                [token.lemma for sent in x.sentences for 
-                 token in sent.tokens
-                 if lemma_freqs[token.lemma] <= 2]),
-                return_dtype=pl.UInt32). \
-                    alias("n_global_lemma_hapax_dislegomena")
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    return data
+
+def _get_n_global(data: pl.DataFrame,
+                  column: str,
+                  frequencies: pl.DataFrame,
+                  word_column: str,
+                  max_frequency: int,
+                  new_col_name: str,
+                  ) -> pl.DataFrame:
+    """
+    Counts the words per text whose corpus frequency is at most
+    `max_frequency` by joining the exploded words against the corpus
+    frequency table.
+    Helper function for the global hapax legomena/dislegomena features.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the list column.
+        column (str): The name of the list column, e.g. 'tokens'.
+        frequencies (pl.DataFrame):
+            The corpus frequency table with the columns `word_column`
+            and 'frequency'.
+        word_column (str): The name of the word column in `frequencies`.
+        max_frequency (int): The maximum corpus frequency to count.
+        new_col_name (str): The name of the new column.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the counts stored in `new_col_name`.
+    """
+    counts = (
+        data
+        .select(pl.col(column).alias(word_column))
+        .with_row_index("__row_idx")
+        # Texts without words keep a (null) row and are counted as 0
+        .explode(word_column, empty_as_null=True)
+        .join(frequencies, on=word_column, how="left")
+        .group_by("__row_idx")
+        .agg((pl.col("frequency") <= max_frequency).sum().alias(
+            new_col_name))
+        .sort("__row_idx")
+    )
+
+    data = data.with_columns(
+        counts[new_col_name].cast(pl.UInt32)
+    )
 
     return data
 
@@ -656,8 +632,7 @@ def get_sichel_s(data: pl.DataFrame,
         data = get_n_hapax_dislegomena(data, backbone=backbone)
 
     data = data.with_columns(
-        (pl.col("n_hapax_dislegomena") / pl.col("n_types")
-         ).alias("sichel_s"),
+        sichel_s_expr(),
     )
 
     # Warn if there are any NaN values in the Sichel's S column
@@ -668,6 +643,7 @@ def get_sichel_s(data: pl.DataFrame,
 
 def get_global_sichel_s(data: pl.DataFrame,
                         backbone: str = 'spacy',
+                        frequencies: pl.DataFrame | None = None,
                         **kwargs: dict[str, str],
                         ) -> pl.DataFrame:
     """
@@ -678,6 +654,10 @@ def get_global_sichel_s(data: pl.DataFrame,
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
                         Either 'spacy' or 'stanza'.
+        frequencies (pl.DataFrame | None):
+            The corpus frequency table of the tokens, see
+            get_global_token_frequencies. Defaults to the frequencies
+            in the data, i.e., the data is the corpus.
     
     Returns:
         data (pl.DataFrame):
@@ -689,11 +669,11 @@ def get_global_sichel_s(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     if 'n_global_token_hapax_dislegomena' not in data.columns:
         data = get_n_global_token_hapax_dislegomena(data,
-                                                    backbone=backbone)
+                                                    backbone=backbone,
+                                                    frequencies=frequencies)
 
     data = data.with_columns(
-        (pl.col("n_global_token_hapax_dislegomena") / pl.col("n_types")
-         ).alias("global_sichel_s"),
+        global_sichel_s_expr(),
     )
 
     # Warn if there are any NaN values in the global Sichel's S column
@@ -728,8 +708,7 @@ def get_lexical_density(data: pl.DataFrame,
         data = get_num_lexical_tokens(data, backbone=backbone)
     
     data = data.with_columns(
-        (pl.col("n_lexical_tokens") / pl.col("n_tokens")
-         ).alias("lexical_density"),
+        lexical_density_expr(),
     )
 
     # Warn if there are any NaN values in the lexical density column
@@ -763,8 +742,7 @@ def get_giroud_index(data: pl.DataFrame,
         data = get_num_types(data, backbone=backbone)
     
     data = data.with_columns(
-        (pl.col("n_types") / pl.col("n_tokens").sqrt()
-         ).alias("giroud_index"),
+        giroud_index_expr(),
     )
 
     # Warn if there are any NaN values in the Giroud's index column
@@ -853,6 +831,10 @@ def get_hdd(data: pl.DataFrame,
     need to be adjusted for most short texts. A number of draws that is
     too large will result in NaN values.
 
+    The hypergeometric probabilities are computed for all texts at once
+    over the (text, token frequency) pairs of the corpus. Each unique
+    (N_tokens, N_types, frequency) triple is only evaluated once.
+
     Args:
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
@@ -864,32 +846,94 @@ def get_hdd(data: pl.DataFrame,
             A Polars DataFrame containing the HD-D of the text data. 
             The HD-D is stored in a new column named 'hdd'.
     """
-    def hdd(tokens: list[str],
-            draws: int = 42,
-            ) -> float:
-        """
-        Calculate the HDD of a text.
-        """
-        freqs = Counter(tokens)
-        n_types = len(freqs)
-        n_tokens = len(tokens)
-        hdd = 0.0
+    if 'token_freqs' not in data.columns:
+        data = get_token_freqs(data, backbone=backbone)
+
+    # One row per (text, type) pair holding the frequency of the type
+    # together with the number of tokens and types of the text.
+    freqs = (
+        data
+        .select(_token_counts().alias("__freq"))
+        .with_row_index("__row_idx")
+        .with_columns(
+            pl.col("__freq").list.sum().alias("__n_tokens"),
+            pl.col("__freq").list.len().alias("__n_types"),
+        )
+        .filter(pl.col("__n_types") > 0)
+        .explode("__freq", empty_as_null=True)
+    )
+
+    triples = np.column_stack([
+        freqs["__n_tokens"].to_numpy(),
+        freqs["__n_types"].to_numpy(),
+        freqs["__freq"].to_numpy(),
+    ]).astype(np.int64)
+    if len(triples) > 0:
+        unique_triples, inverse = np.unique(triples, axis=0,
+                                            return_inverse=True)
+        pmf = _hypergeom_pmf(k=unique_triples[:, 2],
+                             population=unique_triples[:, 0],
+                             successes=unique_triples[:, 1],
+                             draws=draws)[inverse.reshape(-1)]
+    else:
+        pmf = np.zeros(0, dtype=np.float64)
+
+    # Texts without tokens have no (text, type) pairs and get 0.0
+    hdd = np.bincount(freqs["__row_idx"].to_numpy(),
+                      weights=pmf,
+                      minlength=data.height)
 
-        for freq in freqs.values():
-            hdd += hypergeom.pmf(freq, n_tokens, n_types, draws)
-        
-        return hdd
-    
-    if 'tokens' not in data.columns:
-        data = get_tokens(data, backbone=backbone)
-    
     data = data.with_columns(
-        pl.col("tokens").map_elements(lambda x: hdd(x, draws=draws),
-                                      return_dtype=pl.Float64).alias("hdd")
+        pl.Series("hdd", hdd, dtype=pl.Float64)
     )
 
     return data
 
+def _hypergeom_pmf(k: np.ndarray,
+                   population: np.ndarray,
+                   successes: np.ndarray,
+                   draws: int,
+                   ) -> np.ndarray:
+    """
+    Vectorized hypergeometric probability mass function, computed in log
+    space with the log-gamma function. Equivalent to
+    ``scipy.stats.hypergeom.pmf(k, population, successes, draws)``,
+    including NaN values for more draws than the population size.
+    Helper function for get_hdd.
+
+    Args:
+        k (np.ndarray): The number of observed successes.
+        population (np.ndarray): The population size.
+        successes (np.ndarray): The number of successes in the population.
+        draws (int): The number of draws.
+
+    Returns:
+        pmf (np.ndarray): The probability of observing k successes.
+    """
+    k = k.astype(np.float64)
+    population = population.astype(np.float64)
+    successes = successes.astype(np.float64)
+    failures = population - successes
+
+    in_support = (k >= np.maximum(0, draws - failures)) & \
+        (k <= np.minimum(successes, draws))
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        log_pmf = _log_binom(successes, k) + \
+            _log_binom(failures, draws - k) - \
+            _log_binom(population, draws)
+        pmf = np.where(in_support, np.exp(log_pmf), 0.0)
+
+    return np.where(draws > population, np.nan, pmf)
+
+def _log_binom(n: np.ndarray,
+               k: np.ndarray,
+               ) -> np.ndarray:
+    """
+    Logarithm of the binomial coefficient n choose k.
+    Helper function for _hypergeom_pmf.
+    """
+    return gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1)
+
 def get_mattr(data: pl.DataFrame,
               backbone: str = 'spacy',
               window_size: int = 5,
@@ -1023,6 +1067,10 @@ def get_yule_k(data: pl.DataFrame,
     K = 10^4 * (Σ(V(i,N) * (i/n)^2) - n) / n^2
     = 10^4 * ((Σ(V(i,N) * (i^2/n^4)) - (1/n))
 
+    Since Σ(V(i,N) * i^2) equals the sum of the squared token
+    frequencies, the inner sum is computed directly on the token
+    frequencies of each text.
+
     Args:
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
@@ -1032,21 +1080,6 @@ def get_yule_k(data: pl.DataFrame,
             A Polars DataFrame containing Yule's K of the text data.
             Yule's K is stored in a new column named 'yule_k'.
     """
-    def inner_sum(x: dict[str, int]) -> float:
-        """
-        Calculate the inner sum of the Yule's K formula, i.e.:
-        (Σ(V(i,N) * (i^2/n^4))
-        """
-        counts = Counter(x.values())
-        # gathering n from counts to streamline the calculation
-        n = sum(counts.values())
-        n_power_4 = n ** 4  # Precompute to avoid redundant calculations
-
-        inner = sum(count * (i ** 2 / n_power_4) for i, count in \
-                    counts.items())
-
-        return inner
-    
     # get the number of tokens
     if 'n_tokens' not in data.columns:
         data = get_num_tokens(data, backbone=backbone)
@@ -1055,10 +1088,7 @@ def get_yule_k(data: pl.DataFrame,
         data = get_token_freqs(data, backbone=backbone)
 
     data = data.with_columns(
-        (pl.lit(10**4) * \
-        pl.col("token_freqs").map_elements(lambda x: inner_sum(x),
-                                           return_dtype=pl.Float64) - \
-        (1 / pl.col("n_tokens"))).alias("yule_k")
+        yule_k_expr(),
     )
 
     # Warn if there are any -inf values in the Yule's K column
@@ -1088,31 +1118,11 @@ def get_simpsons_d(data: pl.DataFrame,
             A Polars DataFrame containing Simpson's D of the text data.
             Simpson's D is stored in a new column named 'simpsons_d'.
     """
-    def simpsons_d(x: dict[str, int]) -> float:
-        """
-        Calculate the Simpson's D of a text.
-        """
-        counts = Counter(x.values())
-        n = sum(counts.values())
-        if n > 1:
-            n_inv = 1 / n  # Precompute 1 / n
-            n_minus_1_inv = 1 / (n - 1)  # Precompute 1 / (n - 1)
-
-            d = sum(count * i * n_inv * (i - 1) * n_minus_1_inv for \
-                    i, count in counts.items())
-
-            return d
-        # if there is only one token or none, we apply the convention
-        # that the Simpson's D is 0.0 as there is no diversity in the text
-        else:
-            return 0.0
     if 'token_freqs' not in data.columns:
         data = get_token_freqs(data, backbone=backbone)
-    
+
     data = data.with_columns(
-        pl.col("token_freqs").map_elements(lambda x: simpsons_d(x),
-                                           return_dtype=pl.Float64). \
-                                            alias("simpsons_d")
+        simpsons_d_expr(),
     )
 
     return data
@@ -1151,9 +1161,7 @@ def get_herdan_v(data: pl.DataFrame,
         data = get_yule_k(data, backbone=backbone)
 
     data = data.with_columns(
-        (pl.col("yule_k") + (1 / pl.col("n_tokens")) - \
-         (1 / pl.col("n_types")).sqrt()
-        ).alias("herdan_v")
+        herdan_v_expr(),
     )
 
     # Warn if there are any NaN values in the Herdan's V column
@@ -1162,3 +1170,159 @@ def get_herdan_v(data: pl.DataFrame,
 
     return data
 
+def lemma_token_ratio_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the lemma/token ratio, see get_lemma_token_ratio.
+    """
+    return (pl.col("n_lemmas") / pl.col("n_tokens")
+            ).alias("lemma_token_ratio")
+
+def ttr_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the type-token ratio, see get_ttr.
+    """
+    return (pl.col("n_types") / pl.col("n_tokens")).alias("ttr")
+
+def rttr_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the root type-token ratio, see get_rttr.
+    """
+    return (pl.col("n_types") / pl.col("n_tokens") ** 0.5).alias("rttr")
+
+def cttr_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the corrected type-token ratio, see get_cttr.
+    """
+    return (pl.col("n_types") / ((2 * pl.col("n_tokens")) ** 0.5)
+            ).alias("cttr")
+
+def herdan_c_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Herdan's C, see get_herdan_c.
+    """
+    # convention to fill NaNs with 1 as log(1) = 0 and
+    # division by 0 is not defined.
+    return (pl.col("n_types").log() / pl.col("n_tokens").log()
+            ).fill_nan(1).alias("herdan_c")
+
+def summer_index_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Summer's TTR, see get_summer_index.
+    """
+    # convention to fill NaNs with 1 as log(1) = 0 and
+    # division by 0 is not defined.
+    return (pl.col("n_types").log().log() / pl.col("n_tokens").log().log()
+            ).fill_nan(1).alias("summer_index")
+
+def dugast_u_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Dugast's Uber index, see get_dugast_u.
+    """
+    # convention to fill NaNs with 1 as log(1) = 0 and
+    # division by 0 is not defined.
+    return (pl.col("n_tokens").log()**2 / (pl.col("n_tokens").log() - \
+                                          pl.col("n_types").log())
+            ).fill_nan(1).alias("dugast_u")
+
+def maas_index_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Maas' TTR, see get_maas_index.
+    """
+    # convention to fill NaNs with 1 as log(1) = 0 and
+    # division by 0 is not defined.
+    return ((pl.col("n_tokens") - pl.col("n_types")) / \
+            pl.col("n_types").log()**2
+            ).fill_nan(1).alias("maas_index")
+
+def n_hapax_legomena_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of hapax legomena, see get_n_hapax_legomena.
+    """
+    return _token_counts().list.eval(pl.element() == 1).list.sum(). \
+        cast(pl.UInt32).alias("n_hapax_legomena")
+
+def n_hapax_dislegomena_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of hapax dislegomena, see
+    get_n_hapax_dislegomena.
+    """
+    return _token_counts().list.eval(pl.element() <= 2).list.sum(). \
+        cast(pl.UInt32).alias("n_hapax_dislegomena")
+
+def sichel_s_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Sichel's S, see get_sichel_s.
+    """
+    return (pl.col("n_hapax_dislegomena") / pl.col("n_types")
+            ).alias("sichel_s")
+
+def global_sichel_s_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the global Sichel's S, see get_global_sichel_s.
+    """
+    return (pl.col("n_global_token_hapax_dislegomena") / pl.col("n_types")
+            ).alias("global_sichel_s")
+
+def lexical_density_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the lexical density, see get_lexical_density.
+    """
+    return (pl.col("n_lexical_tokens") / pl.col("n_tokens")
+            ).alias("lexical_density")
+
+def giroud_index_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Giroud's index, see get_giroud_index.
+    """
+    return (pl.col("n_types") / pl.col("n_tokens").sqrt()
+            ).alias("giroud_index")
+
+def yule_k_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Yule's K, see get_yule_k.
+    """
+    # n is gathered from the number of entries in the frequency table
+    n = pl.col("token_freqs").list.len().cast(pl.Float64)
+    # inner sum of the Yule's K formula, i.e.: (Σ(V(i,N) * (i^2/n^4))
+    inner_sum = pl.when(n > 0).then(
+        _token_counts().list.eval(
+            pl.element().cast(pl.Float64) ** 2).list.sum() / n ** 4
+    ).otherwise(0.0)
+
+    return (pl.lit(10**4) * inner_sum - \
+            (1 / pl.col("n_tokens"))).alias("yule_k")
+
+def simpsons_d_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Simpson's D, see get_simpsons_d.
+    """
+    n = pl.col("token_freqs").list.len().cast(pl.Float64)
+    return pl.when(n > 1).then(
+        _token_counts().list.eval(
+            pl.element().cast(pl.Float64) * \
+                (pl.element().cast(pl.Float64) - 1)
+            ).list.sum() / (n * (n - 1))
+    # if there is only one token or none, we apply the convention
+    # that the Simpson's D is 0.0 as there is no diversity in the text
+    ).otherwise(0.0).alias("simpsons_d")
+
+def herdan_v_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for Herdan's Vm, see get_herdan_v.
+    """
+    return (pl.col("yule_k") + (1 / pl.col("n_tokens")) - \
+            (1 / pl.col("n_types")).sqrt()
+            ).alias("herdan_v")
+
+def _token_counts() -> pl.Expr:
+    """
+    Expression selecting the token counts from the 'token_freqs' column as
+    a list of integers per text.
+    Helper function for the frequency-based lexical richness features.
+
+    Returns:
+        counts (pl.Expr):
+            A Polars expression evaluating to the token counts per text.
+    """
+    return pl.col("token_freqs").list.eval(
+        pl.element().struct.field("count"))
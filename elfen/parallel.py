@@ -0,0 +1,359 @@
+"""
+This module contains functions to extract features from large corpora
+with several worker processes.
+
+The input data is partitioned into contiguous shards of rows. Each shard
+is parsed and run through the feature pipeline in a worker process. Every
+worker loads the NLP model once when it is started and keeps the lexicons
+it loads for all of its shards. The shard results are concatenated in the
+original row order.
+
+Corpus-global features, i.e., the global hapax legomena and dislegomena
+and the global Sichel's S, cannot be computed on a shard alone. They are
+computed in a two-phase reduce: the workers return the token and lemma
+frequency tables of their shards, which are merged into the corpus
+frequency tables before the global features are computed for all rows.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+import polars as pl
+
+from .configs.extractor_config import (
+    CONFIG_ALL,
+)
+from .extractor import (
+    Extractor,
+)
+from .features import (
+    FREQUENCY_FUNCTION_MAP,
+    FUNCTION_MAP,
+    GLOBAL_FEATURE_MAP,
+    HELPER_FUNCTION_MAP,
+)
+from .preprocess import (
+    load_nlp,
+)
+from .sinks import (
+    Sink,
+)
+from .surface import (
+    get_num_types,
+    merge_frequencies,
+)
+
+# The NLP pipeline of a worker process, loaded once by init_worker
+_WORKER_NLP = None
+
+def extract_sharded(data: pl.DataFrame,
+                    config: dict[str, str] = CONFIG_ALL,
+                    n_workers: int | None = None,
+                    n_shards: int | None = None,
+                    sink: Sink | None = None,
+                    **kwargs,
+                    ) -> pl.DataFrame | None:
+    """
+    Extracts the features specified in the config on shards of the data
+    in worker processes.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+        config (dict[str, str]):
+            The extractor configuration, see the Extractor class.
+        n_workers (int | None):
+            The number of worker processes. Defaults to the number of
+            CPU cores.
+        n_shards (int | None):
+            The number of shards the data is partitioned into. More shards
+            than workers balance the load if the texts differ in length.
+            Defaults to the number of workers.
+        sink (Sink | None):
+            A sink to write the results to, see the sinks module. Without
+            global features, every shard is written as soon as it and all
+            shards before it are done, so the results are never held in
+            memory as a whole. Constant columns are not removed when
+            writing to a sink. The caller closes the sink.
+        **kwargs:
+            Additional configuration settings overriding the config,
+            e.g., backbone, language, model or text_column.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the extracted features, in the original row
+            order. Helper columns are removed. None if a sink is given.
+    """
+    config = dict(config, **kwargs)
+    for key, value in CONFIG_ALL.items():
+        config.setdefault(key, value)
+    if config["backbone"] not in ["spacy", "stanza"]:
+        raise ValueError("Backbone must be 'spacy' or 'stanza'.")
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_shards is None:
+        n_shards = n_workers
+
+    # Corpus-global features are computed after the shards are merged;
+    # the workers run everything else
+    shard_features, global_features = split_global_features(
+        config["features"])
+
+    shard_config = dict(config,
+                        features=shard_features,
+                        # Constant columns are only known for all shards
+                        remove_constant_cols=False,
+                        # No nested process or thread pools in workers
+                        n_process=1,
+                        n_threads=1,
+                        n_doc_processes=0)
+
+    shard_size = max(1, -(-data.height // max(1, n_shards)))
+    shards = [data.slice(offset, shard_size)
+              for offset in range(0, data.height, shard_size)] or [data]
+    with ProcessPoolExecutor(
+        max_workers=max(1, n_workers),
+        # Forking a process that runs Polars threads can deadlock
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(config["backbone"],
+                  config["model"],
+                  config.get("max_length", 1_000_000)),
+        ) as executor:
+        results = executor.map(_extract_shard,
+                               shards,
+                               [shard_config] * len(shards),
+                               [global_features] * len(shards))
+        if sink is not None and not global_features:
+            for frame, _ in results:
+                sink.write(frame)
+            return None
+        results = list(results)
+
+    # Relaxed, as the dtype of a column may differ between shards, e.g.,
+    # if it is null in all rows of a shard
+    out = pl.concat([frame for frame, _ in results], how="diagonal_relaxed")
+
+    # Second phase: merge the shard frequency tables into the corpus
+    # frequency tables and compute the global features for all rows
+    out = reduce_global_features(out,
+                                 global_features,
+                                 [tables for _, tables in results],
+                                 backbone=config["backbone"],
+                                 text_column=config["text_column"],
+                                 language=config["language"])
+
+    out = out.drop([column for column in ["tokens", "lemmas"]
+                    if column not in data.columns], strict=False)
+    out = drop_carried_columns(out, config["features"], data.columns)
+
+    if sink is not None:
+        for offset in range(0, out.height, shard_size):
+            sink.write(out.slice(offset, shard_size))
+        return None
+
+    if config["remove_constant_cols"] and len(out) > 1:
+        out = out.drop([column for column in out.columns
+                        if column not in data.columns and
+                        out[column].n_unique() == 1])
+
+    return out
+
+def split_global_features(features: dict[str, list[str]],
+                          ) -> tuple[dict[str, list[str]], list[str]]:
+    """
+    Separates the corpus-global features from the other features.
+    Unknown features are reported and skipped.
+
+    Args:
+        features (dict[str, list[str]]):
+            The features to extract, grouped by feature area.
+
+    Returns:
+        local_features (dict[str, list[str]]):
+            The features that can be extracted on a part of the corpus,
+            grouped by feature area.
+        global_features (list[str]):
+            The corpus-global features.
+    """
+    local_features = {}
+    global_features = []
+    for feature_area in features:
+        local_features[feature_area] = []
+        for feature in features[feature_area]:
+            if feature in GLOBAL_FEATURE_MAP:
+                global_features.append(feature)
+            elif feature in FUNCTION_MAP:
+                local_features[feature_area].append(feature)
+            else:
+                print(f"Feature {feature} not found. Check spelling. "
+                      "Skipping...")
+
+    return local_features, global_features
+
+def get_part_frequencies(data: pl.DataFrame,
+                         global_features: list[str],
+                         backbone: str = 'spacy',
+                         ) -> tuple[pl.DataFrame, dict[str, pl.DataFrame]]:
+    """
+    First phase of the global features: computes the frequency tables a
+    part of the corpus contributes to the global features.
+
+    The number of types, which the global Sichel's S needs, is computed
+    on the part as well.
+
+    Args:
+        data (pl.DataFrame): A part of the corpus, with the parsed
+            documents or the tokens and lemmas.
+        global_features (list[str]): The corpus-global features.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the tokens, lemmas and number of types needed
+            for the global features.
+        frequencies (dict[str, pl.DataFrame]):
+            The frequency tables of the part, by kind ('token' or
+            'lemma').
+    """
+    # The global Sichel's S is computed after the parts are merged, when
+    # the parsed documents are no longer available
+    if "global_sichel_s" in global_features and \
+        "n_types" not in data.columns:
+        data = get_num_types(data, backbone=backbone)
+
+    frequencies = {}
+    for feature in global_features:
+        kind = GLOBAL_FEATURE_MAP[feature]
+        if kind in frequencies:
+            continue
+        if f"{kind}s" not in data.columns:
+            data = HELPER_FUNCTION_MAP[f"{kind}s"](data=data,
+                                                   backbone=backbone)
+        frequencies[kind] = FREQUENCY_FUNCTION_MAP[kind](data)
+
+    return data, frequencies
+
+def reduce_global_features(data: pl.DataFrame,
+                           global_features: list[str],
+                           frequencies: list[dict[str, pl.DataFrame]],
+                           backbone: str = 'spacy',
+                           text_column: str = 'text',
+                           language: str = 'en',
+                           ) -> pl.DataFrame:
+    """
+    Second phase of the global features: merges the frequency tables of
+    all parts of the corpus and computes the global features for all rows.
+
+    Args:
+        data (pl.DataFrame): The whole corpus, with the tokens, lemmas
+            and number of types needed for the global features, see
+            get_part_frequencies.
+        global_features (list[str]): The corpus-global features.
+        frequencies (list[dict[str, pl.DataFrame]]):
+            The frequency tables of the parts, see get_part_frequencies.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        text_column (str): The name of the column containing the text data.
+        language (str): The language of the text data.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the global features added as new columns.
+    """
+    merged = {}
+    for feature in global_features:
+        kind = GLOBAL_FEATURE_MAP[feature]
+        if kind not in merged:
+            merged[kind] = merge_frequencies(
+                [tables[kind] for tables in frequencies],
+                word_column=kind)
+        data = FUNCTION_MAP[feature](data=data,
+                                     backbone=backbone,
+                                     text_column=text_column,
+                                     language=language,
+                                     frequencies=merged[kind])
+
+    return data
+
+def drop_carried_columns(data: pl.DataFrame,
+                         features: dict[str, list[str]],
+                         input_columns: list[str],
+                         ) -> pl.DataFrame:
+    """
+    Removes the columns that get_part_frequencies carries to the second
+    phase, i.e., the number of types, unless they were requested or are
+    part of the input.
+
+    Args:
+        data (pl.DataFrame): The data after reduce_global_features.
+        features (dict[str, list[str]]):
+            The requested features, grouped by feature area.
+        input_columns (list[str]): The columns of the input data.
+
+    Returns:
+        data (pl.DataFrame): The data without the carried columns.
+    """
+    requested = [feature for area_features in features.values()
+                 for feature in area_features]
+    return data.drop([column for column in ["n_types"]
+                      if column not in requested
+                      and column not in input_columns], strict=False)
+
+def init_worker(backbone: str,
+                model: str,
+                max_length: int,
+                ) -> None:
+    """
+    Loads the NLP pipeline once per worker process. Used as the
+    initializer of the process pools of this module and the checkpoint
+    module.
+
+    Args:
+        backbone (str): The NLP library, either 'spacy' or 'stanza'.
+        model (str): The model to load.
+        max_length (int): The maximum length of a text.
+    """
+    global _WORKER_NLP
+    _WORKER_NLP = load_nlp(backbone=backbone,
+                           model=model,
+                           max_length=max_length)
+
+def get_worker_nlp():
+    """
+    Returns the NLP pipeline of the worker process, see init_worker.
+
+    Returns:
+        nlp (spacy.language.Language | stanza.Pipeline | None):
+            The pipeline, or None outside of a worker process.
+    """
+    return _WORKER_NLP
+
+def _extract_shard(data: pl.DataFrame,
+                   config: dict[str, str],
+                   global_features: list[str],
+                   ) -> tuple[pl.DataFrame, dict[str, pl.DataFrame]]:
+    """
+    Parses a shard and extracts its features. Runs in a worker process.
+
+    Returns:
+        data (pl.DataFrame):
+            The shard with the extracted features. Of the helper columns,
+            only the tokens and lemmas needed for the global features are
+            kept.
+        frequencies (dict[str, pl.DataFrame]):
+            The frequency tables of the shard, see get_part_frequencies.
+    """
+    # The feature progress of every shard is not printed
+    extractor = Extractor(data, config=config, nlp=get_worker_nlp(),
+                          verbose=False)
+    extractor.extract_features()
+    out, frequencies = get_part_frequencies(extractor.data,
+                                            global_features,
+                                            backbone=config["backbone"])
+
+    keep = [f"{kind}s" for kind in frequencies]
+    out = out.drop([column for column in extractor.helper_cols
+                    if column in out.columns and column not in keep])
+
+    return out, frequencies
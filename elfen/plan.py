@@ -0,0 +1,185 @@
+"""
+This module contains functions to extract features with a single lazy
+query plan.
+
+Instead of computing features one by one on an eager DataFrame, the
+expressions of all features with an expression builder (see
+EXPRESSION_MAP in the features module) are gathered into one LazyFrame
+plan. The plan is optimized and collected once with the Polars streaming
+engine, so Polars can share common subexpressions between features and
+evaluate independent features in parallel.
+
+The helper columns the expressions are built on (tokens, lemmas, token
+frequencies, syllables) are derived from the parsed documents and are
+materialized eagerly before the plan is built. The same holds for
+prerequisite features without an expression builder, e.g., the number of
+sentences.
+"""
+import polars as pl
+
+from .features import (
+    EXPRESSION_MAP,
+    FUNCTION_MAP,
+    HELPER_FUNCTION_MAP,
+)
+from .util import (
+    zero_token_warning_nan,
+)
+
+def plan_features(data: pl.DataFrame,
+                  features: list[str],
+                  backbone: str = 'spacy',
+                  text_column: str = 'text',
+                  language: str = 'en',
+                  expression_map: dict = EXPRESSION_MAP,
+                  function_map: dict = FUNCTION_MAP,
+                  helper_function_map: dict = HELPER_FUNCTION_MAP,
+                  **kwargs: dict[str, str],
+                  ) -> tuple[pl.DataFrame, list[list[pl.Expr]]]:
+    """
+    Builds the expressions for a list of features, grouped into stages.
+
+    The columns an expression depends on are resolved recursively: columns
+    already in the data are used as they are, features with an expression
+    builder are planned in an earlier stage, and helper columns and
+    features without an expression builder are computed eagerly.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+        features (list[str]): The names of the features to plan.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        text_column (str): The name of the column containing the text data.
+        language (str): The language of the text data.
+        expression_map (dict):
+            A dictionary mapping features to their expression builders.
+        function_map (dict):
+            A dictionary mapping features to their feature extraction
+            functions, used for features without an expression builder.
+        helper_function_map (dict):
+            A dictionary mapping helper columns to the functions that
+            compute them.
+        **kwargs:
+            Additional keyword arguments passed to the expression builders
+            and feature extraction functions, e.g., thresholds.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the eagerly computed helper columns and
+            features.
+        stages (list[list[pl.Expr]]):
+            The planned expressions, grouped by stage. The expressions of
+            a stage only depend on columns of the data and of earlier
+            stages.
+    """
+    planned = {}
+
+    def resolve(name: str) -> int:
+        """
+        Plans a column and returns the number of the stage after which it
+        is available; 0 if it is available in the data.
+        """
+        nonlocal data
+        if name in planned:
+            return planned[name][1] + 1
+        if name in data.columns:
+            return 0
+
+        builder = expression_map.get(name)
+        expr = builder(backbone=backbone,
+                       text_column=text_column,
+                       language=language,
+                       **kwargs) if builder is not None else None
+        if expr is not None:
+            output_name = expr.meta.output_name()
+            if output_name in data.columns:
+                return 0
+            stage = max([resolve(root) for root in expr.meta.root_names()],
+                        default=0)
+            planned[name] = (expr, stage)
+            # Register under the output name as well, e.g.,
+            # 'tokens_per_sentence' for 'n_tokens_per_sentence'
+            planned.setdefault(output_name, planned[name])
+            return stage + 1
+
+        if name in helper_function_map:
+            data = helper_function_map[name](data=data,
+                                             backbone=backbone,
+                                             text_column=text_column,
+                                             language=language,
+                                             **kwargs)
+        elif name in function_map:
+            data = function_map[name](data=data,
+                                      backbone=backbone,
+                                      text_column=text_column,
+                                      language=language,
+                                      **kwargs)
+        else:
+            raise ValueError(f"Column '{name}' is neither in the data nor "
+                             "a known feature or helper column.")
+        return 0
+
+    for feature in features:
+        resolve(feature)
+
+    stages = []
+    seen = set()
+    for expr, stage in planned.values():
+        output_name = expr.meta.output_name()
+        if output_name in seen:
+            continue
+        seen.add(output_name)
+        while len(stages) <= stage:
+            stages.append([])
+        stages[stage].append(expr)
+
+    return data, stages
+
+def collect_plan(data: pl.DataFrame,
+                 stages: list[list[pl.Expr]],
+                 streaming: bool = True,
+                 ) -> pl.DataFrame:
+    """
+    Evaluates planned expressions in one lazy query and adds the results
+    to the data.
+
+    Only the columns the expressions depend on are passed to the query,
+    so columns holding the parsed documents never enter the plan.
+    Expressions whose output column is already in the data are skipped.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+        stages (list[list[pl.Expr]]):
+            The planned expressions grouped by stage, see plan_features.
+        streaming (bool):
+            Whether to collect the query with the streaming engine.
+            Defaults to True.
+
+    Returns:
+        data (pl.DataFrame):
+            The data with the planned features added as new columns.
+    """
+    stages = [[expr for expr in stage
+               if expr.meta.output_name() not in data.columns]
+              for stage in stages]
+    output_names = [expr.meta.output_name()
+                    for stage in stages for expr in stage]
+    if not output_names:
+        return data
+
+    roots = {root for stage in stages for expr in stage
+             for root in expr.meta.root_names()}
+    lazy = data.select([col for col in data.columns if col in roots]).lazy()
+    for stage in stages:
+        if stage:
+            lazy = lazy.with_columns(stage)
+
+    result = lazy.select(output_names).collect(
+        engine="streaming" if streaming else "auto")
+
+    # Warn once per feature that is NaN for texts without tokens
+    for column in result.select(pl.selectors.float()).columns:
+        if result[column].is_nan().any():
+            zero_token_warning_nan(column)
+
+    return data.hstack(result)
@@ -10,8 +10,6 @@ The preprocessing steps implemented in this module are:
     The text data is tokenized into individual words.
 - Lemmatization:
     The words in the text data are converted to their base form.
-- Syllabification:
-    The words in the text data are split into syllables.
 - POS Tagging:
     The words in the text data are tagged with their part-of-speech.
 - Dependency Parsing:
@@ -19,11 +17,44 @@ The preprocessing steps implemented in this module are:
 - Named Entity Recognition:
     The named entities in the text data are identified.
 """
+import pickle
+from typing import Union
+
 import polars as pl
 import spacy
-from spacy_syllables import SpacySyllables
+from spacy.tokens import DocBin
 import stanza
 
+def load_nlp(backbone: str = 'spacy',
+             model: str = 'en_core_web_sm',
+             max_length: int = 1000000,
+             **kwargs: dict[str, str],
+             ) -> Union[spacy.language.Language, stanza.Pipeline]:
+    """
+    Loads the NLP pipeline used to process the text data.
+
+    Args:
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        model (str): The name of the model used by the NLP library.
+        max_length (int): The maximum number of characters to process.
+                Only used for spacy.
+
+    Returns:
+        nlp (Union[spacy.language.Language, stanza.Pipeline]):
+            The loaded NLP pipeline.
+    """
+    if backbone == 'spacy':
+        nlp = spacy.load(model)
+        nlp.max_length = max_length
+    elif backbone == 'stanza':
+        nlp = stanza.Pipeline(model=model,
+                              processors='tokenize,pos,lemma,depparse')
+    else:
+        raise ValueError(f"Unsupported backbone: {backbone}")
+
+    return nlp
+
 def preprocess_data(data: pl.DataFrame,
                     text_column: str = 'text',
                     backbone: str = 'spacy',
@@ -31,6 +62,8 @@ def preprocess_data(data: pl.DataFrame,
                     max_length: int = 1000000,
                     batch_size: int = 1,
                     n_process: int = 1,
+                    nlp: Union[spacy.language.Language,
+                               stanza.Pipeline, None] = None,
                     **kwargs: dict[str, str],
                     ) -> pl.DataFrame:
     """
@@ -43,20 +76,21 @@ def preprocess_data(data: pl.DataFrame,
                 Either 'spacy' or 'stanza'.
         model (str): The name of the model used by the NLP library.
         max_length (int): The maximum number of characters to process.
+        nlp (Union[spacy.language.Language, stanza.Pipeline, None]):
+                An already loaded NLP pipeline, see load_nlp. If None,
+                the pipeline is loaded from the model.
 
     Returns:
         data (pl.DataFrame):
             A Polars DataFrame containing the processed text data.
             The processed data is stored in a new column named 'nlp'.
     """
-    if backbone == 'spacy':
-        nlp = spacy.load(model)
-        nlp.max_length = max_length
-        if not nlp.has_pipe("tagger"):
-            nlp.add_pipe("syllables")
-        else:
-            nlp.add_pipe("syllables", after="tagger")
+    if nlp is None and backbone in ['spacy', 'stanza']:
+        nlp = load_nlp(backbone=backbone,
+                       model=model,
+                       max_length=max_length)
 
+    if backbone == 'spacy':
         # Process the text data to retrieve nlp objects
         docs = list(
             nlp.pipe(
@@ -68,9 +102,6 @@ def preprocess_data(data: pl.DataFrame,
         processed = pl.Series("nlp", docs)
 
     elif backbone == 'stanza':
-        nlp = stanza.Pipeline(model=model,
-                              processors='tokenize,pos,lemma,depparse')
-        
         # Process the text data to retrieve nlp objects
         processed = pl.Series("nlp", [nlp(text) for text in data[text_column]])
     else:
@@ -86,6 +117,64 @@ def preprocess_data(data: pl.DataFrame,
 
     return out
 
+def save_docs(docs: list,
+              path: str,
+              backbone: str = 'spacy',
+              ) -> None:
+    """
+    Saves parsed documents to a file, as a spaCy DocBin or as serialized
+    stanza documents.
+
+    Args:
+        docs (list): The parsed documents.
+        path (str): The path of the file.
+        backbone (str): The NLP library used to parse the documents.
+                Either 'spacy' or 'stanza'.
+    """
+    if backbone == 'spacy':
+        DocBin(docs=docs, store_user_data=True).to_disk(path)
+    elif backbone == 'stanza':
+        with open(path, "wb") as f:
+            pickle.dump([doc.to_serialized() for doc in docs], f)
+    else:
+        raise ValueError(f"Unsupported backbone: {backbone}")
+
+def load_docs(path: str,
+              backbone: str = 'spacy',
+              nlp: Union[spacy.language.Language, None] = None,
+              ) -> list:
+    """
+    Loads parsed documents saved with save_docs.
+
+    Args:
+        path (str): The path of the file.
+        backbone (str): The NLP library used to parse the documents.
+                Either 'spacy' or 'stanza'.
+        nlp (spacy.language.Language | None):
+            The spaCy pipeline the documents were parsed with, whose
+            vocabulary the documents are restored with. Not needed for
+            stanza.
+
+    Returns:
+        docs (list): The parsed documents.
+
+    Raises:
+        ValueError: If no spaCy pipeline is given for the spacy backbone.
+    """
+    if backbone == 'spacy':
+        if nlp is None:
+            raise ValueError("Loading spaCy documents requires the "
+                             "pipeline they were parsed with, whose "
+                             "vocabulary restores them. Pass it with "
+                             "nlp=...")
+        return list(DocBin().from_disk(path).get_docs(nlp.vocab))
+    elif backbone == 'stanza':
+        with open(path, "rb") as f:
+            return [stanza.Document.from_serialized(doc)
+                    for doc in pickle.load(f)]
+    else:
+        raise ValueError(f"Unsupported backbone: {backbone}")
+
 def get_lemmas(data: pl.DataFrame,
                backbone: str = 'spacy',
                **kwargs: dict[str, str],
@@ -0,0 +1,205 @@
+"""
+This module contains functions to measure the cost of the extraction
+steps, i.e., parsing and every feature call.
+
+Every measured step is recorded with:
+
+- stage: The kind of step, e.g., 'parse' or 'feature'.
+- name: The name of the step, e.g., the feature.
+- wall_time: The elapsed time in seconds.
+- cpu_time: The CPU time of the process in seconds, including the Polars
+  worker threads.
+- rss_delta: The growth of the peak resident set size of the process in
+  bytes. This includes allocations made by Polars outside of Python, but
+  stays 0 once a step does not exceed the peak of an earlier step.
+- peak_memory: The peak memory allocated by Python during the step in
+  bytes, measured with tracemalloc. Only measured if tracing is enabled,
+  as tracemalloc slows down Python code considerably.
+- rows: The number of rows processed.
+- output_columns: The columns added by the step.
+- profile_path: The call profile of the step, if it was profiled.
+
+Steps can also be profiled with cProfile, or another profiler with the
+same interface. Every profiled step writes its call profile to a file in
+the pstats format, which can be inspected with pstats or tools such as
+snakeviz, and ``hotspots`` aggregates the profiles of several steps into
+a table of the functions that take the most time.
+"""
+import contextlib
+import cProfile
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import polars as pl
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PROFILE_SCHEMA = {
+    "stage": pl.String,
+    "name": pl.String,
+    "wall_time": pl.Float64,
+    "cpu_time": pl.Float64,
+    "rss_delta": pl.Int64,
+    "peak_memory": pl.Int64,
+    "rows": pl.Int64,
+    "output_columns": pl.List(pl.String),
+    "profile_path": pl.String,
+}
+
+HOTSPOT_SCHEMA = {
+    "function": pl.String,
+    "calls": pl.Int64,
+    "total_time": pl.Float64,
+    "cumulative_time": pl.Float64,
+    "steps": pl.List(pl.String),
+}
+
+@contextlib.contextmanager
+def measure(records: list[dict],
+            stage: str,
+            name: str,
+            rows: int,
+            trace_memory: bool = False,
+            profile_path: str | None = None,
+            profiler: Callable = cProfile.Profile,
+            ):
+    """
+    Measures the step in the with block and appends its record to a list.
+    The caller may set the 'output_columns' of the yielded record.
+
+    Args:
+        records (list[dict]): The list to append the record to.
+        stage (str): The kind of step, e.g., 'parse' or 'feature'.
+        name (str): The name of the step, e.g., the feature.
+        rows (int): The number of rows processed.
+        trace_memory (bool):
+            Whether to measure the peak memory allocated by Python with
+            tracemalloc. Defaults to False.
+        profile_path (str | None):
+            The path to write the call profile of the step to. Defaults
+            to None, i.e., the step is not profiled.
+        profiler (Callable):
+            Creates the profiler, an object with the methods enable,
+            disable and dump_stats like cProfile.Profile. Defaults to
+            cProfile.Profile.
+
+    Yields:
+        record (dict): The record of the step.
+    """
+    record = {"stage": stage,
+              "name": name,
+              "rows": rows,
+              "peak_memory": None,
+              "output_columns": [],
+              "profile_path": profile_path}
+    started_tracing = False
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        traced = tracemalloc.get_traced_memory()[0]
+    rss = _peak_rss()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    if profile_path is not None:
+        call_profiler = profiler()
+        call_profiler.enable()
+    try:
+        yield record
+    finally:
+        if profile_path is not None:
+            call_profiler.disable()
+        record["wall_time"] = time.perf_counter() - wall_start
+        record["cpu_time"] = time.process_time() - cpu_start
+        record["rss_delta"] = _peak_rss() - rss
+        if trace_memory:
+            record["peak_memory"] = \
+                tracemalloc.get_traced_memory()[1] - traced
+            if started_tracing:
+                tracemalloc.stop()
+        if profile_path is not None:
+            call_profiler.dump_stats(profile_path)
+        records.append(record)
+
+def records_to_frame(records: list[dict]) -> pl.DataFrame:
+    """
+    Converts measured records to a DataFrame.
+
+    Args:
+        records (list[dict]): The records, see measure.
+
+    Returns:
+        profile (pl.DataFrame): One row per measured step, with the
+            columns described in the module documentation.
+    """
+    return pl.DataFrame(
+        [{column: record.get(column) for column in PROFILE_SCHEMA}
+         for record in records],
+        schema=PROFILE_SCHEMA)
+
+def hotspots(profile_paths: list[str],
+             top: int = 20,
+             step_names: list[str] | None = None,
+             ) -> pl.DataFrame:
+    """
+    Aggregates call profiles into a table of the functions that take the
+    most time.
+
+    Args:
+        profile_paths (list[str]): The paths of the call profiles, in the
+            pstats format.
+        top (int): The number of functions. Defaults to 20.
+        step_names (list[str] | None):
+            The names of the profiled steps, e.g., the features. Defaults
+            to the paths.
+
+    Returns:
+        hotspots (pl.DataFrame):
+            One row per function, with the columns 'function'
+            ('file:line(name)'), 'calls', 'total_time' (seconds spent in
+            the function itself), 'cumulative_time' (seconds including
+            the functions it calls) and 'steps' (the steps that call
+            it), sorted by the total time.
+    """
+    if step_names is None:
+        step_names = profile_paths
+    rows = []
+    for path, step in zip(profile_paths, step_names):
+        stats = pstats.Stats(path).stats
+        for (filename, line, name), (_, calls, total_time,
+                                     cumulative_time, _) in stats.items():
+            rows.append({
+                "function": pstats.func_std_string((filename, line, name)),
+                "calls": calls,
+                "total_time": total_time,
+                "cumulative_time": cumulative_time,
+                "step": step,
+            })
+    if not rows:
+        return pl.DataFrame(schema=HOTSPOT_SCHEMA)
+    # Steps are profiled one after another, so their times add up
+    return pl.DataFrame(rows).group_by("function").agg(
+        pl.col("calls").sum(),
+        pl.col("total_time").sum(),
+        pl.col("cumulative_time").sum(),
+        pl.col("step").unique(maintain_order=True).alias("steps"),
+    ).sort("total_time", "function", descending=[True, False]).head(
+        top).cast(HOTSPOT_SCHEMA)
+
+def _peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes, or 0 if
+    it cannot be determined.
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
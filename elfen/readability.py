@@ -17,8 +17,18 @@ The readability scores implemented in this module are:
 - LIX
 - RIX
 """
+import os
+import warnings
+
 import polars as pl
+import pyphen
 
+from .preprocess import (
+    get_tokens,
+)
+from .resources import (
+    PROJECT_PATH,
+)
 from .surface import (
     get_num_tokens,
     get_num_sentences,
@@ -29,15 +39,215 @@ from .util import (
     zero_token_warning_nan
 )
 
+SYLLABLE_CACHE_DIR = os.path.join(PROJECT_PATH, "elfen_resources",
+                                  "Readability", "Syllables")
+
+# Syllable counts per lowercase word type, per hyphenation language and
+# cache directory. Shared by all syllable-based features and persisted to
+# the cache directory, so every word type is only hyphenated once.
+_SYLLABLE_CACHE: dict[tuple[str, str | None], dict[str, int | None]] = {}
+
+def get_syllables(data: pl.DataFrame,
+                  backbone: str = 'spacy',
+                  language: str = 'en',
+                  cache_dir: str | None = SYLLABLE_CACHE_DIR,
+                  **kwargs: dict[str, str],
+                  ) -> pl.DataFrame:
+    """
+    Gets the number of syllables of each token in the text data.
+
+    Syllables are counted once per unique lowercase word type in the data
+    using the pyphen hyphenation dictionaries and looked up from a cache
+    that persists across runs. Tokens that are not alphabetic (e.g.,
+    punctuation or numbers) have no syllable count (null).
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        language (str): The language of the text data.
+                Defaults to English ('en').
+        cache_dir (str | None):
+            The directory to persist the syllable cache to. If None, the
+            cache is only kept in memory.
+
+    Returns:
+        data (pl.DataFrame):
+            A Polars DataFrame containing the syllable counts of the
+            tokens in the text data. The syllable counts are stored in a
+            new column named 'syllables'.
+    """
+    if 'tokens' not in data.columns:
+        data = get_tokens(data, backbone=backbone)
+
+    words = (
+        data
+        .select(pl.col("tokens").explode(empty_as_null=True)
+                .str.to_lowercase().alias("word"))
+        .drop_nulls()
+        .unique()
+        ["word"]
+        .to_list()
+    )
+    syllable_counts = count_syllables(words,
+                                      language=language,
+                                      cache_dir=cache_dir)
+
+    data = data.with_columns(
+        pl.col("tokens").list.eval(
+            pl.element().str.to_lowercase().replace_strict(
+                words,
+                [syllable_counts[word] for word in words],
+                default=None,
+                return_dtype=pl.UInt32)
+        ).alias("syllables")
+    )
+
+    return data
+
+def count_syllables(words: list[str],
+                    language: str = 'en',
+                    cache_dir: str | None = SYLLABLE_CACHE_DIR,
+                    ) -> dict[str, int | None]:
+    """
+    Counts the syllables of the given words. Words that are not yet in the
+    syllable cache are hyphenated with pyphen and added to the cache.
+
+    Args:
+        words (list[str]): The (lowercase) words to count syllables for.
+        language (str): The language of the words.
+                Defaults to English ('en').
+        cache_dir (str | None):
+            The directory to persist the syllable cache to. If None, the
+            cache is only kept in memory.
+
+    Returns:
+        syllable_counts (dict[str, int | None]):
+            A dictionary mapping the words to their number of syllables.
+            Words that are not alphabetic are mapped to None.
+    """
+    hyphenation_language = _hyphenation_language(language)
+    cache = _load_syllable_cache(hyphenation_language, cache_dir)
+
+    missing = [word for word in set(words) if word not in cache]
+    if len(missing) > 0:
+        try:
+            dic = pyphen.Pyphen(lang=hyphenation_language)
+        except KeyError:
+            raise NotImplementedError(
+                "Syllable counting is not supported for language: "
+                f"{hyphenation_language}")
+        new_counts = {word: _count_word_syllables(word, dic)
+                      for word in missing}
+        cache.update(new_counts)
+        _save_syllable_cache(cache, new_counts, hyphenation_language,
+                             cache_dir)
+
+    return {word: cache[word] for word in words}
+
+def _count_word_syllables(word: str,
+                          dic: pyphen.Pyphen,
+                          ) -> int | None:
+    """
+    Counts the syllables of a single word, splitting hyphenated compounds
+    first. Non-alphabetic words have no syllable count.
+    Helper function for count_syllables.
+    """
+    if word.replace("-", "").isalpha():
+        return len("-".join(map(dic.inserted, word.split("-"))).split("-"))
+    return None
+
+def _hyphenation_language(language: str) -> str:
+    """
+    Maps a language code to the corresponding pyphen dictionary name,
+    e.g. 'en' to 'en_US'.
+    Helper function for count_syllables.
+    """
+    lang, *country_code = language.lower().replace("-", "_").split("_")
+    if country_code:
+        return f"{lang}_{country_code[0].upper()}"
+    return {"en": "en_US", "de": "de_DE", "pt": "pt_PT"}.get(lang, lang)
+
+def _syllable_cache_path(hyphenation_language: str,
+                         cache_dir: str,
+                         ) -> str:
+    """
+    Returns the path of the persisted syllable cache for a language.
+    """
+    return os.path.join(cache_dir, f"syllables_{hyphenation_language}.parquet")
+
+def _load_syllable_cache(hyphenation_language: str,
+                         cache_dir: str | None,
+                         ) -> dict[str, int | None]:
+    """
+    Returns the in-memory syllable cache for a language and cache
+    directory, loading the persisted cache on first use.
+    Helper function for count_syllables.
+    """
+    key = (hyphenation_language,
+           os.path.abspath(cache_dir) if cache_dir is not None else None)
+    if key not in _SYLLABLE_CACHE:
+        _SYLLABLE_CACHE[key] = {}
+        if cache_dir is not None:
+            _SYLLABLE_CACHE[key] = _read_syllable_cache(
+                _syllable_cache_path(hyphenation_language, cache_dir))
+
+    return _SYLLABLE_CACHE[key]
+
+def _read_syllable_cache(path: str) -> dict[str, int | None]:
+    """
+    Reads a persisted syllable cache, or returns an empty cache if there
+    is none.
+    Helper function for count_syllables.
+    """
+    if not os.path.exists(path):
+        return {}
+    persisted = pl.read_parquet(path)
+    return dict(zip(persisted["word"].to_list(),
+                    persisted["syllables"].to_list()))
+
+def _save_syllable_cache(cache: dict[str, int | None],
+                         new_counts: dict[str, int | None],
+                         hyphenation_language: str,
+                         cache_dir: str | None,
+                         ) -> None:
+    """
+    Adds the newly counted words to the persisted syllable cache for a
+    language. The words persisted by other processes in the meantime are
+    merged into the in-memory cache and kept. The cache is written to a
+    temporary file first and then moved, so concurrent runs never read a
+    partially written cache.
+    Helper function for count_syllables.
+    """
+    if cache_dir is None:
+        return
+    path = _syllable_cache_path(hyphenation_language, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        persisted = _read_syllable_cache(path)
+        for word, count in persisted.items():
+            cache.setdefault(word, count)
+        persisted.update(new_counts)
+        pl.DataFrame({
+            "word": list(persisted.keys()),
+            "syllables": list(persisted.values()),
+        }, schema={"word": pl.String, "syllables": pl.UInt32}
+        ).write_parquet(f"{path}.{os.getpid()}.tmp")
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+    except OSError as e:
+        warnings.warn(f"Could not persist the syllable cache to "
+                      f"'{cache_dir}': {e}")
+
 def get_num_syllables(data: pl.DataFrame,
                       backbone: str = 'spacy',
+                      language: str = 'en',
                       **kwargs: dict[str, str],
                       ) -> pl.DataFrame:
         """
         Calculates the number of syllables in a text.
 
-        Syllables are calculated using the syllables_count attribute
-        of the tokens in the text data.
+        Syllables are counted once per word type with the syllable cache,
+        see get_syllables.
 
         Args:
             data (pl.DataFrame):
@@ -45,7 +255,8 @@ def get_num_syllables(data: pl.DataFrame,
             backbone (str):
                 The NLP library used to process the text data.
                 Either 'spacy' or 'stanza'.
-                Not supported for Stanza backbone.
+            language (str): The language of the text data.
+                Defaults to English ('en').
 
         Returns:
             data (pl.DataFrame):
@@ -54,26 +265,19 @@ def get_num_syllables(data: pl.DataFrame,
                 The number of syllables is stored in a new column
                 named 'n_syllables'.
         """
-        if backbone == 'spacy':
-            data = data.with_columns(
-                pl.col("nlp").map_elements(lambda x: sum(
-                    [token._.syllables_count for token in x if 
-                     token._.syllables_count != None]),
-                     return_dtype=pl.UInt16
-                    ).alias("n_syllables"),
-            )
-        elif backbone == 'stanza':
-            raise NotImplementedError(
-                "Not supported for Stanza backbone."
-            )
-        else:
-            raise ValueError(f"Unsupported backbone '{backbone}'. "
-                             "Supported backbones are 'spacy' and 'stanza'.")
+        if 'syllables' not in data.columns:
+            data = get_syllables(data, backbone=backbone, language=language,
+                                 **kwargs)
+
+        data = data.with_columns(
+            n_syllables_expr(),
+        )
         
         return data
 
 def get_num_monosyllables(data: pl.DataFrame,
                           backbone: str = 'spacy',
+                          language: str = 'en',
                           **kwargs: dict[str, str],
                           ) -> pl.DataFrame:
     """
@@ -86,7 +290,8 @@ def get_num_monosyllables(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
+        language (str): The language of the text data.
+            Defaults to English ('en').
 
     Returns:
         data (pl.DataFrame):
@@ -95,30 +300,19 @@ def get_num_monosyllables(data: pl.DataFrame,
             The number of monosyllables is stored in a new column
             named 'n_monosyllables'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: sum(
-                [1 for syllables_count in [
-                    token._.syllables_count
-                    for token
-                    in x
-                    if token._.syllables_count != None
-                    ] if syllables_count == 1]
-                    ), return_dtype=pl.UInt16
-                ).alias("n_monosyllables"),
-        )
-    elif backbone == 'stanza':
-        raise NotImplementedError(
-            "Not supported for Stanza backbone."
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'syllables' not in data.columns:
+        data = get_syllables(data, backbone=backbone, language=language,
+                             **kwargs)
+
+    data = data.with_columns(
+        n_monosyllables_expr(),
+    )
 
     return data
 
 def get_num_polysyllables(data: pl.DataFrame,
                           backbone: str = 'spacy',
+                          language: str = 'en',
                           **kwargs: dict[str, str],
                           ) -> pl.DataFrame:
     """
@@ -131,7 +325,8 @@ def get_num_polysyllables(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
+        language (str): The language of the text data.
+            Defaults to English ('en').
 
     Returns:
         data (pl.DataFrame):
@@ -140,30 +335,19 @@ def get_num_polysyllables(data: pl.DataFrame,
             The number of polysyllables is stored in a new column
             named 'n_polysyllables'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: sum(
-                [1 for syllables_count in [
-                    token._.syllables_count
-                    for token
-                    in x
-                    if token._.syllables_count != None
-                    ] if syllables_count >= 3]
-                    ), return_dtype=pl.UInt16
-                ).alias("n_polysyllables"),
-        )
-    elif backbone == 'stanza':
-        raise NotImplementedError(
-            "Not supported for Stanza backbone."
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'syllables' not in data.columns:
+        data = get_syllables(data, backbone=backbone, language=language,
+                             **kwargs)
+
+    data = data.with_columns(
+        n_polysyllables_expr(),
+    )
 
     return data
 
 def get_flesch_reading_ease(data: pl.DataFrame,
                             backbone: str = 'spacy',
+                            language: str = 'en',
                             **kwargs: dict[str, str],
                             ) -> pl.DataFrame:
     """
@@ -174,7 +358,8 @@ def get_flesch_reading_ease(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
+        language (str): The language of the text data.
+            Defaults to English ('en').
 
     Returns:
         data (pl.DataFrame):
@@ -187,13 +372,11 @@ def get_flesch_reading_ease(data: pl.DataFrame,
     if 'n_sentences' not in data.columns:
         data = get_num_sentences(data, backbone=backbone)
     if 'n_syllables' not in data.columns:
-        data = get_num_syllables(data, backbone=backbone)
+        data = get_num_syllables(data, backbone=backbone,
+                                 language=language)
 
     data = data.with_columns(
-        (206.835 - (1.015 * (pl.col("n_tokens") / \
-                             pl.col("n_sentences"))) - \
-         (84.6 * (pl.col("n_syllables") / pl.col("n_tokens")))
-         ).alias("flesch_reading_ease"),
+        flesch_reading_ease_expr(),
     )
     if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
         zero_token_warning_nan("flesch_reading_ease")
@@ -202,6 +385,7 @@ def get_flesch_reading_ease(data: pl.DataFrame,
 
 def get_flesch_kincaid_grade(data: pl.DataFrame,
                             backbone: str = 'spacy',
+                            language: str = 'en',
                             **kwargs: dict[str, str],
                             ) -> pl.DataFrame:
     """
@@ -212,7 +396,8 @@ def get_flesch_kincaid_grade(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
+        language (str): The language of the text data.
+            Defaults to English ('en').
 
     Returns:
         data (pl.DataFrame):
@@ -225,12 +410,11 @@ def get_flesch_kincaid_grade(data: pl.DataFrame,
     if 'n_sentences' not in data.columns:
         data = get_num_sentences(data, backbone=backbone)
     if 'n_syllables' not in data.columns:
-        data = get_num_syllables(data, backbone=backbone)
+        data = get_num_syllables(data, backbone=backbone,
+                                 language=language)
 
     data = data.with_columns(
-        (0.39 * (pl.col("n_tokens") / pl.col("n_sentences")) + \
-         11.8 * (pl.col("n_syllables") / pl.col("n_tokens")) - 15.59
-         ).alias("flesch_kincaid_grade"),
+        flesch_kincaid_grade_expr(),
     )
     if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
         zero_token_warning_nan("flesch_kincaid_grade")
@@ -249,7 +433,6 @@ def get_ari(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
 
     Returns:
         data (pl.DataFrame):
@@ -265,9 +448,7 @@ def get_ari(data: pl.DataFrame,
         data = get_num_characters(data, backbone=backbone)
 
     data = data.with_columns(
-        (4.71 * (pl.col("n_characters") / pl.col("n_tokens")) + \
-         0.5 * (pl.col("n_tokens") / pl.col("n_sentences")) - 21.43
-         ).alias("ari"),
+        ari_expr(),
     )
     if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
         zero_token_warning_nan("ari")
@@ -276,6 +457,7 @@ def get_ari(data: pl.DataFrame,
 
 def get_smog(data: pl.DataFrame,
             backbone: str = 'spacy',
+            language: str = 'en',
             **kwargs: dict[str, str],
             ) -> pl.DataFrame:
     """
@@ -285,7 +467,8 @@ def get_smog(data: pl.DataFrame,
         data (pl.DataFrame): APolars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
                 Either 'spacy' or 'stanza'.
-                Not supported for Stanza backbone.
+        language (str): The language of the text data.
+            Defaults to English ('en').
 
     Returns:
         data (pl.DataFrame):
@@ -296,12 +479,11 @@ def get_smog(data: pl.DataFrame,
     if 'n_sentences' not in data.columns:
         data = get_num_sentences(data, backbone=backbone)
     if 'n_polysyllables' not in data.columns:
-        data = get_num_polysyllables(data, backbone=backbone)
+        data = get_num_polysyllables(data, backbone=backbone,
+                                     language=language)
 
     data = data.with_columns(
-        (1.0430 * (30 * pl.col("n_polysyllables") /  \
-                   pl.col("n_sentences"))**0.5 + 3.1291
-         ).alias("smog"),
+        smog_expr(),
     )
     if data.filter(pl.col("n_sentences") == 0).shape[0] > 0:
         zero_token_warning_nan("smog")
@@ -320,7 +502,6 @@ def get_cli(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
 
     Returns:
         data (pl.DataFrame):
@@ -336,9 +517,7 @@ def get_cli(data: pl.DataFrame,
         data = get_num_tokens(data, backbone=backbone)
 
     data = data.with_columns(
-        (0.0588 * (pl.col("n_characters") / pl.col("n_tokens") * 100) - \
-         0.296 * (pl.col("n_sentences") / pl.col("n_tokens") * 100) - 15.8
-         ).alias("cli"),
+        cli_expr(),
     )
     if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
         zero_token_warning_nan("cli")
@@ -347,6 +526,7 @@ def get_cli(data: pl.DataFrame,
 
 def get_gunning_fog(data: pl.DataFrame,
                     backbone: str = 'spacy',
+                    language: str = 'en',
                     **kwargs: dict[str, str],
                     ) -> pl.DataFrame:
     """
@@ -357,7 +537,8 @@ def get_gunning_fog(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
+        language (str): The language of the text data.
+            Defaults to English ('en').
 
     Returns:
         data (pl.DataFrame):
@@ -368,14 +549,13 @@ def get_gunning_fog(data: pl.DataFrame,
     if 'n_sentences' not in data.columns:
         data = get_num_sentences(data, backbone=backbone)
     if 'n_polysyllables' not in data.columns:
-        data = get_num_polysyllables(data, backbone=backbone)
+        data = get_num_polysyllables(data, backbone=backbone,
+                                     language=language)
     if 'n_tokens' not in data.columns:
         data = get_num_tokens(data, backbone=backbone)
 
     data = data.with_columns(
-        (0.4 * ((pl.col("n_tokens") / pl.col("n_sentences")) + \
-                100 * (pl.col("n_polysyllables") / pl.col("n_tokens")))
-                ).alias("gunning_fog"),
+        gunning_fog_expr(),
     )
     if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
         zero_token_warning_nan("gunning_fog")
@@ -408,9 +588,7 @@ def get_lix(data: pl.DataFrame,
         data = get_num_long_words(data, backbone=backbone)
 
     data = data.with_columns(
-        (pl.col("n_tokens") / pl.col("n_sentences") + \
-         100 * pl.col("n_long_words") / pl.col("n_tokens")
-         ).alias("lix"),
+        lix_expr(),
     )
     if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
         zero_token_warning_nan("lix")
@@ -429,7 +607,6 @@ def get_rix(data: pl.DataFrame,
         backbone (str):
             The NLP library used to process the text data.
             Either 'spacy' or 'stanza'.
-            Not supported for Stanza backbone.
 
     Returns:
         data (pl.DataFrame):
@@ -442,11 +619,97 @@ def get_rix(data: pl.DataFrame,
         data = get_num_long_words(data, backbone=backbone)
 
     data = data.with_columns(
-        (pl.col("n_long_words") / pl.col("n_sentences")
-         ).alias("rix"),
+        rix_expr(),
     )
-    if data.filter(pl.col("n_tokens") == 0).shape[0] > 0:
+    if data.filter(pl.col("n_sentences") == 0).shape[0] > 0:
         zero_token_warning_nan("rix")
 
     return data
 
+def n_syllables_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of syllables, see get_num_syllables.
+    Tokens without a syllable count are ignored.
+    """
+    return pl.col("syllables").list.sum().cast(pl.UInt32). \
+        alias("n_syllables")
+
+def n_monosyllables_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of monosyllables, see get_num_monosyllables.
+    """
+    return pl.col("syllables").list.eval(pl.element() == 1).list.sum(). \
+        cast(pl.UInt32).alias("n_monosyllables")
+
+def n_polysyllables_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of polysyllables, see get_num_polysyllables.
+    """
+    return pl.col("syllables").list.eval(pl.element() >= 3).list.sum(). \
+        cast(pl.UInt32).alias("n_polysyllables")
+
+def flesch_reading_ease_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the Flesch Reading Ease score, see
+    get_flesch_reading_ease.
+    """
+    return (206.835 - (1.015 * (pl.col("n_tokens") / \
+                                pl.col("n_sentences"))) - \
+            (84.6 * (pl.col("n_syllables") / pl.col("n_tokens")))
+            ).alias("flesch_reading_ease")
+
+def flesch_kincaid_grade_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the Flesch-Kincaid Grade Level, see
+    get_flesch_kincaid_grade.
+    """
+    return (0.39 * (pl.col("n_tokens") / pl.col("n_sentences")) + \
+            11.8 * (pl.col("n_syllables") / pl.col("n_tokens")) - 15.59
+            ).alias("flesch_kincaid_grade")
+
+def ari_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the Automated Readability Index, see get_ari.
+    """
+    return (4.71 * (pl.col("n_characters") / pl.col("n_tokens")) + \
+            0.5 * (pl.col("n_tokens") / pl.col("n_sentences")) - 21.43
+            ).alias("ari")
+
+def smog_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the Simple Measure of Gobbledygook, see get_smog.
+    """
+    return (1.0430 * (30 * pl.col("n_polysyllables") / \
+                      pl.col("n_sentences"))**0.5 + 3.1291
+            ).alias("smog")
+
+def cli_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the Coleman-Liau Index, see get_cli.
+    """
+    return (0.0588 * (pl.col("n_characters") / pl.col("n_tokens") * 100) - \
+            0.296 * (pl.col("n_sentences") / pl.col("n_tokens") * 100) - 15.8
+            ).alias("cli")
+
+def gunning_fog_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the Gunning Fog Index, see get_gunning_fog.
+    """
+    return (0.4 * ((pl.col("n_tokens") / pl.col("n_sentences")) + \
+                   100 * (pl.col("n_polysyllables") / pl.col("n_tokens")))
+            ).alias("gunning_fog")
+
+def lix_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the LIX, see get_lix.
+    """
+    return (pl.col("n_tokens") / pl.col("n_sentences") + \
+            100 * pl.col("n_long_words") / pl.col("n_tokens")
+            ).alias("lix")
+
+def rix_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the RIX, see get_rix.
+    """
+    return (pl.col("n_long_words") / pl.col("n_sentences")
+            ).alias("rix")
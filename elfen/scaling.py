@@ -0,0 +1,285 @@
+"""
+This module contains the FeatureScaler, which normalizes or rescales
+feature columns with fitted statistics.
+
+The statistics of all feature columns (count, mean, sum of squared
+deviations, minimum and maximum) are computed in a single pass over the
+data, and all columns are transformed in a single with_columns call.
+The fitted statistics can be saved and applied to new batches of data,
+e.g., the chunks of a stream, without fitting them again. The statistics
+of several batches can be merged with partial_fit, so that a stream can
+also be fitted chunk by chunk.
+
+Nulls and NaNs are ignored when fitting.
+"""
+import json
+
+import polars as pl
+
+STATISTICS_SCHEMA = {
+    "feature": pl.String,
+    "count": pl.UInt64,
+    "mean": pl.Float64,
+    "m2": pl.Float64,
+    "min": pl.Float64,
+    "max": pl.Float64,
+}
+
+SCALING_METHODS = ["normalize", "rescale"]
+
+class FeatureScaler:
+    """
+    Normalizes feature columns to a mean of 0 and a standard deviation of
+    1, or rescales them to a range, with fitted statistics.
+
+    Args:
+        method (str):
+            'normalize' or 'rescale'. Defaults to 'normalize'.
+        minimum (float):
+            The desired minimum when rescaling. Defaults to 0.
+        maximum (float):
+            The desired maximum when rescaling. Defaults to 1.
+        statistics (pl.DataFrame | None):
+            Fitted statistics, with the columns 'feature', 'count',
+            'mean', 'm2', 'min' and 'max'. Defaults to None, i.e., the
+            scaler has to be fitted first.
+    """
+    def __init__(self,
+                 method: str = "normalize",
+                 minimum: float = 0.0,
+                 maximum: float = 1.0,
+                 statistics: pl.DataFrame | None = None,
+                 ) -> None:
+        if method not in SCALING_METHODS:
+            raise ValueError(f"Unknown scaling method '{method}'. "
+                             f"Available methods are {SCALING_METHODS}.")
+        self.method = method
+        self.minimum = minimum
+        self.maximum = maximum
+        self.statistics = statistics if statistics is not None else \
+            pl.DataFrame(schema=STATISTICS_SCHEMA)
+
+    @property
+    def features(self) -> list[str]:
+        """
+        The fitted features.
+        """
+        return self.statistics["feature"].to_list()
+
+    def fit(self,
+            data: pl.DataFrame,
+            features: list[str],
+            ) -> "FeatureScaler":
+        """
+        Fits the statistics of the features, replacing earlier ones.
+
+        Args:
+            data (pl.DataFrame): The data.
+            features (list[str]): The feature columns.
+
+        Returns:
+            scaler (FeatureScaler): The fitted scaler.
+        """
+        self.statistics = column_statistics(data, features)
+        return self
+
+    def partial_fit(self,
+                    data: pl.DataFrame,
+                    features: list[str] | None = None,
+                    ) -> "FeatureScaler":
+        """
+        Updates the statistics with another batch of data.
+
+        Args:
+            data (pl.DataFrame): The batch.
+            features (list[str] | None):
+                The feature columns. Defaults to the fitted features.
+
+        Returns:
+            scaler (FeatureScaler): The updated scaler.
+        """
+        if features is None:
+            features = self.features
+        self.statistics = merge_statistics(self.statistics,
+                                           column_statistics(data, features))
+        return self
+
+    def transform(self,
+                  data: pl.DataFrame | pl.LazyFrame,
+                  features: list[str] | None = None,
+                  ) -> pl.DataFrame | pl.LazyFrame:
+        """
+        Normalizes or rescales the features with the fitted statistics.
+
+        Args:
+            data (pl.DataFrame | pl.LazyFrame): The data.
+            features (list[str] | None):
+                The features to transform. Defaults to all fitted
+                features.
+
+        Returns:
+            data (pl.DataFrame | pl.LazyFrame):
+                The data with the transformed features.
+        """
+        return data.with_columns(self.expressions(features))
+
+    def fit_transform(self,
+                      data: pl.DataFrame,
+                      features: list[str],
+                      ) -> pl.DataFrame:
+        """
+        Fits the statistics of the features and transforms them.
+
+        Args:
+            data (pl.DataFrame): The data.
+            features (list[str]): The feature columns.
+
+        Returns:
+            data (pl.DataFrame): The data with the transformed features.
+        """
+        return self.fit(data, features).transform(data)
+
+    def expressions(self,
+                    features: list[str] | None = None,
+                    ) -> list[pl.Expr]:
+        """
+        Gets the expressions that transform the features, e.g., to add
+        them to a lazy query.
+
+        Args:
+            features (list[str] | None):
+                The features to transform. Defaults to all fitted
+                features.
+
+        Returns:
+            expressions (list[pl.Expr]): One expression per feature.
+        """
+        statistics = self.statistics
+        if features is not None:
+            missing = set(features) - set(self.features)
+            if missing:
+                raise ValueError(f"The features {sorted(missing)} are not "
+                                 "fitted.")
+            statistics = statistics.filter(pl.col("feature").is_in(features))
+        expressions = []
+        for row in statistics.iter_rows(named=True):
+            column = pl.col(row["feature"])
+            if self.method == "normalize":
+                std = (row["m2"] / (row["count"] - 1)) ** 0.5 \
+                    if row["count"] > 1 else None
+                expressions.append(((column - row["mean"]) / std)
+                                   .alias(row["feature"]))
+            else:
+                expressions.append(
+                    ((column - row["min"]) / (row["max"] - row["min"]) *
+                     (self.maximum - self.minimum) + self.minimum)
+                    .alias(row["feature"]))
+        return expressions
+
+    def save(self,
+             path: str,
+             ) -> None:
+        """
+        Saves the scaler as JSON.
+
+        Args:
+            path (str): The path to save the scaler to.
+        """
+        with open(path, "w") as f:
+            json.dump({
+                "method": self.method,
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "statistics": self.statistics.to_dicts(),
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls,
+             path: str,
+             ) -> "FeatureScaler":
+        """
+        Loads a scaler saved with save.
+
+        Args:
+            path (str): The path the scaler was saved to.
+
+        Returns:
+            scaler (FeatureScaler): The loaded scaler.
+        """
+        with open(path) as f:
+            meta = json.load(f)
+        return cls(method=meta["method"],
+                   minimum=meta["minimum"],
+                   maximum=meta["maximum"],
+                   statistics=pl.DataFrame(meta["statistics"],
+                                           schema=STATISTICS_SCHEMA))
+
+def column_statistics(data: pl.DataFrame,
+                      columns: list[str],
+                      ) -> pl.DataFrame:
+    """
+    Computes the statistics of columns in a single pass over the data,
+    ignoring nulls and NaNs.
+
+    Args:
+        data (pl.DataFrame): The data.
+        columns (list[str]): The columns.
+
+    Returns:
+        statistics (pl.DataFrame):
+            One row per column, with the columns 'feature', 'count',
+            'mean', 'm2' (the sum of squared deviations from the mean),
+            'min' and 'max'.
+    """
+    if not columns:
+        return pl.DataFrame(schema=STATISTICS_SCHEMA)
+    expressions = []
+    for column in columns:
+        values = pl.col(column).cast(pl.Float64).fill_nan(None)
+        expressions.append(pl.struct(
+            count=values.count(),
+            mean=values.mean().fill_null(0.0),
+            m2=((values - values.mean()) ** 2).sum(),
+            min=values.min(),
+            max=values.max(),
+        ).alias(column))
+    row = data.select(expressions).row(0, named=True)
+    return pl.DataFrame([{"feature": column, **row[column]}
+                         for column in columns],
+                        schema=STATISTICS_SCHEMA)
+
+def merge_statistics(previous: pl.DataFrame,
+                     new: pl.DataFrame,
+                     ) -> pl.DataFrame:
+    """
+    Merges the statistics of two parts of the rows with the pairwise
+    update of the mean and variance (Chan et al.).
+
+    Args:
+        previous (pl.DataFrame): The statistics of the first part, see
+            column_statistics.
+        new (pl.DataFrame): The statistics of the second part.
+
+    Returns:
+        statistics (pl.DataFrame): The statistics of both parts.
+    """
+    merged = previous.join(new, on="feature", how="full", coalesce=True,
+                           suffix="_new")
+    n_a = pl.col("count").fill_null(0).cast(pl.Float64)
+    n_b = pl.col("count_new").fill_null(0).cast(pl.Float64)
+    n = n_a + n_b
+    delta = pl.col("mean_new").fill_null(0.0) - pl.col("mean").fill_null(0.0)
+    return merged.select(
+        pl.col("feature"),
+        n.cast(pl.UInt64).alias("count"),
+        pl.when(n > 0)
+        .then((n_a * pl.col("mean").fill_null(0.0) +
+               n_b * pl.col("mean_new").fill_null(0.0)) / n)
+        .otherwise(0.0).alias("mean"),
+        pl.when(n > 0)
+        .then(pl.col("m2").fill_null(0.0) + pl.col("m2_new").fill_null(0.0)
+              + delta ** 2 * n_a * n_b / n)
+        .otherwise(0.0).alias("m2"),
+        pl.min_horizontal("min", "min_new").alias("min"),
+        pl.max_horizontal("max", "max_new").alias("max"),
+    )
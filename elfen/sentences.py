@@ -0,0 +1,278 @@
+"""
+This module contains functions to extract sentence-level features, i.e.,
+a table with one row per sentence of the corpus, and to aggregate them to
+document-level features.
+
+The sentence features are computed in one grouped aggregation over the
+token table (see the tokens module), so the documents are not parsed
+again sentence by sentence. The sentence table has the columns:
+
+- doc_id, sentence: The row index of the document in the data and the
+  index of the sentence in the document.
+- Surface features: n_tokens, n_types, n_characters, n_long_words,
+  avg_word_length and ttr.
+- Readability features: n_syllables, n_monosyllables, n_polysyllables,
+  flesch_reading_ease, flesch_kincaid_grade, smog, ari, cli, gunning_fog,
+  lix and rix, computed with one sentence per row.
+- Lexicon features: avg_{rating} per rating of the token table, e.g.,
+  avg_valence or avg_concreteness, and avg_num_synsets if the synsets
+  were counted.
+- Dependency features (optional): tree_depth, the maximum distance of a
+  token from the root; tree_width, the maximum number of children of a
+  token; and tree_branching, the average number of children per token.
+
+Document-level values are derived with aggregate_sentences, e.g., the
+mean, maximum, standard deviation or percentiles of the sentence values.
+The mean of tree_depth is the document-level tree_depth, and the maximum
+of tree_width is the document-level tree_width.
+"""
+import numpy as np
+import polars as pl
+
+from .readability import (
+    SYLLABLE_CACHE_DIR,
+    ari_expr,
+    cli_expr,
+    flesch_kincaid_grade_expr,
+    flesch_reading_ease_expr,
+    gunning_fog_expr,
+    lix_expr,
+    rix_expr,
+    smog_expr,
+)
+from .tokens import (
+    PARSE_SCHEMA,
+    get_token_table,
+)
+
+# The readability scores that are computed per sentence
+SENTENCE_READABILITY_EXPRESSIONS = [
+    flesch_reading_ease_expr,
+    flesch_kincaid_grade_expr,
+    smog_expr,
+    ari_expr,
+    cli_expr,
+    gunning_fog_expr,
+    lix_expr,
+    rix_expr,
+]
+
+AGGREGATION_MAP = {
+    "mean": lambda column: column.mean(),
+    "median": lambda column: column.median(),
+    "min": lambda column: column.min(),
+    "max": lambda column: column.max(),
+    "std": lambda column: column.std(),
+    "sum": lambda column: column.sum(),
+}
+
+def get_sentence_table(data: pl.DataFrame,
+                       backbone: str = "spacy",
+                       language: str = "en",
+                       lexicons: dict[str, pl.DataFrame] | None = None,
+                       dependency: bool = True,
+                       threshold: int = 6,
+                       offset: int = 0,
+                       cache_dir: str | None = SYLLABLE_CACHE_DIR,
+                       **kwargs: dict[str, str],
+                       ) -> pl.DataFrame:
+    """
+    Gets the sentence-level features of the parsed documents. See the
+    module documentation for the columns.
+
+    Args:
+        data (pl.DataFrame):
+            The data with the parsed documents in the 'nlp' column.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        language (str): The language of the text data.
+                Defaults to English ('en').
+        lexicons (dict[str, pl.DataFrame] | None):
+            The lexicons to compute the average ratings of, by their name
+            in TOKEN_RATING_MAP, e.g., {'vad': vad_lexicon}. Defaults to
+            None, i.e., no lexicon features.
+        dependency (bool): Whether to compute the dependency features.
+                Defaults to True.
+        threshold (int): The minimum length of a long word.
+                Defaults to 6.
+        offset (int): The document ID of the first row. Defaults to 0.
+        cache_dir (str | None):
+            The directory of the syllable cache, see count_syllables.
+
+    Returns:
+        sentence_table (pl.DataFrame): One row per sentence.
+    """
+    tokens = get_token_table(data,
+                             backbone=backbone,
+                             language=language,
+                             lexicons=lexicons,
+                             offset=offset,
+                             heads=dependency,
+                             cache_dir=cache_dir)
+    return get_sentence_features(tokens, threshold=threshold)
+
+def get_sentence_features(token_table: pl.DataFrame,
+                          threshold: int = 6,
+                          ) -> pl.DataFrame:
+    """
+    Computes the sentence-level features of a token table, e.g., one
+    written with write_token_table. The dependency features are computed
+    if the token table has the 'head' column, the readability features if
+    it has the 'syllables' column.
+
+    Args:
+        token_table (pl.DataFrame):
+            The token table, sorted by document and position.
+        threshold (int): The minimum length of a long word.
+                Defaults to 6.
+
+    Returns:
+        sentence_table (pl.DataFrame): One row per sentence.
+    """
+    token = pl.col("token")
+    expressions = [
+        pl.len().cast(pl.UInt32).alias("n_tokens"),
+        token.n_unique().cast(pl.UInt32).alias("n_types"),
+        token.str.len_chars().sum().cast(pl.UInt32).alias("n_characters"),
+        (token.str.len_chars() >= threshold).sum().cast(pl.UInt32)
+        .alias("n_long_words"),
+    ]
+    if "syllables" in token_table.columns:
+        syllables = pl.col("syllables")
+        expressions += [
+            syllables.sum().cast(pl.UInt32).alias("n_syllables"),
+            (syllables == 1).sum().cast(pl.UInt32).alias("n_monosyllables"),
+            (syllables >= 3).sum().cast(pl.UInt32).alias("n_polysyllables"),
+        ]
+    if "synsets" in token_table.columns:
+        expressions.append(pl.col("synsets").mean().alias("avg_num_synsets"))
+    # All remaining columns are lexicon ratings
+    ratings = [column for column in token_table.columns
+               if column not in PARSE_SCHEMA
+               and column not in ("syllables", "synsets")]
+    expressions += [pl.col(rating).mean().alias(f"avg_{rating}")
+                    for rating in ratings]
+
+    if "head" in token_table.columns:
+        depths, children = _tree_statistics(token_table)
+        token_table = token_table.with_columns(
+            pl.Series("depth", depths, dtype=pl.UInt32),
+            pl.Series("children", children, dtype=pl.UInt32))
+        expressions += [
+            pl.col("depth").max().alias("tree_depth"),
+            pl.col("children").max().alias("tree_width"),
+            (pl.col("children").sum() / pl.len()).alias("tree_branching"),
+        ]
+
+    sentences = token_table.group_by(["doc_id", "sentence"],
+                                     maintain_order=True).agg(expressions)
+    sentences = sentences.with_columns(
+        (pl.col("n_characters") / pl.col("n_tokens")).alias("avg_word_length"),
+        (pl.col("n_types") / pl.col("n_tokens")).alias("ttr"),
+        pl.lit(1, dtype=pl.UInt32).alias("n_sentences"),
+    )
+    readability = [expression() for expression
+                   in SENTENCE_READABILITY_EXPRESSIONS]
+    readability = [expr for expr in readability
+                   if all(root in sentences.columns
+                          for root in expr.meta.root_names())]
+    return sentences.with_columns(readability).drop("n_sentences")
+
+def aggregate_sentences(sentence_table: pl.DataFrame,
+                        aggregations: list[str] | None = None,
+                        features: list[str] | None = None,
+                        n_docs: int | None = None,
+                        offset: int = 0,
+                        ) -> pl.DataFrame:
+    """
+    Aggregates sentence-level features to document-level features.
+
+    Args:
+        sentence_table (pl.DataFrame): The sentence table, see
+            get_sentence_table.
+        aggregations (list[str] | None):
+            The aggregations, any of 'mean', 'median', 'min', 'max',
+            'std' and 'sum', or percentiles such as 'p90'.
+            Defaults to None, i.e., ['mean'].
+        features (list[str] | None):
+            The sentence features to aggregate. Defaults to all.
+        n_docs (int | None):
+            The number of documents. If given, the result has one row per
+            document from offset to offset + n_docs - 1, with nulls for
+            documents without sentences. Defaults to None, i.e., only the
+            documents in the sentence table.
+        offset (int): The document ID of the first document.
+                Defaults to 0.
+
+    Returns:
+        features (pl.DataFrame):
+            One row per document, with the 'doc_id' column and one
+            column per feature and aggregation named
+            '{feature}_{aggregation}', e.g., 'tree_depth_mean'.
+    """
+    if aggregations is None:
+        aggregations = ["mean"]
+    if features is None:
+        features = [column for column in sentence_table.columns
+                    if column not in ("doc_id", "sentence")]
+    missing = set(features) - set(sentence_table.columns)
+    if missing:
+        raise ValueError(f"The features {sorted(missing)} are not in the "
+                         "sentence table.")
+    expressions = [_aggregation(aggregation)(pl.col(feature))
+                   .alias(f"{feature}_{aggregation}")
+                   for feature in features
+                   for aggregation in aggregations]
+    documents = sentence_table.group_by("doc_id", maintain_order=True) \
+        .agg(expressions)
+    if n_docs is not None:
+        documents = pl.DataFrame(
+            {"doc_id": pl.arange(offset, offset + n_docs, eager=True)
+             .cast(PARSE_SCHEMA["doc_id"])}
+        ).join(documents, on="doc_id", how="left", maintain_order="left")
+    return documents
+
+def _aggregation(aggregation: str):
+    """
+    Helper function to get the aggregation function by name; 'p{q}' is
+    the q-th percentile.
+    """
+    if aggregation in AGGREGATION_MAP:
+        return AGGREGATION_MAP[aggregation]
+    if aggregation.startswith("p"):
+        try:
+            quantile = float(aggregation[1:]) / 100
+        except ValueError:
+            quantile = -1.0
+        if 0 <= quantile <= 1:
+            return lambda column: column.quantile(quantile,
+                                                  interpolation="linear")
+    raise ValueError(f"Unknown aggregation '{aggregation}'. Available "
+                     f"aggregations are {list(AGGREGATION_MAP)} and "
+                     "percentiles such as 'p90'.")
+
+def _tree_statistics(token_table: pl.DataFrame,
+                     ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Helper function to compute the depth and number of children of every
+    token from the heads. The heads are followed for all tokens at once
+    until every token has reached its root.
+    """
+    rows = np.arange(token_table.height, dtype=np.int64)
+    positions = token_table["position"].to_numpy().astype(np.int64)
+    parents = rows - positions + \
+        token_table["head"].to_numpy().astype(np.int64)
+    is_root = parents == rows
+    children = np.bincount(parents[~is_root], minlength=len(rows))
+
+    depths = np.zeros(len(rows), dtype=np.int64)
+    current = rows
+    active = ~is_root
+    # Bounded by the longest path, guarding against malformed trees
+    for _ in range(len(rows)):
+        if not active.any():
+            break
+        depths += active
+        current = np.where(active, parents[current], current)
+        active = current != parents[current]
+    return depths, children
@@ -0,0 +1,332 @@
+"""
+This module contains a long-running extraction server for low-latency
+feature extraction, e.g., for online scoring.
+
+Constructing an Extractor loads the NLP model, which takes seconds. The
+ExtractionServer loads the model once and keeps it, the lexicons and the
+WordNet tables warm for all requests. Concurrent requests are collected
+into micro-batches: the first waiting request opens a batch, which is
+processed when it holds max_batch_size texts or max_wait seconds have
+passed. Every batch is parsed with a single nlp.pipe call and run through
+the feature pipeline once, and the feature rows are returned to the
+requests they belong to.
+
+The server can be used from Python (submit/extract) or over HTTP on the
+local machine (serve_http):
+
+- POST /extract with the JSON body {"texts": ["...", ...]} returns the
+  features as JSON ({"features": [{...}, ...]}), or as an Arrow IPC
+  stream if the request has the header
+  'Accept: application/vnd.apache.arrow.stream'.
+- GET /health returns {"status": "ok"}.
+
+Corpus-global features (global hapax legomena and dislegomena and the
+global Sichel's S) depend on the other texts of the batch and are not
+extracted by the server. Constant columns are never removed, so that the
+features of a text do not depend on its batch.
+"""
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import queue
+import threading
+import time
+
+import polars as pl
+
+from .configs.extractor_config import (
+    CONFIG_ALL,
+)
+from .extractor import (
+    Extractor,
+)
+from .parallel import (
+    split_global_features,
+)
+from .preprocess import (
+    load_nlp,
+)
+
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+
+# Processed when the server is started, so that the lexicons are loaded
+# before the first request
+WARMUP_TEXT = "This is a warm-up text."
+
+class ExtractionServer:
+    """
+    Extracts features of texts in micro-batches with a model that is
+    loaded once.
+
+    Args:
+        config (dict[str, str]):
+            The extraction configuration. Defaults to CONFIG_ALL.
+        max_batch_size (int): The maximum number of texts per batch.
+                Defaults to 32.
+        max_wait (float):
+            The maximum time in seconds to wait for further requests
+            after the first request of a batch. Defaults to 0.01.
+        nlp (spacy.language.Language | stanza.Pipeline | None):
+            An already loaded NLP pipeline. Defaults to None, i.e., the
+            pipeline is loaded from the model in the config.
+        warmup (bool):
+            Whether to extract the features of a short text when the
+            server is started, which loads the lexicons. Defaults to True.
+        **kwargs:
+            Settings that override the config, e.g., model or language.
+    """
+    def __init__(self,
+                 config: dict[str, str] = CONFIG_ALL,
+                 max_batch_size: int = 32,
+                 max_wait: float = 0.01,
+                 nlp=None,
+                 warmup: bool = True,
+                 **kwargs,
+                 ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("The maximum batch size must be at least 1.")
+        if max_wait < 0:
+            raise ValueError("The maximum wait time must not be negative.")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.config = dict(config, **kwargs)
+        # Features must not depend on the other texts of the batch
+        self.config["features"], _ = split_global_features(
+            self.config["features"])
+        self.config["remove_constant_cols"] = False
+        # Every batch is parsed with one nlp.pipe call in this process
+        self.config["batch_size"] = max_batch_size
+        self.config["n_process"] = 1
+        if nlp is None:
+            nlp = load_nlp(backbone=self.config["backbone"],
+                           model=self.config["model"],
+                           max_length=self.config.get("max_length",
+                                                      1_000_000))
+        self.nlp = nlp
+        # The number of processed batches and texts
+        self.n_batches = 0
+        self.n_texts = 0
+
+        self.__requests = queue.Queue()
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        self.__worker.start()
+        if warmup:
+            self.extract([WARMUP_TEXT])
+            self.n_batches = 0
+            self.n_texts = 0
+
+    def __enter__(self) -> "ExtractionServer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self,
+               texts: list[str],
+               ) -> Future:
+        """
+        Queues texts for extraction.
+
+        Args:
+            texts (list[str]): The texts.
+
+        Returns:
+            future (Future):
+                A future of the features of the texts, a Polars DataFrame
+                with one row per text.
+        """
+        if not all(isinstance(text, str) for text in texts):
+            raise ValueError("The texts must be strings.")
+        future = Future()
+        if not self.__worker.is_alive():
+            raise RuntimeError("The server is closed.")
+        self.__requests.put((list(texts), future))
+        return future
+
+    def extract(self,
+                texts: list[str],
+                timeout: float | None = None,
+                ) -> pl.DataFrame:
+        """
+        Extracts the features of texts, waiting for their batch.
+
+        Args:
+            texts (list[str]): The texts.
+            timeout (float | None): The maximum time to wait in seconds.
+                Defaults to None, i.e., no limit.
+
+        Returns:
+            features (pl.DataFrame): One row per text.
+        """
+        return self.submit(texts).result(timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Processes the queued requests and stops the server.
+        """
+        if self.__worker.is_alive():
+            self.__requests.put(None)
+            self.__worker.join()
+
+    def serve_http(self,
+                   host: str = "127.0.0.1",
+                   port: int = 8000,
+                   ) -> None:
+        """
+        Serves the extraction over HTTP until interrupted, see the module
+        documentation for the endpoints.
+
+        Args:
+            host (str): The host to bind to. Defaults to '127.0.0.1',
+                i.e., the server is only reachable from this machine.
+            port (int): The port to bind to. Defaults to 8000.
+        """
+        httpd = make_http_server(self, host=host, port=port)
+        print(f"Serving elfen features on http://{host}:"
+              f"{httpd.server_address[1]}/extract")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            self.close()
+
+    def __run(self) -> None:
+        """
+        Helper function of the worker thread: collects the queued requests
+        into batches and processes them until the server is closed.
+        """
+        closed = False
+        while not closed:
+            request = self.__requests.get()
+            if request is None:
+                break
+            batch = [request]
+            n_texts = len(request[0])
+            deadline = time.monotonic() + self.max_wait
+            while n_texts < self.max_batch_size:
+                try:
+                    request = self.__requests.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    closed = True
+                    break
+                batch.append(request)
+                n_texts += len(request[0])
+            self.__process(batch)
+
+    def __process(self,
+                  batch: list[tuple[list[str], Future]],
+                  ) -> None:
+        """
+        Helper function to extract the features of a batch and to resolve
+        the futures of its requests.
+        """
+        texts = [text for request_texts, _ in batch
+                 for text in request_texts]
+        try:
+            features = self.__extract_batch(texts)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.n_batches += 1
+        self.n_texts += len(texts)
+        offset = 0
+        for request_texts, future in batch:
+            future.set_result(features.slice(offset, len(request_texts)))
+            offset += len(request_texts)
+
+    def __extract_batch(self,
+                        texts: list[str],
+                        ) -> pl.DataFrame:
+        """
+        Helper function to parse a batch and extract its features.
+        """
+        if not texts:
+            return pl.DataFrame()
+        text_column = self.config["text_column"]
+        # The feature progress of every batch is not printed
+        extractor = Extractor(pl.DataFrame({text_column: texts}),
+                              config=self.config,
+                              nlp=self.nlp,
+                              verbose=False)
+        extractor.extract_features()
+        return extractor.data.drop(
+            [text_column] + [column for column in extractor.helper_cols
+                             if column in extractor.data.columns])
+
+def make_http_server(server: ExtractionServer,
+                     host: str = "127.0.0.1",
+                     port: int = 8000,
+                     ) -> ThreadingHTTPServer:
+    """
+    Creates the HTTP server of an extraction server. Every connection is
+    handled in its own thread, so that concurrent requests are batched.
+
+    Args:
+        server (ExtractionServer): The extraction server.
+        host (str): The host to bind to. Defaults to '127.0.0.1'.
+        port (int): The port to bind to, or 0 for any free port.
+                Defaults to 8000.
+
+    Returns:
+        httpd (ThreadingHTTPServer):
+            The HTTP server, e.g., to run with serve_forever.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/health":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            self._send_json(200, {"status": "ok",
+                                  "n_batches": server.n_batches,
+                                  "n_texts": server.n_texts})
+
+        def do_POST(self) -> None:
+            if self.path != "/extract":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                texts = json.loads(self.rfile.read(length))["texts"]
+                if not isinstance(texts, list):
+                    raise ValueError("'texts' must be a list.")
+                future = server.submit(texts)
+            except (KeyError, TypeError, ValueError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+            try:
+                features = future.result()
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            if ARROW_STREAM_TYPE in self.headers.get("Accept", ""):
+                buffer = io.BytesIO()
+                features.write_ipc_stream(buffer)
+                self._send(200, buffer.getvalue(), ARROW_STREAM_TYPE)
+            else:
+                # NaN is not valid JSON
+                features = features.with_columns(
+                    pl.col(pl.Float32, pl.Float64).fill_nan(None))
+                self._send_json(200, {"features": features.to_dicts()})
+
+        def _send_json(self, status: int, body: dict) -> None:
+            self._send(status, json.dumps(body).encode(), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Requests are not logged
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
@@ -0,0 +1,324 @@
+"""
+This module contains sinks to write extracted features to columnar files
+chunk by chunk.
+
+Compared to CSV, columnar files keep the feature dtypes, are compressed
+and can be read back without parsing. The sinks implemented in this
+module are:
+
+- ParquetSink:
+    Writes a single Parquet file; every chunk is appended as one or more
+    row groups.
+- IPCSink:
+    Writes a single Arrow IPC (Feather v2) file; every chunk is appended
+    as record batches.
+- PartitionedParquetSink:
+    Writes a hive-style partitioned Parquet dataset, i.e., one directory
+    per value of the partition column.
+
+All sinks store the extraction configuration as JSON in the file metadata
+under the key 'elfen_config', see read_config.
+
+Example:
+
+    with ParquetSink("features.parquet", config=config) as sink:
+        for chunk in chunks:
+            sink.write(chunk)
+"""
+import abc
+import json
+import os
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+CONFIG_METADATA_KEY = "elfen_config"
+
+class Sink(abc.ABC):
+    """
+    Base class of the sinks. The schema of the first chunk is used for
+    the whole file; later chunks are aligned to it. Subclasses implement
+    _open, _write and _close.
+
+    Args:
+        path (str): The path of the file or dataset to write.
+        config (dict[str, str] | None):
+            The extraction configuration to store in the file metadata.
+    """
+    def __init__(self,
+                 path: str,
+                 config: dict[str, str] | None = None,
+                 ) -> None:
+        self.path = path
+        self.config = config
+        self.schema = None
+        self.n_rows = 0
+
+    def write(self,
+              data: pl.DataFrame,
+              ) -> None:
+        """
+        Appends a chunk of rows.
+
+        Args:
+            data (pl.DataFrame): The chunk to append. Columns holding
+                Python objects, e.g., the parsed documents, are not
+                written.
+        """
+        table = data.select(pl.exclude(pl.Object)).to_arrow()
+        if self.schema is None:
+            self.schema = table.schema.with_metadata(self._metadata())
+            self._open(self.schema)
+        else:
+            table = self._align(table)
+        self._write(table)
+        self.n_rows += table.num_rows
+
+    def close(self) -> None:
+        """
+        Finishes the file. Does nothing if no chunk was written.
+        """
+        if self.schema is not None:
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _metadata(self) -> dict[bytes, bytes]:
+        """
+        The file metadata holding the extraction configuration.
+        """
+        if self.config is None:
+            return {}
+        return {CONFIG_METADATA_KEY.encode(): json.dumps(
+            self.config, default=str).encode()}
+
+    def _align(self,
+               table: pa.Table,
+               ) -> pa.Table:
+        """
+        Aligns a chunk to the schema of the first chunk: columns are
+        reordered, missing columns are filled with nulls and dtypes are
+        cast, e.g., for columns that are null in all rows of a chunk.
+
+        Raises:
+            ValueError: If a column that is null in all rows of the first
+                chunk, and thus has no dtype in the file, has values.
+        """
+        columns = []
+        for field in self.schema:
+            if field.name not in table.column_names:
+                columns.append(pa.nulls(table.num_rows, type=field.type))
+                continue
+            column = table.column(field.name)
+            if pa.types.is_null(field.type) and \
+                column.null_count < len(column):
+                raise ValueError(
+                    f"Column '{field.name}' is null in all rows of the "
+                    f"first chunk, but has values of type {column.type} "
+                    "in a later chunk. Cast the column to its dtype "
+                    "before writing the first chunk.")
+            if pa.types.is_null(field.type):
+                column = pa.nulls(table.num_rows)
+            columns.append(column)
+        return pa.Table.from_arrays(columns,
+                                    schema=self.schema.remove_metadata()
+                                    ).cast(self.schema)
+
+    @abc.abstractmethod
+    def _open(self, schema: pa.Schema) -> None:
+        """
+        Opens the file with the schema of the first chunk.
+        """
+
+    @abc.abstractmethod
+    def _write(self, table: pa.Table) -> None:
+        """
+        Appends an aligned chunk.
+        """
+
+    @abc.abstractmethod
+    def _close(self) -> None:
+        """
+        Finishes the file.
+        """
+
+class ParquetSink(Sink):
+    """
+    Writes the chunks to a single Parquet file.
+
+    Args:
+        path (str): The path of the Parquet file.
+        config (dict[str, str] | None):
+            The extraction configuration to store in the file metadata.
+        compression (str):
+            The compression codec, e.g., 'zstd', 'snappy', 'lz4', 'gzip'
+            or 'none'. Defaults to 'zstd'.
+        compression_level (int | None):
+            The compression level. Defaults to the default level of the
+            codec.
+        row_group_size (int | None):
+            The maximum number of rows per row group. Defaults to one row
+            group per chunk of at most 1024^2 rows.
+    """
+    def __init__(self,
+                 path: str,
+                 config: dict[str, str] | None = None,
+                 compression: str = "zstd",
+                 compression_level: int | None = None,
+                 row_group_size: int | None = None,
+                 ) -> None:
+        super().__init__(path, config=config)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.writer = None
+
+    def _open(self, schema: pa.Schema) -> None:
+        self.writer = pq.ParquetWriter(
+            self.path,
+            schema,
+            compression=self.compression,
+            compression_level=self.compression_level)
+
+    def _write(self, table: pa.Table) -> None:
+        self.writer.write_table(table, row_group_size=self.row_group_size)
+
+    def _close(self) -> None:
+        self.writer.close()
+
+class IPCSink(Sink):
+    """
+    Writes the chunks to a single Arrow IPC (Feather v2) file, which can
+    be memory-mapped when reading.
+
+    Args:
+        path (str): The path of the IPC file.
+        config (dict[str, str] | None):
+            The extraction configuration to store in the file metadata.
+        compression (str | None):
+            The compression codec, either 'lz4', 'zstd' or None.
+            Defaults to None, which allows memory-mapping.
+        record_batch_size (int | None):
+            The maximum number of rows per record batch. Defaults to one
+            batch per chunk.
+    """
+    def __init__(self,
+                 path: str,
+                 config: dict[str, str] | None = None,
+                 compression: str | None = None,
+                 record_batch_size: int | None = None,
+                 ) -> None:
+        super().__init__(path, config=config)
+        if compression not in ["lz4", "zstd", None]:
+            raise ValueError(f"Unsupported compression '{compression}'. "
+                             "Supported are 'lz4', 'zstd' and None.")
+        self.compression = compression
+        self.record_batch_size = record_batch_size
+        self.writer = None
+
+    def _open(self, schema: pa.Schema) -> None:
+        self.writer = ipc.new_file(
+            self.path,
+            schema,
+            options=ipc.IpcWriteOptions(compression=self.compression))
+
+    def _write(self, table: pa.Table) -> None:
+        self.writer.write_table(table, max_chunksize=self.record_batch_size)
+
+    def _close(self) -> None:
+        self.writer.close()
+
+class PartitionedParquetSink(Sink):
+    """
+    Writes the chunks to a hive-style partitioned Parquet dataset, e.g.,
+    'path/language=en/part-0-0.parquet'. Every chunk adds one file per
+    partition value it contains.
+
+    Args:
+        path (str): The root directory of the dataset.
+        partition_by (str): The column to partition by.
+        config (dict[str, str] | None):
+            The extraction configuration to store in the file metadata.
+        compression (str):
+            The compression codec, e.g., 'zstd', 'snappy', 'lz4', 'gzip'
+            or 'none'. Defaults to 'zstd'.
+        row_group_size (int | None):
+            The maximum number of rows per row group. Defaults to the
+            pyarrow default.
+    """
+    def __init__(self,
+                 path: str,
+                 partition_by: str,
+                 config: dict[str, str] | None = None,
+                 compression: str = "zstd",
+                 row_group_size: int | None = None,
+                 ) -> None:
+        super().__init__(path, config=config)
+        self.partition_by = partition_by
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.n_chunks = 0
+
+    def write(self,
+              data: pl.DataFrame,
+              ) -> None:
+        if self.partition_by not in data.columns:
+            raise ValueError(f"Partition column '{self.partition_by}' "
+                             "not found in the data.")
+        super().write(data)
+
+    def _open(self, schema: pa.Schema) -> None:
+        os.makedirs(self.path, exist_ok=True)
+
+    def _write(self, table: pa.Table) -> None:
+        file_options = ds.ParquetFileFormat().make_write_options(
+            compression=self.compression)
+        ds.write_dataset(
+            table,
+            self.path,
+            format="parquet",
+            schema=self.schema,
+            partitioning=[self.partition_by],
+            partitioning_flavor="hive",
+            # Unique file names per chunk, so that chunks are added to the
+            # partitions instead of replacing each other
+            basename_template=f"part-{self.n_chunks}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=file_options,
+            **({"max_rows_per_group": self.row_group_size,
+                "min_rows_per_group": 0}
+               if self.row_group_size is not None else {}))
+        self.n_chunks += 1
+
+    def _close(self) -> None:
+        pass
+
+def read_config(path: str) -> dict[str, str] | None:
+    """
+    Reads the extraction configuration from the metadata of a file written
+    by a sink.
+
+    Args:
+        path (str): The path of a Parquet or Arrow IPC file.
+
+    Returns:
+        config (dict[str, str] | None):
+            The extraction configuration, or None if the file does not
+            contain one.
+    """
+    try:
+        schema = pq.read_schema(path)
+    except pa.ArrowInvalid:
+        with ipc.open_file(path) as reader:
+            schema = reader.schema
+    metadata = schema.metadata or {}
+    if CONFIG_METADATA_KEY.encode() not in metadata:
+        return None
+    return json.loads(metadata[CONFIG_METADATA_KEY.encode()])
@@ -22,10 +22,13 @@ The surface-level features implemented in this module are:
 - Token Frequencies: The frequency of each token in the text.
 """
 
-from collections import Counter
-
 import polars as pl
 
+from .preprocess import (
+    get_lemmas,
+    get_tokens,
+)
+
 def get_raw_sequence_length(data: pl.DataFrame,
                             text_column: str = 'text',
                             **kwargs: dict[str, str],
@@ -44,9 +47,7 @@ def get_raw_sequence_length(data: pl.DataFrame,
             'raw_sequence_length'.
     """
     data = data.with_columns(
-        pl.col(text_column).map_elements(lambda x: len(x),
-                                         return_dtype=pl.UInt16
-                                         ).alias("raw_sequence_length"),
+        raw_sequence_length_expr(text_column=text_column),
     )
     
     return data
@@ -69,21 +70,21 @@ def get_num_tokens(data: pl.DataFrame,
             data. The sequence length is stored in a new column named
             'n_tokens'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(x),
-                                       return_dtype=pl.UInt16
-                                       ).alias("n_tokens"),
-        )
+    if backbone == 'spacy' and 'tokens' in data.columns:
+        n_tokens = pl.col("tokens").list.len()
+    elif backbone == 'spacy':
+        n_tokens = pl.col("nlp").map_elements(lambda x: len(x),
+                                              return_dtype=pl.UInt32)
     elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: x.num_tokens,
-                                       return_dtype=pl.UInt16
-                                       ).alias("n_tokens"),
-        )
+        n_tokens = pl.col("nlp").map_elements(lambda x: x.num_tokens,
+                                              return_dtype=pl.UInt32)
     else:
         raise ValueError(f"Unsupported backbone '{backbone}'. "
                          "Supported backbones are 'spacy' and 'stanza'.")
+
+    data = data.with_columns(
+        n_tokens.cast(pl.UInt32).alias("n_tokens"),
+    )
     
     return data
 
@@ -105,21 +106,9 @@ def get_num_sentences(data: pl.DataFrame,
             text data. The number of sentences is stored in a new column
             named 'n_sentences'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(list(x.sents)),
-                                         return_dtype=pl.UInt16
-                                       ).alias("n_sentences"),
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(x.sentences),
-                                       return_dtype=pl.UInt16
-                                       ).alias("n_sentences"),
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    data = data.with_columns(
+        _num_sentences(data, backbone=backbone).alias("n_sentences"),
+    )
     
     return data
 
@@ -147,53 +136,39 @@ def get_num_tokens_per_sentence(data: pl.DataFrame,
         data = get_num_sentences(data, backbone=backbone)
 
     data = data.with_columns(
-        (pl.col("n_tokens") / pl.col("n_sentences")). \
-            alias("tokens_per_sentence"),
+        n_tokens_per_sentence_expr(),
     )
 
     return data
 
 def get_num_characters(data: pl.DataFrame,
-                    backbone: str = 'spacy',
-                    **kwargs: dict[str, str],
-                    ) -> pl.DataFrame:
-        """
-        Calculates the number of characters in a text.
-        Only takes tokens into account in contrast to
-        get_raw_sequence_length.
-
-        Args:
-            data (pl.DataFrame):
-                A Polars DataFrame containing the text data.
-            backbone (str): The NLP library used to process the text data.
-                    Either 'spacy' or 'stanza'.
-        
-        Returns:
-            data (pl.DataFrame):
-                A Polars DataFrame containing the number of characters in 
-                the text data. The number of characters is stored in a new
-                column named 'n_characters'.
-        """
-        if backbone == 'spacy':
-            data = data.with_columns(
-                pl.col("nlp").map_elements(lambda x: sum(
-                    [len(token.text) for token in x]),
-                    return_dtype=pl.UInt16
-                    ).alias("n_characters"),
-            )
-        elif backbone == 'stanza':
-            data = data.with_columns(
-                pl.col("nlp").map_elements(lambda x: sum(
-                    [len(token.text) for sent
-                     in x.sentences for token in sent.tokens]),
-                    return_dtype=pl.UInt16
-                    ).alias("n_characters"),
-            )
-        else:
-            raise ValueError(f"Unsupported backbone '{backbone}'. "
-                             "Supported backbones are 'spacy' and 'stanza'.")
-        
-        return data
+                       backbone: str = 'spacy',
+                       **kwargs: dict[str, str],
+                       ) -> pl.DataFrame:
+    """
+    Calculates the number of characters in a text.
+    Only takes tokens into account in contrast to
+    get_raw_sequence_length.
+
+    Args:
+        data (pl.DataFrame):
+            A Polars DataFrame containing the text data.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+    
+    Returns:
+        data (pl.DataFrame):
+            A Polars DataFrame containing the number of characters in 
+            the text data. The number of characters is stored in a new
+            column named 'n_characters'.
+    """
+    data, tokens = _surface_tokens(data, backbone=backbone)
+
+    data = data.with_columns(
+        _num_characters(tokens).alias("n_characters"),
+    )
+    
+    return data
 
 def get_chars_per_sentence(data: pl.DataFrame,
                             backbone: str = 'spacy',
@@ -283,12 +258,10 @@ def get_avg_word_length(data: pl.DataFrame,
     if 'n_tokens' not in data.columns:
         data = get_num_tokens(data, backbone=backbone)
     if 'n_characters' not in data.columns:
-        data = get_num_characters(data, text_column=text_column)
+        data = get_num_characters(data, backbone=backbone)
 
     data = data.with_columns(
-        (
-            pl.col("n_characters") / pl.col("n_tokens")
-        ).alias("avg_word_length"),
+        avg_word_length_expr(),
     )
 
     return data
@@ -311,26 +284,11 @@ def get_num_types(data: pl.DataFrame,
             data.
             The number of types is stored in a new column named 'n_types'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp"). \
-                map_elements(lambda x: len(
-                    set([token.text for token in x])),
-                             return_dtype=pl.UInt16
-                             ).alias("n_types"),
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp"). \
-                map_elements(lambda x: len(
-                    set([token.text for sent
-                         in x.sentences for token in sent.tokens])),
-                         return_dtype=pl.UInt16
-                         ).alias("n_types"),
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    data, tokens = _surface_tokens(data, backbone=backbone)
+
+    data = data.with_columns(
+        _num_unique(tokens).alias("n_types"),
+    )
         
     return data
 
@@ -356,27 +314,11 @@ def get_num_long_words(data: pl.DataFrame,
             The number of long words is stored in a new column named 
             'n_long_words'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp"). \
-                map_elements(lambda x: len(
-                    [token for token in x if len(token.text) >= threshold]),
-                             return_dtype=pl.UInt16
-                             ).alias("n_long_words"),
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp"). \
-                map_elements(lambda x: len(
-                    [token for sent
-                     in x.sentences for token in sent.tokens
-                     if len(token.text) >= threshold]),
-                             return_dtype=pl.UInt16
-                             ).alias("n_long_words"),
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    data, tokens = _surface_tokens(data, backbone=backbone)
+
+    data = data.with_columns(
+        _num_long_words(tokens, threshold=threshold).alias("n_long_words"),
+    )
         
     return data
 
@@ -398,26 +340,173 @@ def get_num_lemmas(data: pl.DataFrame,
             the text data. The number of unique lemmas is stored in a new 
             column named 'n_lemmas'.
     """
+    if 'lemmas' not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
+    data = data.with_columns(
+        n_lemmas_expr(),
+    )
+        
+    return data
+
+def raw_sequence_length_expr(text_column: str = 'text',
+                             **kwargs: dict[str, str],
+                             ) -> pl.Expr:
+    """
+    Expression for the raw text length, see get_raw_sequence_length.
+    """
+    return _raw_sequence_length(text_column).alias("raw_sequence_length")
+
+def n_tokens_expr(backbone: str = 'spacy',
+                  **kwargs: dict[str, str],
+                  ) -> pl.Expr | None:
+    """
+    Expression for the number of tokens, see get_num_tokens.
+    Only available for spacy, as the 'tokens' column holds the words
+    rather than the tokens of stanza documents.
+    """
+    if backbone != 'spacy':
+        return None
+    return pl.col("tokens").list.len().cast(pl.UInt32).alias("n_tokens")
+
+def n_tokens_per_sentence_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of tokens per sentence, see
+    get_num_tokens_per_sentence.
+    """
+    return (pl.col("n_tokens") / pl.col("n_sentences")). \
+        alias("tokens_per_sentence")
+
+def n_characters_expr(backbone: str = 'spacy',
+                      **kwargs: dict[str, str],
+                      ) -> pl.Expr | None:
+    """
+    Expression for the number of characters, see get_num_characters.
+    Only available for spacy, see n_tokens_expr.
+    """
+    if backbone != 'spacy':
+        return None
+    return _num_characters(pl.col("tokens")).alias("n_characters")
+
+def avg_word_length_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the average word length, see get_avg_word_length.
+    """
+    return (pl.col("n_characters") / pl.col("n_tokens")
+            ).alias("avg_word_length")
+
+def n_types_expr(backbone: str = 'spacy',
+                 **kwargs: dict[str, str],
+                 ) -> pl.Expr | None:
+    """
+    Expression for the number of types, see get_num_types.
+    Only available for spacy, see n_tokens_expr.
+    """
+    if backbone != 'spacy':
+        return None
+    return _num_unique(pl.col("tokens")).alias("n_types")
+
+def n_long_words_expr(backbone: str = 'spacy',
+                      threshold: int = 6,
+                      **kwargs: dict[str, str],
+                      ) -> pl.Expr | None:
+    """
+    Expression for the number of long words, see get_num_long_words.
+    Only available for spacy, see n_tokens_expr.
+    """
+    if backbone != 'spacy':
+        return None
+    return _num_long_words(pl.col("tokens"), threshold=threshold). \
+        alias("n_long_words")
+
+def n_lemmas_expr(**kwargs: dict[str, str]) -> pl.Expr:
+    """
+    Expression for the number of unique lemmas, see get_num_lemmas.
+    """
+    return _num_unique(pl.col("lemmas")).alias("n_lemmas")
+
+def _surface_tokens(data: pl.DataFrame,
+                    backbone: str = 'spacy',
+                    ) -> tuple[pl.DataFrame, pl.Expr]:
+    """
+    Returns the data and an expression for the token texts the surface
+    features are computed over. For spacy, these are the 'tokens' helper
+    column, which is added if not present. For stanza, the surface
+    features count tokens rather than (multi-)words, so the token texts
+    are gathered from the documents.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the text data.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+
+    Returns:
+        data (pl.DataFrame):
+            The data, with a 'tokens' column for the spacy backbone.
+        tokens (pl.Expr):
+            An expression evaluating to the token texts of each text.
+    """
     if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(set(
-                [token.lemma_ for token in x])),
-                return_dtype=pl.UInt16
-                ).alias("n_lemmas"),
-        )
+        if 'tokens' not in data.columns:
+            data = get_tokens(data, backbone=backbone)
+        tokens = pl.col("tokens")
     elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: len(set(
-                [token.lemma for sent in x.sentences for token
-                 in sent.words])),
-                return_dtype=pl.UInt16
-                ).alias("n_lemmas"),
-        )
+        tokens = pl.lit(pl.Series([[token.text for sent in doc.sentences
+                                    for token in sent.tokens]
+                                   for doc in data['nlp']],
+                                  dtype=pl.List(pl.String)))
     else:
         raise ValueError(f"Unsupported backbone '{backbone}'. "
                          "Supported backbones are 'spacy' and 'stanza'.")
-        
-    return data
+
+    return data, tokens
+
+def _num_sentences(data: pl.DataFrame,
+                   backbone: str = 'spacy',
+                   ) -> pl.Expr:
+    """
+    Returns an expression for the number of sentences per text. The
+    sentences are counted once on the documents, so the expression can
+    be reused without iterating over the documents again.
+    """
+    if backbone == 'spacy':
+        n_sentences = [sum(1 for _ in doc.sents) for doc in data['nlp']]
+    elif backbone == 'stanza':
+        n_sentences = [len(doc.sentences) for doc in data['nlp']]
+    else:
+        raise ValueError(f"Unsupported backbone '{backbone}'. "
+                         "Supported backbones are 'spacy' and 'stanza'.")
+
+    return pl.lit(pl.Series(n_sentences, dtype=pl.UInt32))
+
+def _raw_sequence_length(text_column: str = 'text') -> pl.Expr:
+    """
+    Returns an expression for the number of characters per text.
+    """
+    return pl.col(text_column).str.len_chars().cast(pl.UInt32)
+
+def _num_characters(tokens: pl.Expr) -> pl.Expr:
+    """
+    Returns an expression for the number of characters in the tokens.
+    """
+    return tokens.list.eval(pl.element().str.len_chars()). \
+        list.sum().cast(pl.UInt32)
+
+def _num_unique(words: pl.Expr) -> pl.Expr:
+    """
+    Returns an expression for the number of unique words.
+    """
+    return words.list.n_unique().cast(pl.UInt32)
+
+def _num_long_words(tokens: pl.Expr,
+                    threshold: int = 6,
+                    ) -> pl.Expr:
+    """
+    Returns an expression for the number of tokens with at least
+    `threshold` characters.
+    """
+    return tokens.list.eval(pl.element().str.len_chars() >= threshold). \
+        list.sum().cast(pl.UInt32)
 
 def get_token_freqs(data: pl.DataFrame,
                     backbone: str = 'spacy',
@@ -426,6 +515,9 @@ def get_token_freqs(data: pl.DataFrame,
     """
     Calculates the frequency of each token in the text.
 
+    The frequencies are stored as a native list of structs with the
+    fields 'token' and 'count', one entry per type in the text.
+
     Args:
         data (pl.DataFrame): A Polars DataFrame containing the text data.
         backbone (str): The NLP library used to process the text data.
@@ -437,31 +529,22 @@ def get_token_freqs(data: pl.DataFrame,
             the text data. The frequency of each token is stored in a new 
             column named 'token_freqs'.
     """
-    if backbone == 'spacy':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: dict(
-                Counter([token.text for token in x])),
-                return_dtype=pl.Object
-                ).alias("token_freqs"),
-        )
-    elif backbone == 'stanza':
-        data = data.with_columns(
-            pl.col("nlp").map_elements(lambda x: dict(
-                Counter([token.text for sent in x.sentences for token
-                         in sent.tokens])),
-                return_dtype=pl.Object
-                ).alias("token_freqs"),
-        )
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'tokens' not in data.columns:
+        data = get_tokens(data, backbone=backbone)
+
+    data = data.with_columns(
+        pl.col("tokens").list.eval(
+            pl.element().value_counts().struct.rename_fields(
+                ["token", "count"])
+            ).alias("token_freqs"),
+    )
     
     return data
 
 def get_global_token_frequencies(data: pl.DataFrame,
                                  backbone: str = 'spacy',
                                  **kwargs: dict[str, str],
-                                 ) -> dict[str, int]:
+                                 ) -> pl.DataFrame:
     """
     Calculates the global frequency of each token in the text.
 
@@ -471,30 +554,22 @@ def get_global_token_frequencies(data: pl.DataFrame,
                 Either 'spacy' or 'stanza'.
 
     Returns:
-        token_freqs (dict[str, int]):
-            A dictionary containing the frequency of each token in the text.
+        token_freqs (pl.DataFrame):
+            A Polars DataFrame containing the frequency of each token in
+            the corpus, with the columns 'token' and 'frequency'. Sorted
+            by descending frequency.
     """
-    if backbone == 'spacy':
-        token_freqs = dict(Counter([token.text for text in 
-                                    data["nlp"].to_list() for 
-                                    token in text]
-        ))
-    elif backbone == 'stanza':
-        token_freqs = dict(Counter([token.text for text in
-                                    data["nlp"].to_list() for
-                                    sent in text.sentences for 
-                                    token in sent.tokens]
-        ))
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'tokens' not in data.columns:
+        data = get_tokens(data, backbone=backbone)
+
+    token_freqs = _count_global(data, column="tokens", word_column="token")
 
     return token_freqs
 
 def get_global_lemma_frequencies(data: pl.DataFrame,
                                  backbone: str = 'spacy',
                                  **kwargs: dict[str, str],
-                                 ) -> dict[str, int]:
+                                 ) -> pl.DataFrame:
     """
     Calculates the global frequency of each lemma in the text.
 
@@ -504,23 +579,69 @@ def get_global_lemma_frequencies(data: pl.DataFrame,
                 Either 'spacy' or 'stanza'.
 
     Returns:
-        lemma_freqs (dict[str, int]):
-            A dictionary containing the frequency of each lemma in the text.
+        lemma_freqs (pl.DataFrame):
+            A Polars DataFrame containing the frequency of each lemma in
+            the corpus, with the columns 'lemma' and 'frequency'. Sorted
+            by descending frequency.
     """
-    if backbone == 'spacy':
-        lemma_freqs = dict(Counter([token.lemma_ for text in
-                                    data["nlp"].to_list() for
-                                    token in text]
-        ))
-    elif backbone == 'stanza':
-        lemma_freqs = dict(Counter([token.lemma for text in
-                                    data["nlp"].to_list() for
-                                    sent in text.sentences for
-                                    token in sent.tokens]
-        ))
-    else:
-        raise ValueError(f"Unsupported backbone '{backbone}'. "
-                         "Supported backbones are 'spacy' and 'stanza'.")
+    if 'lemmas' not in data.columns:
+        data = get_lemmas(data, backbone=backbone)
+
+    lemma_freqs = _count_global(data, column="lemmas", word_column="lemma")
 
     return lemma_freqs
 
+def merge_frequencies(tables: list[pl.DataFrame],
+                      word_column: str = 'token',
+                      ) -> pl.DataFrame:
+    """
+    Merges the frequency tables of several parts of a corpus into the
+    frequency table of the whole corpus.
+
+    Args:
+        tables (list[pl.DataFrame]):
+            Frequency tables as returned by get_global_token_frequencies
+            or get_global_lemma_frequencies.
+        word_column (str): The name of the word column, either 'token'
+            or 'lemma'.
+
+    Returns:
+        frequencies (pl.DataFrame):
+            A Polars DataFrame with the columns `word_column` and
+            'frequency'. Sorted by descending frequency.
+    """
+    return (
+        pl.concat(tables)
+        .group_by(word_column)
+        .agg(pl.col("frequency").sum())
+        .sort(["frequency", word_column], descending=[True, False])
+    )
+
+def _count_global(data: pl.DataFrame,
+                  column: str,
+                  word_column: str,
+                  ) -> pl.DataFrame:
+    """
+    Builds a corpus frequency table from a list column of words.
+    Helper function for get_global_token_frequencies and
+    get_global_lemma_frequencies.
+
+    Args:
+        data (pl.DataFrame): A Polars DataFrame containing the list column.
+        column (str): The name of the list column, e.g. 'tokens'.
+        word_column (str): The name of the word column in the output.
+
+    Returns:
+        frequencies (pl.DataFrame):
+            A Polars DataFrame with the columns `word_column` and
+            'frequency'.
+    """
+    return (
+        data
+        .select(pl.col(column).alias(word_column))
+        .explode(word_column, empty_as_null=True)
+        .drop_nulls(word_column)
+        .group_by(word_column)
+        .len(name="frequency")
+        .sort(["frequency", word_column], descending=[True, False])
+    )
@@ -0,0 +1,355 @@
+"""
+This module contains functions to extract token-level features, i.e., a
+long-format table with one row per token of the corpus.
+
+The token table has the columns:
+
+- doc_id: The row index of the document in the data.
+- sentence: The index of the sentence in the document.
+- position: The index of the token in the document.
+- token, lemma, pos, dep: The token text, lemma, universal part-of-speech
+  tag and dependency relation.
+- head: The position of the syntactic head of the token in the document;
+  the head of a root is the root itself (optional).
+- syllables: The number of syllables; null for tokens that are not
+  alphabetic.
+- synsets: The number of WordNet synsets of nouns, verbs, adjectives and
+  adverbs (optional, requires WordNet).
+- One column per lexicon rating, e.g., valence, concreteness, aoa or
+  {var}_sensorimotor; null for lemmas that are not in the lexicon.
+
+The parse table is built from all documents at once; for spaCy, the token
+attributes are read as arrays of string hashes and decoded once per
+unique value. Syllable and synset counts are computed once per word type,
+and the ratings are attached with one join per lexicon on the lemma, as
+in the document-level rating features. Document-level features can thus
+be defined as aggregations over the token table, e.g.:
+
+    tokens.group_by("doc_id").agg(pl.col("valence").mean())
+
+For large corpora, write_token_table writes the table in chunks of
+documents to Parquet.
+"""
+import numpy as np
+import polars as pl
+
+from .readability import (
+    SYLLABLE_CACHE_DIR,
+    count_syllables,
+)
+from .resource_utils.psycholinguistics import (
+    SENSORIMOTOR_VARS,
+)
+from .resources import (
+    LANGUAGES_NRC,
+)
+from .sinks import (
+    ParquetSink,
+)
+from .util import (
+    upos_to_wn,
+)
+
+PARSE_SCHEMA = {
+    "doc_id": pl.UInt32,
+    "sentence": pl.UInt32,
+    "position": pl.UInt32,
+    "token": pl.String,
+    "lemma": pl.String,
+    "pos": pl.String,
+    "dep": pl.String,
+    "head": pl.UInt32,
+}
+
+# The lexicon ratings available per token: the feature whose lexicon is
+# used, the word column of the lexicon and the rating columns by name in
+# the token table
+TOKEN_RATING_MAP = {
+    "vad": {
+        "feature": "avg_valence",
+        "word_column": lambda language: "word" if language == "en"
+        else LANGUAGES_NRC[language],
+        "ratings": lambda language: {"valence": "valence",
+                                     "arousal": "arousal",
+                                     "dominance": "dominance"},
+    },
+    "concreteness": {
+        "feature": "avg_concreteness",
+        "word_column": lambda language: "Word",
+        "ratings": lambda language: {"Conc.M": "concreteness"},
+    },
+    "aoa": {
+        "feature": "avg_aoa",
+        "word_column": lambda language: "Word",
+        "ratings": lambda language: {"Rating.Mean": "aoa"},
+    },
+    "prevalence": {
+        "feature": "avg_prevalence",
+        "word_column": lambda language: "Word",
+        "ratings": lambda language: {"Prevalence": "prevalence"},
+    },
+    "socialness": {
+        "feature": "avg_socialness",
+        "word_column": lambda language: "Word",
+        "ratings": lambda language: {"Mean": "socialness"},
+    },
+    "iconicity": {
+        "feature": "avg_iconicity",
+        "word_column": lambda language: "word",
+        "ratings": lambda language: {"rating": "iconicity"},
+    },
+    "sensorimotor": {
+        "feature": "avg_sensorimotor",
+        "word_column": lambda language: "Word",
+        "ratings": lambda language: {
+            f"{var}.mean": f"{var}_sensorimotor"
+            for var in SENSORIMOTOR_VARS[language]},
+    },
+}
+
+SYNSET_POS_TAGS = ["NOUN", "VERB", "ADJ", "ADV"]
+
+def get_parse_table(data: pl.DataFrame,
+                    backbone: str = "spacy",
+                    offset: int = 0,
+                    heads: bool = False,
+                    ) -> pl.DataFrame:
+    """
+    Gets the token attributes of the parsed documents as a long-format
+    table.
+
+    Args:
+        data (pl.DataFrame):
+            The data with the parsed documents in the 'nlp' column.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        offset (int): The document ID of the first row. Defaults to 0.
+        heads (bool): Whether to add the 'head' column. Defaults to False.
+
+    Returns:
+        parse_table (pl.DataFrame):
+            One row per token, with the columns 'doc_id', 'sentence',
+            'position', 'token', 'lemma', 'pos', 'dep' and optionally
+            'head'.
+    """
+    if backbone == "spacy":
+        table = _spacy_parse_table(data["nlp"].to_list(), offset)
+    elif backbone == "stanza":
+        table = _stanza_parse_table(data["nlp"].to_list(), offset)
+    else:
+        raise ValueError(f"Unsupported backbone: {backbone}")
+    return table if heads else table.drop("head")
+
+def get_token_table(data: pl.DataFrame,
+                    backbone: str = "spacy",
+                    language: str = "en",
+                    lexicons: dict[str, pl.DataFrame] | None = None,
+                    syllables: bool = True,
+                    synsets: bool = False,
+                    offset: int = 0,
+                    heads: bool = False,
+                    cache_dir: str | None = SYLLABLE_CACHE_DIR,
+                    **kwargs: dict[str, str],
+                    ) -> pl.DataFrame:
+    """
+    Gets the token-level features of the parsed documents. See the module
+    documentation for the columns.
+
+    Args:
+        data (pl.DataFrame):
+            The data with the parsed documents in the 'nlp' column.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        language (str): The language of the text data.
+                Defaults to English ('en').
+        lexicons (dict[str, pl.DataFrame] | None):
+            The lexicons to attach the ratings of, by their name in
+            TOKEN_RATING_MAP, e.g., {'vad': vad_lexicon}. Defaults to
+            None, i.e., no ratings.
+        syllables (bool): Whether to count the syllables of the tokens.
+                Defaults to True.
+        synsets (bool): Whether to count the WordNet synsets of the
+                tokens. Requires the WordNet of the language.
+                Defaults to False.
+        offset (int): The document ID of the first row. Defaults to 0.
+        heads (bool): Whether to add the 'head' column. Defaults to False.
+        cache_dir (str | None):
+            The directory of the syllable cache, see count_syllables.
+
+    Returns:
+        token_table (pl.DataFrame): One row per token.
+    """
+    tokens = get_parse_table(data, backbone=backbone, offset=offset,
+                             heads=heads)
+
+    if syllables:
+        words = tokens["token"].str.to_lowercase().unique().to_list()
+        counts = count_syllables(words, language=language,
+                                 cache_dir=cache_dir)
+        tokens = tokens.with_columns(
+            pl.col("token").str.to_lowercase().replace_strict(
+                words,
+                [counts[word] for word in words],
+                default=None,
+                return_dtype=pl.UInt32).alias("syllables"))
+
+    if synsets:
+        tokens = tokens.join(_synset_counts(tokens, language),
+                             on=["token", "pos"],
+                             how="left",
+                             maintain_order="left")
+
+    for name, lexicon in (lexicons or {}).items():
+        if name not in TOKEN_RATING_MAP:
+            raise ValueError(f"Unknown token rating '{name}'. Available "
+                             f"ratings are {list(TOKEN_RATING_MAP)}.")
+        word_column = TOKEN_RATING_MAP[name]["word_column"](language)
+        ratings = TOKEN_RATING_MAP[name]["ratings"](language)
+        # Words rated more than once would duplicate tokens
+        tokens = tokens.join(
+            lexicon.select(
+                pl.col(word_column).alias("lemma"),
+                *[pl.col(column).cast(pl.Float64).alias(rating)
+                  for column, rating in ratings.items()],
+            ).unique("lemma", keep="first", maintain_order=True),
+            on="lemma",
+            how="left",
+            maintain_order="left")
+
+    return tokens
+
+def write_token_table(data: pl.DataFrame,
+                      path: str,
+                      backbone: str = "spacy",
+                      chunk_size: int = 1_000,
+                      compression: str = "zstd",
+                      config: dict[str, str] | None = None,
+                      **kwargs: dict[str, str],
+                      ) -> int:
+    """
+    Writes the token-level features to a Parquet file in chunks of
+    documents, so that the token table of the whole corpus is never held
+    in memory.
+
+    Args:
+        data (pl.DataFrame):
+            The data with the parsed documents in the 'nlp' column.
+        path (str): The path of the Parquet file.
+        backbone (str): The NLP library used to process the text data.
+                Either 'spacy' or 'stanza'.
+        chunk_size (int): The number of documents per chunk.
+                Defaults to 1000.
+        compression (str): The Parquet compression codec.
+                Defaults to 'zstd'.
+        config (dict[str, str] | None):
+            The extraction configuration to store in the file metadata.
+        **kwargs: Additional keyword arguments for get_token_table, e.g.,
+            the lexicons.
+
+    Returns:
+        n_tokens (int): The number of rows written.
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1.")
+    with ParquetSink(path, config=config, compression=compression) as sink:
+        for offset in range(0, data.height, chunk_size):
+            sink.write(get_token_table(data.slice(offset, chunk_size),
+                                       backbone=backbone,
+                                       offset=offset,
+                                       **kwargs))
+        return sink.n_rows
+
+def _spacy_parse_table(docs: list,
+                       offset: int,
+                       ) -> pl.DataFrame:
+    """
+    Helper function to build the parse table of spaCy documents from the
+    attribute arrays of the documents. The string hashes are decoded once
+    per unique value.
+    """
+    from spacy.attrs import DEP, HEAD, LEMMA, ORTH, POS, SENT_START
+
+    attributes = [ORTH, LEMMA, POS, DEP]
+    lengths = np.array([len(doc) for doc in docs], dtype=np.int64)
+    if lengths.sum() == 0:
+        return pl.DataFrame(schema=PARSE_SCHEMA)
+    arrays = np.concatenate([doc.to_array(attributes + [SENT_START, HEAD])
+                             for doc in docs if len(doc) > 0])
+
+    starts = np.cumsum(lengths) - lengths
+    doc_ids = np.repeat(np.arange(len(docs), dtype=np.int64), lengths)
+    positions = np.arange(len(arrays)) - np.repeat(starts, lengths)
+    # A sentence starts at every SENT_START of 1 and at every document
+    is_start = (arrays[:, -2] == 1) | (positions == 0)
+    sentence_starts = np.cumsum(is_start)
+    doc_first_sentence = np.repeat(sentence_starts[starts[lengths > 0]],
+                                   lengths[lengths > 0])
+
+    strings = docs[0].vocab.strings
+    table = {
+        "doc_id": doc_ids + offset,
+        "sentence": sentence_starts - doc_first_sentence,
+        "position": positions,
+    }
+    for name, column in zip(["token", "lemma", "pos", "dep"],
+                            arrays[:, :-2].T):
+        hashes, inverse = np.unique(column, return_inverse=True)
+        decoded = np.array([strings[int(h)] if h else "" for h in hashes],
+                           dtype=object)
+        table[name] = decoded[inverse]
+    # The heads are stored as offsets relative to the token
+    table["head"] = positions + arrays[:, -1].astype(np.uint64) \
+        .view(np.int64)
+    return pl.DataFrame(table).cast(PARSE_SCHEMA)
+
+def _stanza_parse_table(docs: list,
+                        offset: int,
+                        ) -> pl.DataFrame:
+    """
+    Helper function to build the parse table of stanza documents.
+    """
+    table = {column: [] for column in PARSE_SCHEMA}
+    for doc_id, doc in enumerate(docs):
+        position = 0
+        for sentence, sent in enumerate(doc.sentences):
+            # Word IDs and heads are 1-based within the sentence
+            start = position - 1
+            for word in sent.words:
+                table["doc_id"].append(doc_id + offset)
+                table["sentence"].append(sentence)
+                table["position"].append(position)
+                table["token"].append(word.text)
+                table["lemma"].append(word.lemma)
+                table["pos"].append(word.upos)
+                table["dep"].append(word.deprel)
+                table["head"].append(start + word.head if word.head
+                                     else position)
+                position += 1
+    return pl.DataFrame(table, schema=PARSE_SCHEMA)
+
+def _synset_counts(tokens: pl.DataFrame,
+                   language: str,
+                   ) -> pl.DataFrame:
+    """
+    Helper function to count the WordNet synsets of every unique pair of
+    token and part-of-speech tag, for nouns, verbs, adjectives and
+    adverbs.
+    """
+    import wn
+
+    try:
+        wn.synsets('dog', lang=language)
+    except Exception as e:
+        raise ValueError(f"WordNet not found for '{language}'. "
+                         "Please download the appropriate WordNet.\n"
+                         "Check download instructions at "
+                         "https://elfen.readthedocs.io/en/latest/installation.html#third-party-resources\n"
+                         f"Original error message from the 'wn' package: {e}")
+
+    pairs = tokens.filter(pl.col("pos").is_in(SYNSET_POS_TAGS)) \
+        .select("token", "pos").unique()
+    return pairs.with_columns(pl.Series(
+        "synsets",
+        [len(wn.synsets(token, lang=language, pos=upos_to_wn(pos)))
+         for token, pos in pairs.iter_rows()],
+        dtype=pl.UInt32))
@@ -0,0 +1,20 @@
+import pytest
+import spacy
+
+@pytest.fixture
+def blank_nlp():
+    """
+    Fixture to provide a blank spacy pipeline with sentence boundaries.
+    """
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+@pytest.fixture
+def blank_model(tmp_path, blank_nlp):
+    """
+    Fixture to provide a blank spacy pipeline with sentence boundaries,
+    saved to disk so that it can be loaded by name.
+    """
+    blank_nlp.to_disk(tmp_path / "blank_en")
+    return str(tmp_path / "blank_en")
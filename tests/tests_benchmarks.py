@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from benchmarks import gate
+from benchmarks.micro import run_micro
+
+def test_run_micro():
+    """
+    Test that the micro-benchmarks run repeatedly on the same grid point.
+    """
+    results = run_micro(modules=["surface", "lexical_richness"],
+                        lengths=[10], sizes=[2], repeat=2)
+    timings = {(r["module"], r["feature"]): r for r in results["results"]}
+    for helper in ["tokens", "lemmas"]:
+        assert timings[("helpers", helper)]["seconds"] is not None
+    assert timings[("surface", "n_tokens")]["error"] is None
+    assert timings[("lexical_richness", "ttr")]["error"] is None
+
+def test_gate(tmp_path, monkeypatch):
+    """
+    Test that the gate writes the baselines and compares a run against
+    them.
+    """
+    monkeypatch.setitem(gate.DEFAULT_GRIDS, "e2e",
+                        {"sizes": [2], "lengths": ["tweet"],
+                         "areas": ["surface"]})
+    monkeypatch.setitem(gate.DEFAULT_GRIDS, "micro",
+                        {"modules": ["surface"], "lengths": [10],
+                         "sizes": [2], "features": None})
+    args = ["--baseline-dir", str(tmp_path), "--repeat", "2"]
+    gate.main(args + ["--update"])
+    for suite in gate.SUITES:
+        with open(tmp_path / f"{suite}.json") as f:
+            assert json.load(f)["results"]
+
+    # Timings of a tiny grid are noise, so nothing may regress
+    with pytest.raises(SystemExit) as exit_info:
+        gate.main(args + ["--time-tolerance", "1000",
+                          "--memory-tolerance", "1000"])
+    assert exit_info.value.code == 0
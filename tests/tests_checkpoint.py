@@ -0,0 +1,97 @@
+import os
+
+import polars as pl
+import pytest
+
+from elfen import Extractor
+from elfen.checkpoint import extract_checkpointed, hash_input
+from elfen.configs.extractor_config import CONFIG_ALL
+
+@pytest.fixture
+def sample_config(blank_model):
+    """
+    Fixture to provide a configuration with local and global features.
+    """
+    return dict(CONFIG_ALL,
+                model=blank_model,
+                features={
+                    "surface": ["n_tokens", "n_types"],
+                    "lexical_richness": ["ttr",
+                                         "n_global_token_hapax_legomena"],
+                })
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample data spanning several chunks.
+    """
+    texts = [f"The dog barked at cat{i // 2}. It slept." for i in range(5)]
+    return pl.DataFrame({'id': list(range(5)), 'text': texts})
+
+def test_resume(tmp_path, sample_data, sample_config, monkeypatch):
+    """
+    Test that an interrupted run resumes from the completed chunks,
+    features and parse, and matches an uninterrupted extraction.
+    """
+    work_dir = str(tmp_path / "work")
+    extract = Extractor.extract
+    calls = []
+    # Interrupt the second chunk after its first feature
+    interrupt_at = [5]
+
+    def interrupted(self, feature, **kwargs):
+        calls.append(feature)
+        if len(calls) == interrupt_at[0]:
+            raise RuntimeError
+        return extract(self, feature, **kwargs)
+
+    monkeypatch.setattr(Extractor, "extract", interrupted)
+    with pytest.raises(RuntimeError):
+        extract_checkpointed(sample_data, work_dir, config=sample_config,
+                             chunk_size=2)
+    assert os.path.exists(os.path.join(work_dir, "chunk_00000.parquet"))
+    assert os.path.exists(os.path.join(work_dir, "chunk_00001",
+                                       "docs.spacy"))
+
+    calls.clear()
+    interrupt_at[0] = None
+    data = extract_checkpointed(sample_data, work_dir, config=sample_config,
+                                chunk_size=2)
+    # The first chunk and the first feature of the second chunk are done
+    assert calls == ["n_types", "ttr"] + ["n_tokens", "n_types", "ttr"]
+
+    monkeypatch.setattr(Extractor, "extract", extract)
+    extractor = Extractor(data=sample_data, config=sample_config)
+    extractor.extract_features()
+    expected = extractor.data
+    for column in ["id", "n_tokens", "n_types", "ttr",
+                   "n_global_token_hapax_legomena"]:
+        assert data[column].to_list() == expected[column].to_list()
+    assert 'tokens' not in data.columns
+
+def test_changed_config(tmp_path, sample_data, sample_config):
+    """
+    Test that a work directory cannot be resumed with another config.
+    """
+    work_dir = str(tmp_path / "work")
+    extract_checkpointed(sample_data, work_dir, config=sample_config,
+                         chunk_size=2)
+    changed = dict(sample_config, features={"surface": ["n_tokens"]})
+    with pytest.raises(ValueError):
+        extract_checkpointed(sample_data, work_dir, config=changed,
+                             chunk_size=2)
+    data = extract_checkpointed(sample_data, work_dir, config=changed,
+                                chunk_size=2, overwrite=True)
+    assert 'n_types' not in data.columns
+
+def test_hash_input():
+    """
+    Test that the input hash only depends on the data, so that it does
+    not change with the Polars version.
+    """
+    data = pl.DataFrame({'id': [0, 1, 2],
+                         'text': ["The dog barked.", "", None]})
+    assert hash_input(data) == \
+        "b742a38b180670bfc67ce31fe67b3b701b968cc14cbcc0613970bff5a5db5b1f"
+    assert hash_input(data) != hash_input(
+        data.with_columns(pl.Series('text', ["The dog", " barked.", None])))
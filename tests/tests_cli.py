@@ -0,0 +1,67 @@
+import json
+
+import polars as pl
+import pytest
+
+from elfen import Extractor
+from elfen.cli import main
+from elfen.configs.extractor_config import CONFIG_ALL
+
+FEATURES = {
+    "surface": ["n_tokens", "n_types"],
+    "lexical_richness": ["ttr", "n_global_token_hapax_legomena"],
+}
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample data spanning several chunks.
+    """
+    texts = [f"The dog barked at cat{i // 2}. It slept." for i in range(5)]
+    return pl.DataFrame({'id': list(range(5)), 'comment': texts})
+
+def test_extract(tmp_path, blank_model, sample_data, capsys):
+    """
+    Test that the extract command reads a CSV file with a YAML config and
+    writes the features of all rows to Parquet, in shards and resumably,
+    without reporting the progress with --quiet.
+    """
+    input_path = str(tmp_path / "input.csv")
+    sample_data.write_csv(input_path)
+    config_path = str(tmp_path / "config.yaml")
+    with open(config_path, "w") as f:
+        f.write(f"model: {blank_model}\n"
+                f"features: {json.dumps(FEATURES)}\n")
+
+    extractor = Extractor(sample_data,
+                          config=dict(CONFIG_ALL, model=blank_model,
+                                      text_column="comment",
+                                      features=FEATURES))
+    extractor.extract_features()
+    expected = extractor.data.drop("nlp")
+    capsys.readouterr()
+
+    output_path = str(tmp_path / "features.parquet")
+    assert main(["extract", input_path, output_path,
+                 "--config", config_path, "--text-column", "comment",
+                 "--chunk-size", "2", "--quiet"]) == 0
+    assert pl.read_parquet(output_path).equals(expected.select(
+        pl.read_parquet(output_path).columns))
+
+    output_path = str(tmp_path / "features.jsonl")
+    work_dir = str(tmp_path / "work")
+    for _ in range(2):
+        assert main(["extract", input_path, output_path,
+                     "--config", config_path, "--text-column", "comment",
+                     "--chunk-size", "2", "--work-dir", work_dir,
+                     "--quiet"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out == "" and captured.err == ""
+    out = pl.read_ndjson(output_path)
+    for column in ["id", "n_tokens", "n_types",
+                   "n_global_token_hapax_legomena"]:
+        assert out[column].to_list() == expected[column].to_list()
+
+    with pytest.raises(SystemExit):
+        main(["extract", input_path, str(tmp_path / "features.xlsx"),
+              "--config", config_path])
@@ -0,0 +1,110 @@
+import math
+
+import polars as pl
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.document import extract_document
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample data with annotated documents.
+    """
+    vocab = spacy.blank("en").vocab
+    docs = [
+        Doc(vocab,
+            words=["The", "happy", "dogs", "barked", ".", "They", "slept",
+                   "."],
+            heads=[2, 2, 3, 3, 3, 6, 6, 6],
+            deps=["det", "amod", "nsubj", "ROOT", "punct",
+                  "nsubj", "ROOT", "punct"],
+            pos=["DET", "ADJ", "NOUN", "VERB", "PUNCT",
+                 "PRON", "VERB", "PUNCT"],
+            lemmas=["the", "happy", "dog", "bark", ".", "they", "sleep",
+                    "."],
+            morphs=["Definite=Def", "Degree=Pos", "Number=Plur",
+                    "Tense=Past", "", "Number=Plur", "Tense=Past", ""]),
+        Doc(vocab,
+            words=["A", "sad", "cat", "sat", "."],
+            heads=[2, 2, 3, 3, 3],
+            deps=["det", "amod", "nsubj", "ROOT", "punct"],
+            pos=["DET", "ADJ", "NOUN", "VERB", "PUNCT"],
+            lemmas=["a", "sad", "cat", "sit", "."],
+            morphs=["Definite=Ind", "Degree=Pos", "Number=Sing",
+                    "Tense=Past", ""]),
+    ]
+    return pl.DataFrame({'text': [doc.text for doc in docs]}).with_columns(
+        pl.Series("nlp", docs, dtype=pl.Object))
+
+def _assert_equal(value, expected):
+    """
+    Assert that two feature values are equal, with NaN equal to NaN.
+    """
+    if isinstance(expected, float) and math.isnan(expected):
+        assert math.isnan(value)
+    else:
+        assert value == pytest.approx(expected)
+
+def test_extract_one(sample_data, blank_nlp):
+    """
+    Test that the single-document path returns the features of the
+    DataFrame path, without corpus-global features.
+    """
+    features = {
+        "surface": ["n_tokens", "n_types", "avg_word_length",
+                    "n_tokens_per_sentence"],
+        "lexical_richness": ["ttr", "maas_index", "yule_k",
+                             "n_global_token_hapax_legomena"],
+        "readability": ["flesch_reading_ease", "n_polysyllables"],
+        "dependency": ["tree_depth", "n_per_dependency_type"],
+        "pos": ["n_lexical_tokens", "n_per_pos"],
+        "morphological": ["n_per_morph_feature"],
+        "information": ["entropy", "compressibility"],
+    }
+    config = dict(CONFIG_ALL, features=features,
+                  remove_constant_cols=False)
+    extractor = Extractor(sample_data, config=config)
+    results = extractor.extract_docs(list(sample_data['nlp']))
+    extractor.extract_features()
+    for i, result in enumerate(results):
+        assert "n_global_token_hapax_legomena" not in result
+        assert "compressibility" in result
+        for column, value in result.items():
+            _assert_equal(value, extractor.data[column][i])
+
+    # Texts are parsed with the pipeline of the extractor
+    extractor = Extractor(pl.DataFrame({'text': ["One."]}),
+                          config=config, nlp=blank_nlp)
+    result = extractor.extract_one("The dog barked. It slept.",
+                                   features=["n_tokens", "n_sentences"])
+    assert result == {"n_tokens": 7, "n_sentences": 2}
+    # The data of the extractor is not changed
+    assert extractor.data.columns == ['text', 'nlp']
+
+def test_rating_features(sample_data):
+    """
+    Test that the rating-based lexicon features match the DataFrame path,
+    including lemmas without and with several ratings.
+    """
+    lexicon = pl.DataFrame({
+        'word': ["happy", "dog", "dog", "sad", "sleep", "bark", "cat"],
+        'valence': [0.9, 0.7, 0.5, 0.1, None, 0.4, 0.6],
+        'arousal': [0.6, 0.5, 0.5, 0.3, 0.1, 0.8, 0.4],
+        'dominance': [0.7, 0.6, 0.6, 0.2, 0.3, 0.5, 0.5],
+    })
+    features = ["avg_valence", "n_low_valence", "n_high_valence",
+                "max_valence", "min_valence", "sd_valence", "sd_arousal"]
+    extractor = Extractor(sample_data, config=dict(CONFIG_ALL, features={}))
+    for feature in features:
+        extractor.extract(feature, lexicon=lexicon)
+    for i, doc in enumerate(sample_data['nlp']):
+        result = extract_document(doc, features,
+                                  lexicons={feature: lexicon
+                                            for feature in features})
+        assert list(result) == features
+        for column, value in result.items():
+            _assert_equal(value, extractor.data[column][i])
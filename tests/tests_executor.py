@@ -0,0 +1,67 @@
+import polars as pl
+import pytest
+
+from elfen.executor import (
+    extract_areas,
+)
+from elfen.features import (
+    FUNCTION_MAP,
+)
+
+@pytest.fixture
+def sample_docs(blank_nlp):
+    """
+    Fixture to provide sample texts parsed with a blank spacy pipeline.
+    """
+    texts = [
+        "The dog barked. The dog slept.",
+        "An extraordinarily long sentence with many different words.",
+        "",
+        "Short one.",
+    ]
+    df = pl.DataFrame({'text': texts}).with_columns(
+        pl.Series("nlp", list(blank_nlp.pipe(texts)), dtype=pl.Object),
+    )
+    return df
+
+FEATURES = {
+    "surface": ["n_tokens", "n_types"],
+    "lexical_richness": ["ttr", "n_hapax_legomena"],
+    "information": ["entropy"],
+    "dependency": ["tree_width"],
+}
+
+def _sequential(data):
+    """
+    Extract the sample features one by one.
+    """
+    for area_features in FEATURES.values():
+        for feature in area_features:
+            data = FUNCTION_MAP[feature](data=data)
+    return data
+
+@pytest.mark.parametrize("n_processes", [0, 2])
+def test_extract_areas(sample_docs, n_processes):
+    """
+    Test that the concurrently extracted areas match the sequential
+    extraction and are merged in the order of the areas.
+    """
+    with pytest.warns(UserWarning):
+        data = extract_areas(sample_docs, FEATURES, n_threads=4,
+                             n_processes=n_processes)
+        expected = _sequential(sample_docs)
+
+    features = [feature for area_features in FEATURES.values()
+                for feature in area_features]
+    assert [column for column in data.columns if column in features] == \
+        features
+    for feature in features:
+        assert data[feature].to_list() == \
+            pytest.approx(expected[feature].to_list(), nan_ok=True)
+
+def test_extract_areas_empty(sample_docs):
+    """
+    Test that nothing is added if there are no features to extract.
+    """
+    data = extract_areas(sample_docs, {"surface": []})
+    assert data.columns == sample_docs.columns
@@ -1,6 +1,7 @@
 import pytest
 import polars as pl
 from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
 
 @pytest.fixture
 def sample_data_en():
@@ -116,6 +117,19 @@ def test_extraction_invalid_feature(sample_data_en):
     extractor.extract("invalid_feature")
     assert 'invalid_feature' not in extractor.data.columns
 
+def test_extraction_only_invalid_features(sample_data_en, blank_model):
+    """
+    Test the extraction of the configured features if none of them is
+    valid.
+    """
+    extractor = Extractor(data=sample_data_en,
+                          config=dict(CONFIG_ALL,
+                                      features={"surface": ["invalid"]},
+                                      model=blank_model,
+                                      remove_constant_cols=True))
+    extractor.extract_features()
+    assert extractor.data.columns == ['text', 'nlp']
+
 def test_initialization_invalid_backbone(sample_data_en):
     """
     Test the extraction with an invalid backbone.
@@ -0,0 +1,60 @@
+import polars as pl
+import pytest
+
+from elfen.generic import (
+    get_avg,
+    get_n_high,
+    get_n_low,
+)
+
+@pytest.fixture
+def sample_lemmas():
+    """
+    Fixture to provide sample lemmas, including a text without lemmas and
+    a text without any lexicon entries.
+    """
+    data = {
+        'text': ["dog cat", "", "unknown", "cat cat mouse"],
+        'lemmas': [
+            ["dog", "cat"],
+            [],
+            ["unknown"],
+            ["cat", "cat", "mouse"],
+        ]
+    }
+    df = pl.DataFrame(data)
+    return df
+
+@pytest.fixture
+def sample_lexicon():
+    """
+    Fixture to provide a sample rating lexicon.
+    """
+    lexicon = pl.DataFrame({
+        'word': ["dog", "cat", "mouse"],
+        'rating': [1.0, 3.0, 5.0],
+    })
+    return lexicon
+
+def test_avg_aligned(sample_lemmas, sample_lexicon):
+    """
+    Test that the averages are aligned with the input rows and that the
+    other columns are kept as they are.
+    """
+    data = get_avg(sample_lemmas, sample_lexicon, "word", "rating",
+                   "avg_rating")
+    assert data.columns == ['text', 'lemmas', 'avg_rating']
+    assert data['text'].to_list() == sample_lemmas['text'].to_list()
+    assert data['avg_rating'].to_list() == \
+        [2.0, None, None, pytest.approx(11 / 3)]
+
+def test_counts_filled(sample_lemmas, sample_lexicon):
+    """
+    Test that counts are zero for texts without matching lemmas.
+    """
+    data = get_n_low(sample_lemmas, sample_lexicon, "word", "rating",
+                     2.0, "n_low_rating")
+    data = get_n_high(data, sample_lexicon, "word", "rating",
+                      4.0, "n_high_rating")
+    assert data['n_low_rating'].to_list() == [1, 0, 0, 0]
+    assert data['n_high_rating'].to_list() == [0, 0, 0, 1]
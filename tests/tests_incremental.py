@@ -0,0 +1,85 @@
+import polars as pl
+import pytest
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.incremental import CorpusState, extract_incremental
+
+@pytest.fixture
+def sample_config(blank_model):
+    """
+    Fixture to provide a configuration with local and global features.
+    """
+    return dict(CONFIG_ALL,
+                model=blank_model,
+                remove_constant_cols=False,
+                features={
+                    "surface": ["n_tokens", "n_types"],
+                    "lexical_richness": ["ttr",
+                                         "n_global_token_hapax_legomena",
+                                         "n_global_token_hapax_dislegomena",
+                                         "global_sichel_s"],
+                })
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample data whose later rows repeat rare tokens of
+    the earlier rows.
+    """
+    texts = ["The dog barked at a cat.",
+             "A bird sang.",
+             "The cat slept.",
+             "The bird barked at the dog.",
+             "A fish swam."]
+    return pl.DataFrame({'id': list(range(5)), 'text': texts})
+
+def test_incremental_matches_full(tmp_path, sample_data, sample_config):
+    """
+    Test that extracting the rows in two batches, with the state saved in
+    between, matches extracting all rows at once.
+    """
+    features, state = extract_incremental(sample_data.head(2),
+                                          config=sample_config)
+    state.save(str(tmp_path / "state"))
+    state = CorpusState.load(str(tmp_path / "state"))
+    features, state = extract_incremental(sample_data.tail(3),
+                                          features=features,
+                                          state=state,
+                                          config=sample_config)
+
+    extractor = Extractor(sample_data, config=sample_config)
+    extractor.extract_features()
+    expected = extractor.data.select(features.columns)
+
+    assert state.n_rows == 5
+    assert features.equals(expected)
+
+    n_tokens = state.statistics.filter(pl.col("feature") == "n_tokens")
+    assert n_tokens["count"][0] == 5
+    assert n_tokens["mean"][0] == pytest.approx(expected["n_tokens"].mean())
+    assert (n_tokens["m2"][0] / 4) ** 0.5 == \
+        pytest.approx(expected["n_tokens"].std())
+
+def test_incremental_state_mismatch(sample_data, sample_config):
+    """
+    Test that a state is rejected for a different configuration or
+    feature table.
+    """
+    features, state = extract_incremental(sample_data.head(2),
+                                          config=sample_config)
+
+    with pytest.raises(ValueError):
+        extract_incremental(sample_data.tail(3),
+                            features=features,
+                            state=state,
+                            config=dict(sample_config, language="de"))
+    with pytest.raises(ValueError):
+        extract_incremental(sample_data.tail(3),
+                            features=features.head(1),
+                            state=state,
+                            config=sample_config)
+    with pytest.raises(ValueError):
+        extract_incremental(sample_data.tail(3),
+                            features=features,
+                            config=sample_config)
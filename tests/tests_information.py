@@ -0,0 +1,59 @@
+import bz2
+import zlib
+
+import numpy as np
+import polars as pl
+import pytest
+
+from elfen.information import (
+    entropy,
+    get_compressibility,
+    get_entropy,
+)
+
+@pytest.fixture
+def sample_texts():
+    """
+    Fixture to provide sample texts for testing.
+    """
+    data = {
+        'text': [
+            "This is a test sentence.",
+            "",
+            "Ünïcödé ☃☃ text",
+        ]
+    }
+    df = pl.DataFrame(data)
+    return df
+
+def test_entropy(sample_texts):
+    """
+    Test that the Polars entropy matches a per-character computation.
+    """
+    data = get_entropy(sample_texts)
+    for text, value in zip(sample_texts['text'], data['entropy']):
+        _, counts = np.unique(np.array(list(text)), return_counts=True)
+        prob = counts / max(len(text), 1)
+        assert value == pytest.approx(-np.sum(prob * np.log2(prob)))
+        assert entropy(text) == pytest.approx(value)
+
+@pytest.mark.parametrize("codec, compress", [
+    ("bz2", lambda x: bz2.compress(x, compresslevel=9)),
+    ("zlib", lambda x: zlib.compress(x, 6)),
+])
+def test_compressibility_codecs(sample_texts, codec, compress):
+    """
+    Test the compressibility for the available codecs.
+    """
+    data = get_compressibility(sample_texts, codec=codec, n_threads=2)
+    text = sample_texts['text'][0]
+    assert data['compressibility'][0] == pytest.approx(
+        len(compress(text.encode('utf-8'))) / len(text))
+    assert data['compressibility'][1] == 0.0
+
+def test_compressibility_invalid_codec(sample_texts):
+    """
+    Test that an unsupported codec raises a ValueError.
+    """
+    with pytest.raises(ValueError):
+        get_compressibility(sample_texts, codec='zip')
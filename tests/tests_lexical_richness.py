@@ -0,0 +1,112 @@
+from collections import Counter
+
+import numpy as np
+import polars as pl
+import pytest
+from scipy.stats import hypergeom
+
+from elfen.lexical_richness import (
+    get_hdd,
+    get_n_global_token_hapax_dislegomena,
+    get_n_global_token_hapax_legomena,
+    get_n_hapax_legomena,
+    get_simpsons_d,
+)
+from elfen.surface import (
+    get_global_token_frequencies,
+    get_token_freqs,
+)
+
+@pytest.fixture
+def sample_tokens():
+    """
+    Fixture to provide pre-tokenized data for testing.
+    """
+    data = {
+        'tokens': [
+            ["a", "b", "a", "c", "d", "a", "b", "e", "f", "g"],
+            [],
+            ["x", "y", "x"],
+        ]
+    }
+    df = pl.DataFrame(data)
+    return df
+
+def test_hdd_matches_scipy(sample_tokens):
+    """
+    Test that the vectorized HD-D equals the per-type scipy computation.
+    """
+    draws = 5
+    data = get_hdd(sample_tokens, draws=draws)
+    for tokens, hdd in zip(sample_tokens['tokens'].to_list(), data['hdd']):
+        freqs = Counter(tokens)
+        expected = sum(hypergeom.pmf(freq, len(tokens), len(freqs), draws)
+                       for freq in freqs.values())
+        if np.isnan(expected):
+            assert np.isnan(hdd)
+        else:
+            assert hdd == pytest.approx(expected)
+
+def test_hdd_empty_text(sample_tokens):
+    """
+    Test that texts without tokens get an HD-D of 0.
+    """
+    data = get_hdd(sample_tokens, draws=2)
+    assert data['hdd'][1] == 0.0
+
+def test_token_freqs_native_dtype(sample_tokens):
+    """
+    Test that token frequencies are stored as a native list of structs.
+    """
+    data = get_token_freqs(sample_tokens)
+    assert data.schema['token_freqs'] == pl.List(
+        pl.Struct({'token': pl.String, 'count': pl.UInt32}))
+    freqs = {row['token']: row['count'] for row in data['token_freqs'][0]}
+    assert freqs == dict(Counter(sample_tokens['tokens'][0]))
+
+def test_n_hapax_legomena(sample_tokens):
+    """
+    Test the number of hapax legomena computed from token frequencies.
+    """
+    data = get_n_hapax_legomena(sample_tokens)
+    assert data['n_hapax_legomena'].to_list() == [5, 0, 1]
+
+def test_simpsons_d(sample_tokens):
+    """
+    Test Simpson's D computed from token frequencies.
+    """
+    data = get_simpsons_d(sample_tokens)
+    # frequencies a: 3, b: 2, others: 1 over 7 types
+    assert data['simpsons_d'][0] == pytest.approx((3 * 2 + 2 * 1) / (7 * 6))
+    assert data['simpsons_d'][1] == 0.0
+
+def test_global_token_frequencies(sample_tokens):
+    """
+    Test the corpus frequency table built from the tokens column.
+    """
+    freqs = get_global_token_frequencies(sample_tokens)
+    assert freqs.columns == ['token', 'frequency']
+    assert freqs['token'][0] == 'a'
+    assert dict(zip(freqs['token'], freqs['frequency'])) == dict(
+        Counter(token for tokens in sample_tokens['tokens']
+                for token in tokens))
+
+def test_n_global_token_hapax(sample_tokens):
+    """
+    Test the global hapax legomena and dislegomena counts.
+    """
+    data = get_n_global_token_hapax_legomena(sample_tokens)
+    data = get_n_global_token_hapax_dislegomena(data)
+    assert data['n_global_token_hapax_legomena'].to_list() == [5, 0, 1]
+    assert data['n_global_token_hapax_dislegomena'].to_list() == [7, 0, 3]
+
+def test_n_global_token_hapax_with_frequencies(sample_tokens):
+    """
+    Test that global hapax legomena can be counted against the frequency
+    table of a larger corpus.
+    """
+    corpus = pl.concat([sample_tokens, pl.DataFrame({'tokens': [["c"]]})])
+    frequencies = get_global_token_frequencies(corpus)
+    data = get_n_global_token_hapax_legomena(sample_tokens,
+                                             frequencies=frequencies)
+    assert data['n_global_token_hapax_legomena'].to_list() == [4, 0, 1]
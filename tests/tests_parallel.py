@@ -0,0 +1,64 @@
+import polars as pl
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.parallel import (
+    extract_sharded,
+    get_part_frequencies,
+    reduce_global_features,
+)
+
+def test_extract_sharded(blank_model):
+    """
+    Test that the sharded extraction keeps the row order and that the
+    global features are computed on the whole corpus.
+    """
+    texts = [f"The dog barked at cat{i // 2}. It slept." for i in range(9)]
+    df = pl.DataFrame({'id': list(range(9)), 'text': texts})
+    config = dict(CONFIG_ALL,
+                  model=blank_model,
+                  features={
+                      "surface": ["n_tokens", "n_types"],
+                      "lexical_richness": [
+                          "ttr",
+                          "n_global_token_hapax_legomena",
+                          "n_global_token_hapax_dislegomena",
+                      ],
+                  })
+
+    data = extract_sharded(df, config=config, n_workers=2, n_shards=3)
+
+    extractor = Extractor(data=df, config=config)
+    extractor.extract_features()
+    expected = extractor.data
+
+    assert data['id'].to_list() == list(range(9))
+    assert 'tokens' not in data.columns
+    for column in ["n_tokens", "n_types", "ttr",
+                   "n_global_token_hapax_legomena",
+                   "n_global_token_hapax_dislegomena"]:
+        assert data[column].to_list() == expected[column].to_list()
+    # cat0 ... cat3 occur twice across shard boundaries, cat4 once
+    assert data['n_global_token_hapax_legomena'].to_list() == \
+        [0] * 8 + [1]
+
+def test_global_sichel_s_without_docs(blank_nlp):
+    """
+    Test that the global Sichel's S is computed after the parts are
+    merged without the parsed documents, from the carried number of types.
+    """
+    texts = ["The dog barked. The cat slept.", "A cat barked."]
+    df = pl.DataFrame({'text': texts}).with_columns(
+        pl.Series("nlp", list(blank_nlp.pipe(texts)), dtype=pl.Object))
+    parts = [get_part_frequencies(df.slice(offset, 1), ["global_sichel_s"])
+             for offset in range(df.height)]
+    # With stanza, the number of types can only be counted on the parts
+    assert all("n_types" in part.columns for part, _ in parts)
+    merged = pl.concat([part.drop("nlp") for part, _ in parts])
+    data = reduce_global_features(merged, ["global_sichel_s"],
+                                  [frequencies for _, frequencies in parts])
+
+    expected = Extractor(data=df, config=dict(CONFIG_ALL, features={}))
+    expected.extract("global_sichel_s")
+    assert data['global_sichel_s'].to_list() == \
+        expected.data['global_sichel_s'].to_list()
@@ -0,0 +1,105 @@
+import numpy as np
+import polars as pl
+import pytest
+import spacy
+
+from elfen import Extractor
+from elfen.features import (
+    EXPRESSION_MAP,
+    FUNCTION_MAP,
+)
+from elfen.plan import (
+    collect_plan,
+    plan_features,
+)
+
+@pytest.fixture
+def sample_docs(blank_model):
+    """
+    Fixture to provide sample texts parsed with the blank pipeline.
+    """
+    nlp = spacy.load(blank_model)
+    texts = [
+        "The dog barked. The dog slept.",
+        "An extraordinarily long sentence with many different words.",
+        "",
+    ]
+    df = pl.DataFrame({'text': texts}).with_columns(
+        pl.Series("nlp", list(nlp.pipe(texts)), dtype=pl.Object),
+    )
+    return df
+
+def test_plan_matches_eager(sample_docs):
+    """
+    Test that the planned features match the eager feature functions.
+    """
+    features = ["ttr", "herdan_v", "n_hapax_legomena", "yule_k",
+                "flesch_reading_ease", "n_tokens_per_sentence", "entropy"]
+    data, stages = plan_features(sample_docs, features, cache_dir=None)
+    # Helper columns and features without expression builders are
+    # materialized eagerly
+    assert {'tokens', 'token_freqs', 'n_sentences'} <= set(data.columns)
+    # herdan_v depends on yule_k, which depends on n_tokens
+    assert len(stages) == 3
+
+    with pytest.warns(UserWarning):
+        planned = collect_plan(data, stages)
+        eager = sample_docs
+        for feature in features:
+            eager = FUNCTION_MAP[feature](data=eager, cache_dir=None)
+
+    for column in ["ttr", "herdan_v", "n_hapax_legomena", "yule_k",
+                   "flesch_reading_ease", "tokens_per_sentence",
+                   "entropy"]:
+        np.testing.assert_allclose(
+            planned[column].cast(pl.Float64).to_numpy(),
+            eager[column].cast(pl.Float64).to_numpy())
+
+def test_plan_stanza_fallback():
+    """
+    Test that features without an expression for a backbone are not
+    planned.
+    """
+    assert EXPRESSION_MAP["n_types"](backbone='stanza') is None
+    assert EXPRESSION_MAP["n_lemmas"](backbone='stanza') is not None
+
+def test_lazy_extractor(blank_model):
+    """
+    Test that the lazy Extractor produces the same features as the eager
+    one.
+    """
+    df = pl.DataFrame({'text': ["This is a test sentence. And another.",
+                                "Yet another test sentence."]})
+    results = []
+    for lazy in [False, True]:
+        extractor = Extractor(data=df,
+                              backbone='spacy',
+                              text_column='text',
+                              language='en',
+                              model=blank_model,
+                              lazy=lazy)
+        extractor.extract(["ttr", "n_long_words", "n_sentences"],
+                          threshold=4)
+        results.append(extractor.data)
+    eager, lazy = results
+    for column in ["ttr", "n_long_words", "n_sentences"]:
+        assert lazy[column].to_list() == eager[column].to_list()
+    assert lazy['n_long_words'].to_list() == [4, 3]
+
+def test_eager_extractor_buffers_columns(blank_model):
+    """
+    Test that buffered feature columns are attached once, also if a
+    feature is requested more than once.
+    """
+    df = pl.DataFrame({'text': ["This is a test sentence. And another.",
+                                "Yet another test sentence."]})
+    extractor = Extractor(data=df,
+                          backbone='spacy',
+                          text_column='text',
+                          language='en',
+                          model=blank_model)
+    extractor.extract(["n_tokens", "ttr", "ttr", "n_types"])
+    assert extractor.data.columns.count("ttr") == 1
+    data = extractor.data
+    assert data['ttr'].to_list() == pytest.approx(
+        (data['n_types'] / data['n_tokens']).to_list())
@@ -0,0 +1,58 @@
+import json
+import os
+
+import polars as pl
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+
+def test_profile(tmp_path, blank_model):
+    """
+    Test that parsing and every feature call are recorded with their
+    output columns and exported as JSON.
+    """
+    data = pl.DataFrame({'text': ["The dog barked. It slept.",
+                                  "A cat sat."]})
+    extractor = Extractor(data,
+                          config=dict(CONFIG_ALL, model=blank_model),
+                          trace_memory=True)
+    extractor.extract(["ttr", "compressibility"])
+
+    profile = extractor.profile(str(tmp_path / "profile.json"))
+    assert profile["stage"].to_list() == ["parse", "feature", "feature"]
+    assert profile["name"].to_list()[1:] == ["ttr", "compressibility"]
+    assert "ttr" in profile["output_columns"][1].to_list()
+    assert profile["output_columns"][2].to_list() == ["compressibility"]
+    assert (profile["wall_time"] >= 0).all()
+    assert (profile["peak_memory"] > 0).all()
+    assert (profile["rows"] == 2).all()
+
+    with open(tmp_path / "profile.json") as f:
+        assert len(json.load(f)) == 3
+
+def test_call_profiles(tmp_path, blank_model):
+    """
+    Test that every feature call of a profiled extraction writes a call
+    profile and that the profiles are aggregated into hotspots.
+    """
+    data = pl.DataFrame({'text': ["The dog barked. It slept.",
+                                  "A cat sat."]})
+    extractor = Extractor(data, config=dict(CONFIG_ALL, model=blank_model))
+    extractor.extract(["ttr", "n_tokens", "compressibility"],
+                      profile=str(tmp_path / "profiles"))
+    extractor.extract("n_types")
+
+    profile = extractor.profile()
+    # Features with native expressions are measured on their own, too
+    assert profile["name"].to_list()[1:4] == \
+        ["ttr", "n_tokens", "compressibility"]
+    paths = profile["profile_path"].to_list()
+    assert paths[0] is None and paths[-1] is None
+    assert all(os.path.exists(path) for path in paths[1:4])
+    assert (tmp_path / "profiles" / "hotspots.csv").exists()
+
+    hotspots = extractor.hotspots(top=5)
+    assert hotspots.height == 5
+    assert hotspots["total_time"].is_sorted(descending=True)
+    assert set(hotspots["steps"].explode(empty_as_null=True)) <= \
+        {"ttr", "n_tokens", "compressibility"}
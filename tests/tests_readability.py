@@ -0,0 +1,55 @@
+import os
+
+import polars as pl
+import pytest
+
+from elfen import readability
+from elfen.readability import (
+    count_syllables,
+    get_num_polysyllables,
+    get_num_syllables,
+)
+
+def test_long_document():
+    """
+    Test that the syllable counts of long documents do not overflow.
+    """
+    data = pl.DataFrame({'tokens': [["extraordinary"] * 20_000]})
+    data = get_num_syllables(data, cache_dir=None)
+    data = get_num_polysyllables(data, cache_dir=None)
+    assert data['n_syllables'].to_list() == [100_000]
+    assert data['n_polysyllables'].to_list() == [20_000]
+
+def test_syllable_cache(tmp_path, monkeypatch):
+    """
+    Test that the syllable cache is persisted and reloaded, and that
+    concurrent processes keep each other's words.
+    """
+    monkeypatch.setattr(readability, "_SYLLABLE_CACHE", {})
+    # An in-memory cache does not hide the persisted cache
+    count_syllables(["dog"], cache_dir=None)
+    counts = count_syllables(["beautiful", "..."], cache_dir=str(tmp_path))
+    assert counts == {"beautiful": 3, "...": None}
+    assert os.listdir(tmp_path) == ["syllables_en_US.parquet"]
+
+    # Another process adds a word to the persisted cache
+    cache = readability._SYLLABLE_CACHE
+    monkeypatch.setattr(readability, "_SYLLABLE_CACHE", {})
+    count_syllables(["cat"], cache_dir=str(tmp_path))
+    monkeypatch.setattr(readability, "_SYLLABLE_CACHE", cache)
+    count_syllables(["dog"], cache_dir=str(tmp_path))
+    persisted = pl.read_parquet(tmp_path / "syllables_en_US.parquet")
+    assert sorted(persisted['word']) == ["...", "beautiful", "cat", "dog"]
+
+    monkeypatch.setattr(readability, "_SYLLABLE_CACHE", {})
+    monkeypatch.setattr(readability.pyphen, "Pyphen", None)
+    # Served from the persisted cache without hyphenating again
+    assert count_syllables(["beautiful"], cache_dir=str(tmp_path)) == \
+        {"beautiful": 3}
+
+def test_unsupported_language():
+    """
+    Test that an unsupported language raises an error.
+    """
+    with pytest.raises(NotImplementedError):
+        count_syllables(["word"], language="xx", cache_dir=None)
@@ -0,0 +1,57 @@
+import polars as pl
+import pytest
+
+from elfen.scaling import FeatureScaler
+from elfen.util import normalize_column, rescale_column
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample feature columns for testing.
+    """
+    return pl.DataFrame({
+        'feature_a': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        'feature_b': [10, 0, 5, 5, 20, 2],
+        'text': ["a", "b", "c", "d", "e", "f"],
+    })
+
+def test_fit_transform(sample_data):
+    """
+    Test that the scaler matches the column-wise functions.
+    """
+    normalized = FeatureScaler().fit_transform(sample_data,
+                                               ['feature_a', 'feature_b'])
+    rescaled = FeatureScaler(method="rescale", minimum=1.0, maximum=5.0) \
+        .fit_transform(sample_data, ['feature_a', 'feature_b'])
+    for column in ['feature_a', 'feature_b']:
+        assert normalized[column].to_list() == pytest.approx(
+            normalize_column(sample_data, column)[column].to_list())
+        assert rescaled[column].to_list() == pytest.approx(
+            rescale_column(sample_data, column, 1.0, 5.0)[column].to_list())
+    assert normalized['text'].to_list() == sample_data['text'].to_list()
+
+def test_partial_fit_save_load(tmp_path, sample_data):
+    """
+    Test that fitting chunk by chunk gives the statistics of the whole
+    data, and that a saved scaler transforms new data the same way.
+    """
+    features = ['feature_a', 'feature_b']
+    full = FeatureScaler().fit(sample_data, features)
+    chunked = FeatureScaler()
+    for chunk in sample_data.iter_slices(n_rows=4):
+        chunked.partial_fit(chunk, features)
+    for column in ['count', 'mean', 'm2', 'min', 'max']:
+        assert chunked.statistics[column].to_list() == pytest.approx(
+            full.statistics[column].to_list())
+
+    chunked.save(str(tmp_path / "scaler.json"))
+    loaded = FeatureScaler.load(str(tmp_path / "scaler.json"))
+    new_data = sample_data.head(2)
+    assert loaded.transform(new_data).equals(full.transform(new_data))
+    assert loaded.transform(new_data.lazy()).collect().equals(
+        full.transform(new_data))
+
+    with pytest.raises(ValueError):
+        loaded.transform(new_data, ['text'])
+    with pytest.raises(ValueError):
+        FeatureScaler(method="standardize")
@@ -0,0 +1,82 @@
+import polars as pl
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.dependency import get_tree_depth, get_tree_width
+from elfen.sentences import aggregate_sentences, get_sentence_table
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample data with annotated dependency trees.
+    """
+    vocab = spacy.blank("en").vocab
+    docs = [
+        Doc(vocab,
+            words=["The", "happy", "dog", "barked", ".", "It", "slept", "."],
+            heads=[2, 2, 3, 3, 3, 6, 6, 6],
+            deps=["det", "amod", "nsubj", "ROOT", "punct",
+                  "nsubj", "ROOT", "punct"]),
+        Doc(vocab, words=[]),
+        Doc(vocab,
+            words=["A", "sad", "cat", "sat", "."],
+            heads=[2, 2, 3, 3, 3],
+            deps=["det", "amod", "nsubj", "ROOT", "punct"]),
+    ]
+    return pl.DataFrame({'text': [doc.text for doc in docs]}).with_columns(
+        pl.Series("nlp", docs, dtype=pl.Object))
+
+def test_sentence_table(sample_data):
+    """
+    Test the sentence features, and that the document-level tree depth
+    and width are aggregations of them.
+    """
+    sentences = get_sentence_table(sample_data, cache_dir=None)
+    assert sentences['doc_id'].to_list() == [0, 0, 2]
+    assert sentences['sentence'].to_list() == [0, 1, 0]
+    assert sentences['n_tokens'].to_list() == [5, 3, 5]
+    assert sentences['n_characters'].to_list() == [18, 8, 11]
+    assert sentences['n_long_words'].to_list() == [1, 0, 0]
+    assert sentences['tree_depth'].to_list() == [2, 1, 2]
+    assert sentences['tree_width'].to_list() == [2, 2, 2]
+    assert sentences['tree_branching'].to_list() == \
+        pytest.approx([4 / 5, 2 / 3, 4 / 5])
+    assert sentences['lix'].to_list() == pytest.approx([25.0, 3.0, 5.0])
+
+    documents = aggregate_sentences(sentences,
+                                    aggregations=["mean", "max", "p50"],
+                                    features=["tree_depth", "tree_width"],
+                                    n_docs=sample_data.height)
+    assert documents.columns == [
+        "doc_id", "tree_depth_mean", "tree_depth_max", "tree_depth_p50",
+        "tree_width_mean", "tree_width_max", "tree_width_p50"]
+    expected_depth = get_tree_depth(sample_data)['tree_depth'].to_list()
+    expected_width = get_tree_width(sample_data)['tree_width'].to_list()
+    for doc_id in [0, 2]:
+        assert documents['tree_depth_mean'][doc_id] == \
+            pytest.approx(expected_depth[doc_id])
+        assert documents['tree_width_max'][doc_id] == expected_width[doc_id]
+    # Documents without sentences are kept
+    assert documents['tree_depth_mean'][1] is None
+
+    with pytest.raises(ValueError):
+        aggregate_sentences(sentences, aggregations=["p101"])
+    with pytest.raises(ValueError):
+        aggregate_sentences(sentences, features=["unknown"])
+
+def test_extract_sentence_features(blank_model):
+    """
+    Test that the Extractor adds the aggregated sentence features to the
+    data.
+    """
+    data = pl.DataFrame({'text': ["One two three. Four five.", "Six."]})
+    extractor = Extractor(data,
+                          config=dict(CONFIG_ALL, model=blank_model))
+    extractor.extract_sentence_features(aggregations=["mean", "std"],
+                                        features=["n_tokens"])
+    assert extractor.data['n_tokens_mean'].to_list() == [3.5, 2.0]
+    assert extractor.data['n_tokens_std'][0] == pytest.approx(2 ** 0.5 / 2)
+    assert "n_tokens_mean" in extractor.get_feature_names()
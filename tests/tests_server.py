@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import polars as pl
+import pytest
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.server import ARROW_STREAM_TYPE, ExtractionServer, make_http_server
+
+@pytest.fixture
+def config(blank_model):
+    """
+    Fixture to provide a config with the blank spacy pipeline.
+    """
+    return dict(CONFIG_ALL,
+                model=blank_model,
+                features={
+                    "surface": ["n_tokens", "n_types", "avg_word_length"],
+                    "lexical_richness": ["ttr",
+                                         "n_global_token_hapax_legomena"],
+                })
+
+def test_micro_batching(config, capsys):
+    """
+    Test that concurrent requests are processed in one batch and get the
+    features an Extractor computes for their texts, without printing the
+    progress.
+    """
+    texts = ["The dog barked. It slept.", "A cat.", "One two three four."]
+    with ExtractionServer(config, max_batch_size=8, max_wait=0.5) as server:
+        with ThreadPoolExecutor(3) as pool:
+            results = list(pool.map(lambda text: server.extract([text]),
+                                    texts))
+        assert server.n_batches == 1
+        assert server.n_texts == 3
+    assert capsys.readouterr().out == ""
+
+    extractor = Extractor(pl.DataFrame({'text': texts}), config=config)
+    extractor.extract_features()
+    for i, result in enumerate(results):
+        assert result.height == 1
+        # Corpus-global features depend on the batch and are skipped
+        assert "n_global_token_hapax_legomena" not in result.columns
+        for column in result.columns:
+            assert result[column][0] == extractor.data[column][i]
+
+    with pytest.raises(ValueError):
+        ExtractionServer(config, max_batch_size=0)
+
+def test_http(config):
+    """
+    Test the HTTP endpoint with JSON and Arrow responses.
+    """
+    server = ExtractionServer(config, max_wait=0.0)
+    httpd = make_http_server(server, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    def post(body, headers={}):
+        request = urllib.request.Request(f"{url}/extract",
+                                         data=json.dumps(body).encode(),
+                                         headers=headers)
+        with urllib.request.urlopen(request) as response:
+            return response.read()
+
+    try:
+        features = json.loads(post({'texts': ["The dog barked.", ""]}))
+        assert [row['n_tokens'] for row in features['features']] == [4, 0]
+        # The average word length of the empty text is NaN
+        assert features['features'][1]['avg_word_length'] is None
+
+        arrow = pl.read_ipc_stream(io.BytesIO(
+            post({'texts': ["The dog barked."]},
+                 headers={'Accept': ARROW_STREAM_TYPE})))
+        assert arrow['n_tokens'].to_list() == [4]
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post({'text': "The dog barked."})
+        assert error.value.code == 400
+        with urllib.request.urlopen(f"{url}/health") as response:
+            assert json.loads(response.read())['status'] == "ok"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        server.close()
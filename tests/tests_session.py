@@ -0,0 +1,69 @@
+import polars as pl
+import pytest
+
+import elfen.extractor
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.preprocess import load_docs, save_docs
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture to provide sample data.
+    """
+    return pl.DataFrame({
+        'id': [0, 1, 2],
+        'text': ["The dog barked. It slept.",
+                 "A cat sat on the mat.",
+                 "Birds sing."],
+    })
+
+def test_session_roundtrip(tmp_path, sample_data, blank_model, monkeypatch):
+    """
+    Test that a reopened session is not parsed again, keeps its features
+    and only computes the missing features.
+    """
+    config = dict(CONFIG_ALL, model=blank_model, remove_constant_cols=False)
+    extractor = Extractor(sample_data, config=config)
+    extractor.extract(["n_tokens", "n_types"])
+    extractor.save_session(str(tmp_path / "session"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The data was parsed again.")
+
+    monkeypatch.setattr(elfen.extractor, "preprocess_data", fail)
+    session = Extractor.load_session(str(tmp_path / "session"))
+    assert [doc.text for doc in session.data["nlp"]] == \
+        sample_data["text"].to_list()
+    assert session.extracted_features == {"n_tokens", "n_types"}
+    # The pipeline that restored the documents is kept for extract_one
+    monkeypatch.setattr(elfen.extractor, "load_nlp", fail)
+    assert session.extract_one("One two.", ["n_tokens"]) == {"n_tokens": 3}
+
+    calls = []
+    apply_function = Extractor._Extractor__apply_function
+
+    def counted(self, feature, **kwargs):
+        calls.append(feature)
+        return apply_function(self, feature, **kwargs)
+
+    monkeypatch.setattr(Extractor, "_Extractor__apply_function", counted)
+    session.extract(["n_tokens", "ttr"])
+    assert calls == ["ttr"]
+
+    assert sorted(session.get_feature_names()) == \
+        ["n_tokens", "n_types", "ttr"]
+    assert session.data["ttr"].to_list() == pytest.approx(
+        (session.data["n_types"] / session.data["n_tokens"]).to_list())
+    assert session.data.columns[:3] == ['id', 'text', 'nlp']
+
+def test_load_docs_without_pipeline(tmp_path, blank_nlp):
+    """
+    Test that loading spaCy documents without their pipeline raises a
+    clear error.
+    """
+    path = str(tmp_path / "docs.spacy")
+    save_docs([blank_nlp("The dog barked.")], path)
+    with pytest.raises(ValueError, match="requires the pipeline"):
+        load_docs(path)
+    assert load_docs(path, nlp=blank_nlp)[0].text == "The dog barked."
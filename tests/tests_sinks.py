@@ -0,0 +1,107 @@
+import polars as pl
+import pytest
+
+from elfen import Extractor
+from elfen.sinks import (
+    IPCSink,
+    ParquetSink,
+    PartitionedParquetSink,
+    Sink,
+    read_config,
+)
+
+CONFIG = {"backbone": "spacy", "features": {"surface": ["n_tokens"]}}
+
+@pytest.fixture
+def sample_chunks():
+    """
+    Fixture to provide two chunks with differing column order and dtypes.
+    """
+    first = pl.DataFrame({
+        'language': ["en", "de"],
+        'ttr': [0.5, 1.0],
+        'n_tokens': pl.Series([4, 2], dtype=pl.UInt32),
+    })
+    second = pl.DataFrame({
+        'n_tokens': pl.Series([3], dtype=pl.Int64),
+        'language': ["en"],
+        'ttr': [None],
+    })
+    return first, second
+
+@pytest.mark.parametrize("sink_class, reader", [
+    (ParquetSink, pl.read_parquet),
+    (IPCSink, pl.read_ipc),
+])
+def test_sink_append(tmp_path, sample_chunks, sink_class, reader):
+    """
+    Test that chunks are appended with the schema of the first chunk and
+    that the config is stored in the metadata.
+    """
+    path = str(tmp_path / "features")
+    with sink_class(path, config=CONFIG) as sink:
+        for chunk in sample_chunks:
+            sink.write(chunk)
+
+    data = reader(path)
+    assert data.columns == ['language', 'ttr', 'n_tokens']
+    assert data['n_tokens'].dtype == pl.UInt32
+    assert data['n_tokens'].to_list() == [4, 2, 3]
+    assert data['ttr'].to_list() == [0.5, 1.0, None]
+    assert read_config(path) == CONFIG
+
+def test_sink_null_column(tmp_path):
+    """
+    Test that a column that is null in the whole first chunk takes nulls
+    of other dtypes, but raises a clear error for values.
+    """
+    path = str(tmp_path / "features.parquet")
+    with ParquetSink(path) as sink:
+        sink.write(pl.DataFrame({'x': [None]}))
+        sink.write(pl.DataFrame({'x': pl.Series([None], dtype=pl.Float64)}))
+        with pytest.raises(ValueError, match="Column 'x' is null"):
+            sink.write(pl.DataFrame({'x': [1.5]}))
+    assert pl.read_parquet(path)['x'].to_list() == [None, None]
+
+def test_incomplete_sink(tmp_path):
+    """
+    Test that a sink without a writer cannot be instantiated.
+    """
+    class IncompleteSink(Sink):
+        def _open(self, schema):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteSink(str(tmp_path / "features"))
+
+def test_partitioned_sink(tmp_path, sample_chunks):
+    """
+    Test that a partitioned dataset has one directory per partition value
+    and keeps all rows.
+    """
+    path = tmp_path / "features"
+    with PartitionedParquetSink(str(path), partition_by="language",
+                                config=CONFIG) as sink:
+        for chunk in sample_chunks:
+            sink.write(chunk)
+
+    assert sorted(p.name for p in path.iterdir()) == \
+        ['language=de', 'language=en']
+    assert len(list((path / "language=en").iterdir())) == 2
+    data = pl.read_parquet(path, hive_partitioning=True)
+    assert sorted(data['n_tokens'].to_list()) == [2, 3, 4]
+    files = list((path / "language=de").iterdir())
+    assert read_config(str(files[0])) == CONFIG
+
+def test_extractor_write_parquet(tmp_path, blank_model):
+    """
+    Test that the Extractor writes its features without helper columns.
+    """
+    df = pl.DataFrame({'text': ["This is a test.", "Another test."]})
+    extractor = Extractor(data=df, model=blank_model)
+    extractor.extract(["n_tokens", "ttr"])
+    extractor.write_parquet(str(tmp_path / "features.parquet"))
+
+    data = pl.read_parquet(tmp_path / "features.parquet")
+    assert data.columns == ['text', 'n_tokens', 'n_types', 'ttr']
+    assert read_config(str(tmp_path / "features.parquet"))["model"] == blank_model
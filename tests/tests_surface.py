@@ -0,0 +1,37 @@
+import polars as pl
+import pytest
+
+from elfen.surface import (
+    get_num_characters,
+    get_num_tokens,
+)
+
+@pytest.fixture
+def sample_docs(blank_nlp):
+    """
+    Fixture to provide sample texts parsed with a blank spacy pipeline.
+    """
+    texts = [
+        "The dog barked. The dog slept.",
+        "",
+        "Extraordinary",
+    ]
+    df = pl.DataFrame({'text': texts}).with_columns(
+        pl.Series("nlp", list(blank_nlp.pipe(texts)), dtype=pl.Object),
+    )
+    return df
+
+def test_surface_dtypes(sample_docs):
+    """
+    Test that counts use a dtype wide enough for long documents.
+    """
+    data = get_num_characters(get_num_tokens(sample_docs))
+    assert data['n_tokens'].dtype == pl.UInt32
+    assert data['n_characters'].dtype == pl.UInt32
+
+def test_num_tokens_without_helper_columns(sample_docs):
+    """
+    Test that counting tokens does not add helper columns.
+    """
+    data = get_num_tokens(sample_docs)
+    assert data.columns == ['text', 'nlp', 'n_tokens']
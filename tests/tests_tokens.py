@@ -0,0 +1,78 @@
+import polars as pl
+import pytest
+
+from elfen import Extractor
+from elfen.configs.extractor_config import CONFIG_ALL
+from elfen.emotion import get_avg_valence
+from elfen.tokens import get_token_table, write_token_table
+
+@pytest.fixture
+def sample_data(blank_nlp):
+    """
+    Fixture to provide parsed sample data with sentence boundaries.
+    """
+    texts = ["The happy dog barked. It slept.", "", "A sad cat sat."]
+    docs = list(blank_nlp.pipe(texts))
+    for doc in docs:
+        for token in doc:
+            token.lemma_ = token.lower_
+    return pl.DataFrame({'text': texts}).with_columns(
+        pl.Series("nlp", docs, dtype=pl.Object))
+
+@pytest.fixture
+def vad_lexicon():
+    """
+    Fixture to provide a small VAD lexicon.
+    """
+    return pl.DataFrame({
+        'word': ["happy", "sad", "dog", "dog"],
+        'valence': [0.9, 0.1, 0.6, 0.7],
+        'arousal': [0.7, 0.3, 0.5, 0.5],
+        'dominance': [0.6, 0.2, 0.5, 0.5],
+    })
+
+def test_token_table(sample_data, vad_lexicon):
+    """
+    Test the token table columns, positions and ratings, and that
+    document-level ratings are aggregations over it.
+    """
+    tokens = get_token_table(sample_data,
+                             lexicons={'vad': vad_lexicon},
+                             cache_dir=None)
+    assert tokens.height == sum(len(doc) for doc in sample_data['nlp'])
+    assert tokens['doc_id'].to_list() == [0] * 8 + [2] * 5
+    assert tokens['sentence'].to_list() == [0] * 5 + [1] * 3 + [0] * 5
+    assert tokens['position'].to_list() == list(range(8)) + list(range(5))
+    assert tokens['token'].to_list()[:3] == ["The", "happy", "dog"]
+    # Duplicate lexicon entries do not duplicate tokens
+    assert tokens['valence'].to_list()[:4] == [None, 0.9, 0.6, None]
+    assert tokens['syllables'].to_list()[:4] == [1, 2, 1, 1]
+
+    averages = tokens.group_by("doc_id").agg(pl.col("valence").mean())
+    expected = get_avg_valence(
+        sample_data,
+        lexicon=vad_lexicon.unique("word", keep="first", maintain_order=True))
+    assert averages.sort("doc_id")['valence'].to_list() == \
+        pytest.approx([expected['avg_valence'][0],
+                       expected['avg_valence'][2]])
+
+    with pytest.raises(ValueError):
+        get_token_table(sample_data, lexicons={'unknown': vad_lexicon})
+
+def test_write_token_table(tmp_path, sample_data, blank_model):
+    """
+    Test that the token table written in chunks equals the table built at
+    once, and that the Extractor writes it from its parsed documents.
+    """
+    path = str(tmp_path / "tokens.parquet")
+    n_tokens = write_token_table(sample_data, path, chunk_size=1,
+                                 cache_dir=None)
+    assert n_tokens == 13
+    assert pl.read_parquet(path).equals(
+        get_token_table(sample_data, cache_dir=None))
+
+    extractor = Extractor(sample_data.select("text"),
+                          config=dict(CONFIG_ALL, model=blank_model))
+    assert extractor.write_token_table(path, syllables=False) == 13
+    assert pl.read_parquet(path).columns == [
+        "doc_id", "sentence", "position", "token", "lemma", "pos", "dep"]